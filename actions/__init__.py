@@ -16,6 +16,31 @@
 from phantom.action_result import ActionResult
 
 
+# Class implementing each action identifier, in the actions.ciscomeraki_<identifier> module
+ACTIONS = {
+    "test_connectivity": "TestConnectivity",
+    "list_organizations": "ListOrganizations",
+    "list_org_inventory_devices": "ListOrgInventoryDevices",
+    "search_devices": "SearchDevices",
+    "list_devices": "ListDevices",
+    "claim_device": "ClaimDevice",
+    "update_device": "UpdateDevice",
+    "remove_device": "RemoveDevice",
+    "list_device_clients": "ListDeviceClients",
+    "list_l3_firewall_rules": "ListL3FirewallRules",
+    "update_l3_firewall_rules": "UpdateL3FirewallRules",
+    "analyze_l3_firewall_rules": "AnalyzeL3FirewallRules",
+    "check_l3_firewall_flows": "CheckL3FirewallFlows",
+    "list_l7_firewall_rules": "ListL7FirewallRules",
+    "update_l7_firewall_rules": "UpdateL7FirewallRules",
+    "list_adaptive_policies": "ListAdaptivePolicies",
+    "list_adaptive_policy_acls": "ListAdaptivePolicyACLs",
+    "list_adaptive_policy_groups": "ListAdaptivePolicyGroups",
+    "list_adaptive_policy_settings": "ListAdaptivePolicySettings",
+    "list_org_license_states": "ListOrgLicenseStates",
+}
+
+
 class BaseAction:
     """Base Action class to generate the action objects."""
 
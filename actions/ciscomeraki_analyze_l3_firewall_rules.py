@@ -0,0 +1,87 @@
+#!/usr/bin/python
+# File: ciscomeraki_analyze_l3_firewall_rules.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import phantom.app as phantom
+
+import ciscomeraki_consts as consts
+import ciscomeraki_json
+from actions import BaseAction
+from ciscomeraki_rules import analyze_l3_rules, get_analysis_summary, strip_default_l3_rule
+
+
+class AnalyzeL3FirewallRules(BaseAction):
+    """Class to handle the analyze L3 firewall rules action."""
+
+    def _get_rules(self):
+        """Get the rules to analyze, either from the parameters or from the network.
+
+        Returns:
+            tuple: Status (bool), rules (list)
+        """
+        rules = self._param.get("rules")
+        if rules:
+            try:
+                if isinstance(rules, str):
+                    rules = ciscomeraki_json.loads(rules)
+            except ciscomeraki_json.JSONDecodeError:
+                return self._action_result.set_status(phantom.APP_ERROR, "Invalid JSON in rules parameter"), None
+            if not isinstance(rules, list) or not all(isinstance(rule, dict) for rule in rules):
+                return self._action_result.set_status(phantom.APP_ERROR, "Rules must be a list of rule objects"), None
+            return phantom.APP_SUCCESS, strip_default_l3_rule(rules)
+
+        network_id = self._param.get("network_id")
+        if not network_id:
+            return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_NETWORK_OR_RULES_REQUIRED), None
+
+        ret_val, response = self._connector._utils._make_rest_call(
+            endpoint=consts.LIST_L3_FIREWALL_RULES.format(network_id=network_id), action_result=self._action_result, method="get"
+        )
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status(), None
+
+        return phantom.APP_SUCCESS, strip_default_l3_rule(response.get("rules", []))
+
+    def execute(self):
+        """Execute the analyze L3 firewall rules action.
+
+        Returns:
+            bool: Success/failure
+        """
+        self._connector.save_progress(consts.EXECUTION_START_MSG.format("analyze_l3_firewall_rules"))
+
+        ret_val, rules = self._get_rules()
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        try:
+            findings, unanalyzed = analyze_l3_rules(rules)
+        except Exception as e:
+            error_message = self._connector._utils._get_error_message_from_exception(e)
+            return self._action_result.set_status(phantom.APP_ERROR, f"Error analyzing rules: {error_message}")
+
+        for finding in findings:
+            self._action_result.add_data(finding)
+
+        summary = {"total_rules": len(rules)}
+        summary.update(get_analysis_summary(findings, unanalyzed))
+        self._action_result.update_summary(summary)
+
+        return self._action_result.set_status(
+            phantom.APP_SUCCESS,
+            consts.ACTION_SUCCESS_RESPONSE.format(
+                action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
+            ),
+        )
@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# File: ciscomeraki_check_l3_firewall_flows.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import phantom.app as phantom
+
+import ciscomeraki_consts as consts
+import ciscomeraki_json
+from actions import BaseAction
+from ciscomeraki_rules import CompiledL3Rules, parse_port
+
+
+class CheckL3FirewallFlows(BaseAction):
+    """Class to handle the check L3 firewall flows action."""
+
+    def _get_flows(self):
+        """Get the flows to check from the parameters.
+
+        Returns:
+            tuple: Status (bool), flows (list)
+        """
+        flows = self._param.get("flows")
+        if not flows:
+            if not self._param.get("src_ip") or not self._param.get("dest_ip"):
+                return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_FLOWS_REQUIRED), None
+            flows = [{key: self._param.get(key) for key in consts.FLOW_FIELDS if self._param.get(key) not in (None, "")}]
+            return self._validate_ports(flows)
+
+        try:
+            if isinstance(flows, str):
+                flows = ciscomeraki_json.loads(flows)
+        except ciscomeraki_json.JSONDecodeError:
+            return self._action_result.set_status(phantom.APP_ERROR, "Invalid JSON in flows parameter"), None
+
+        if isinstance(flows, dict):
+            flows = [flows]
+        if not isinstance(flows, list) or not all(isinstance(flow, dict) for flow in flows):
+            return self._action_result.set_status(phantom.APP_ERROR, "Flows must be a list of flow objects"), None
+
+        return self._validate_ports(flows)
+
+    def _validate_ports(self, flows):
+        """Validate the source and destination ports of the flows.
+
+        Args:
+            flows: Flows to check
+
+        Returns:
+            tuple: Status (bool), flows (list)
+        """
+        for number, flow in enumerate(flows, 1):
+            for key in ("src_port", "dest_port"):
+                port = flow.get(key)
+                if port not in (None, "") and parse_port(port) is None:
+                    return self._action_result.set_status(
+                        phantom.APP_ERROR, consts.ERROR_INVALID_FLOW_PORT.format(key=key, number=number, port=port)
+                    ), None
+
+        return phantom.APP_SUCCESS, flows
+
+    def execute(self):
+        """Execute the check L3 firewall flows action.
+
+        Returns:
+            bool: Success/failure
+        """
+        self._connector.save_progress(consts.EXECUTION_START_MSG.format("check_l3_firewall_flows"))
+
+        network_id = self._param.get("network_id")
+        if not network_id:
+            return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_REQUIRED_PARAM.format(key="network_id"))
+
+        ret_val, flows = self._get_flows()
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        # Rules are served from the response cache when fresh
+        ret_val, response = self._connector._utils._make_rest_call(
+            endpoint=consts.LIST_L3_FIREWALL_RULES.format(network_id=network_id), action_result=self._action_result, method="get"
+        )
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        rules = response.get("rules", [])
+        compiled = CompiledL3Rules(rules)
+
+        counts = {"allow": 0, "deny": 0, "invalid": 0}
+        for flow in flows:
+            result = {key: flow.get(key) for key in consts.FLOW_FIELDS}
+            try:
+                position, uncertain = compiled.evaluate(
+                    flow.get("protocol", "tcp"), flow.get("src_ip"), flow.get("dest_ip"), flow.get("src_port"), flow.get("dest_port")
+                )
+            except (ValueError, TypeError) as e:
+                counts["invalid"] += 1
+                result["error"] = self._connector._utils._get_error_message_from_exception(e)
+                self._action_result.add_data(result)
+                continue
+
+            # Meraki allows traffic that matches no rule
+            rule = rules[position] if position is not None else {}
+            policy = str(rule.get("policy", "allow")).lower()
+            counts[policy if policy in counts else "allow"] += 1
+            result.update(
+                {
+                    "allowed": policy != "deny",
+                    "policy": policy,
+                    "rule_index": position,
+                    "rule_comment": rule.get("comment"),
+                    "uncertain": uncertain,
+                }
+            )
+            self._action_result.add_data(result)
+
+        summary = {
+            "total_flows": len(flows),
+            "flows_allowed": counts["allow"],
+            "flows_denied": counts["deny"],
+            "flows_invalid": counts["invalid"],
+            "total_rules": len(rules),
+        }
+        self._action_result.update_summary(summary)
+
+        return self._action_result.set_status(
+            phantom.APP_SUCCESS,
+            consts.ACTION_SUCCESS_RESPONSE.format(
+                action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
+            ),
+        )
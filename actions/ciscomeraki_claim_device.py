@@ -13,16 +13,22 @@
 # either express or implied. See the License for the specific language governing permissions
 # and limitations under the License.
 
-import json
+import re
 
 import phantom.app as phantom
+from phantom.action_result import ActionResult
 
 import ciscomeraki_consts as consts
 from actions import BaseAction
 
 
 class ClaimDevice(BaseAction):
-    """Class to handle the claim device action."""
+    """Class to handle the claim device action.
+
+    Serials are claimed in chunks sent concurrently. A chunk rejected by the API
+    is split in halves and retried until the serials causing the rejection are
+    isolated, so one bad serial does not fail the whole claim.
+    """
 
     def execute(self):
         """Execute the claim device action.
@@ -43,30 +49,124 @@ class ClaimDevice(BaseAction):
             return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_REQUIRED_PARAM.format(key="serials"))
 
         # Convert serials string to list if needed
-        if isinstance(serials, str):
-            try:
-                serials = json.loads(serials)
-            except json.JSONDecodeError:
-                # If not JSON, split by comma
-                serials = [s.strip() for s in serials.split(",")]
-
-        # Make REST call
-        ret_val, response = self._connector._utils._make_rest_call(
-            endpoint=consts.CLAIM_DEVICES.format(organization_id=organization_id),
-            action_result=self._action_result,
-            method="post",
-            json={"serials": serials},
-        )
+        ret_val, serials = self._connector._utils._parse_serials(self._action_result, serials, "serials")
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
 
+        # Claiming into a network goes through action batches, with a result per device
+        network_id = self._param.get("network_id")
+        if network_id:
+            return self._claim_into_network(organization_id, network_id, serials)
+
+        ret_val, chunk_size = self._connector._utils._validate_integer(
+            self._action_result, self._param.get("chunk_size", consts.DEFAULT_CLAIM_CHUNK_SIZE), "chunk_size"
+        )
         if phantom.is_fail(ret_val):
             return self._action_result.get_status()
 
+        results = {"claimed": set(), "already_claimed": set(), "failed": {}}
+        chunks = [tuple(serials[start : start + chunk_size]) for start in range(0, len(serials), chunk_size)]
+        for _, chunk_results in self._connector._utils._run_concurrently(lambda chunk: self._claim_chunk(organization_id, chunk), chunks):
+            results["claimed"].update(chunk_results["claimed"])
+            results["already_claimed"].update(chunk_results["already_claimed"])
+            results["failed"].update(chunk_results["failed"])
+
+        # Report the serials in the order they were given
+        claimed = [serial for serial in serials if serial in results["claimed"]]
+        already_claimed = [serial for serial in serials if serial in results["already_claimed"]]
+        failed = {serial: results["failed"][serial] for serial in serials if serial in results["failed"]}
+
         # Process response
-        self._action_result.add_data({"organization_id": organization_id, "serials": serials, "claimed": True})
+        self._action_result.add_data(
+            {
+                "organization_id": organization_id,
+                "serials": serials,
+                "claimed": len(claimed) == len(serials),
+                "claimed_serials": claimed,
+                "already_claimed_serials": already_claimed,
+                "failed_serials": failed,
+            }
+        )
 
-        summary = {"total_devices_claimed": len(serials)}
+        summary = {
+            "total_devices_claimed": len(claimed),
+            "total_devices_already_claimed": len(already_claimed),
+            "total_devices_failed": len(failed),
+            "claimed_serials": claimed,
+            "already_claimed_serials": already_claimed,
+            "failed_serials": failed,
+        }
         self._action_result.update_summary(summary)
 
+        if len(failed) == len(serials):
+            errors = "; ".join(f"{serial}: {message}" for serial, message in failed.items())
+            return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_ALL_DEVICES_FAILED.format(errors=errors))
+
+        return self._action_result.set_status(
+            phantom.APP_SUCCESS,
+            consts.ACTION_SUCCESS_RESPONSE.format(
+                action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
+            ),
+        )
+
+    def _claim_chunk(self, organization_id, serials):
+        """Claim a chunk of serials, bisecting it when the API rejects it.
+
+        Args:
+            organization_id: Organization ID
+            serials: Serial numbers of the chunk
+
+        Returns:
+            dict: Claimed and already claimed serials (lists), error message per failed serial (dict)
+        """
+        results = {"claimed": [], "already_claimed": [], "failed": {}}
+        pending = [serials]
+        while pending:
+            chunk = pending.pop()
+            action_result = ActionResult()
+            ret_val, response = self._connector._utils._make_rest_call(
+                endpoint=consts.CLAIM_DEVICES.format(organization_id=organization_id),
+                action_result=action_result,
+                method="post",
+                json={"serials": list(chunk)},
+            )
+            if phantom.is_success(ret_val):
+                results["claimed"].extend(chunk)
+                continue
+
+            message = action_result.get_message()
+            # Only a rejection caused by some of the serials can be narrowed down;
+            # an invalid API key or organization rejects every half the same way
+            rejected = re.match(consts.VALIDATION_ERROR_REGEX, message) or re.search(consts.ALREADY_CLAIMED_REGEX, message, re.IGNORECASE)
+            if len(chunk) > 1 and rejected:
+                middle = len(chunk) // 2
+                pending.extend([chunk[middle:], chunk[:middle]])
+            elif len(chunk) == 1 and re.search(consts.ALREADY_CLAIMED_REGEX, message, re.IGNORECASE):
+                results["already_claimed"].extend(chunk)
+            else:
+                results["failed"].update(dict.fromkeys(chunk, message))
+
+        return results
+
+    def _claim_into_network(self, organization_id, network_id, serials):
+        """Claim devices into a network through action batches.
+
+        Args:
+            organization_id: Organization ID
+            network_id: Network ID
+            serials: Device serial numbers
+
+        Returns:
+            bool: Success/failure
+        """
+        resource = consts.ACTION_BATCH_NETWORK_DEVICES_RESOURCE.format(network_id=network_id)
+        actions = [{"resource": resource, "operation": "claim", "body": {"serials": [serial]}} for serial in serials]
+        ret_val = self._connector._utils._run_device_batches(self._action_result, organization_id, serials, actions, bisect=True)
+        self._connector._utils._invalidate_response_cache(consts.CLAIM_DEVICES.format(organization_id=organization_id))
+        self._connector._utils._invalidate_response_cache(consts.UPDATE_DEVICE.format(network_id=network_id, serial=serials[0]))
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
         return self._action_result.set_status(
             phantom.APP_SUCCESS,
             consts.ACTION_SUCCESS_RESPONSE.format(
@@ -36,6 +36,15 @@ class ListDeviceClients(BaseAction):
         if not serial:
             return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_REQUIRED_PARAM.format(key="serial"))
 
+        # Convert serial string to list if needed
+        ret_val, serials = self._connector._utils._parse_serials(self._action_result, serial, "serial")
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        ret_val, self._projection = self._connector._utils._get_field_projection(self._action_result, self._param.get("fields"))
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
         # Validate timespan if provided
         timespan = self._param.get("timespan")
         if timespan:
@@ -51,21 +60,105 @@ class ListDeviceClients(BaseAction):
         if timespan:
             params["timespan"] = timespan
 
-        # Make REST call
-        ret_val, response = self._connector._utils._make_rest_call(
-            endpoint=consts.LIST_DEVICE_CLIENTS.format(serial=serial), action_result=self._action_result, method="get", params=params
+        # Look the organizations of all devices up at once, instead of one by one before every request
+        self._connector._utils._resolve_device_organizations(serials)
+
+        if len(serials) > 1:
+            return self._list_multiple_devices(serials, params)
+
+        if self._param.get("stream_results", False):
+            pages = self._connector._utils._stream_records(
+                self._action_result, consts.LIST_DEVICE_CLIENTS.format(serial=serials[0]), params=params
+            )
+        else:
+            # Make REST call
+            ret_val, response = self._connector._utils._make_rest_call(
+                endpoint=consts.LIST_DEVICE_CLIENTS.format(serial=serials[0]), action_result=self._action_result, method="get", params=params
+            )
+            pages = [(ret_val, response)]
+
+        # Process response
+        total_clients = 0
+        for ret_val, clients in pages:
+            if phantom.is_fail(ret_val):
+                return self._action_result.get_status()
+
+            for client in clients:
+                self._action_result.add_data(self._projection.project(client))
+                total_clients += 1
+
+        summary = {"total_clients": total_clients}
+        self._action_result.update_summary(summary)
+
+        return self._action_result.set_status(
+            phantom.APP_SUCCESS,
+            consts.ACTION_SUCCESS_RESPONSE.format(
+                action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
+            ),
         )
 
+    def _fetch_clients(self, serial, action_result, params):
+        """Fetch the clients of one device.
+
+        Args:
+            serial: Device serial number
+            action_result: ActionResult object of the device
+            params: Query parameters
+
+        Returns:
+            tuple: Status (bool), clients (list)
+        """
+        ret_val, response = self._connector._utils._make_rest_call(
+            endpoint=consts.LIST_DEVICE_CLIENTS.format(serial=serial), action_result=action_result, method="get", params=params
+        )
         if phantom.is_fail(ret_val):
-            return self._action_result.get_status()
+            return ret_val, None
 
-        # Process response
-        for client in response:
-            self._action_result.add_data(client)
+        return phantom.APP_SUCCESS, response
 
-        summary = {"total_clients": len(response)}
+    def _list_multiple_devices(self, serials, params):
+        """List the clients of several devices concurrently.
+
+        The clients of a device are added to the action result as soon as its
+        request completes.
+
+        Args:
+            serials: Device serial numbers
+            params: Query parameters
+
+        Returns:
+            bool: Success/failure
+        """
+        total_clients = 0
+        clients_per_serial = {}
+        failed_serials = {}
+        for serial, ret_val, result in self._connector._utils._fan_out(
+            serials, lambda serial, action_result: self._fetch_clients(serial, action_result, params)
+        ):
+            if phantom.is_fail(ret_val):
+                failed_serials[serial] = result
+                continue
+
+            for client in result:
+                client = self._projection.project(client)
+                client["device_serial"] = serial
+                self._action_result.add_data(client)
+            clients_per_serial[serial] = len(result)
+            total_clients += len(result)
+
+        summary = {
+            "total_clients": total_clients,
+            "total_devices": len(serials),
+            "total_devices_failed": len(failed_serials),
+            "clients_per_serial": clients_per_serial,
+            "failed_serials": failed_serials,
+        }
         self._action_result.update_summary(summary)
 
+        if len(failed_serials) == len(serials):
+            errors = "; ".join(f"{serial}: {message}" for serial, message in failed_serials.items())
+            return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_ALL_DEVICES_FAILED.format(errors=errors))
+
         return self._action_result.set_status(
             phantom.APP_SUCCESS,
             consts.ACTION_SUCCESS_RESPONSE.format(
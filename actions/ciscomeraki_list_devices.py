@@ -35,6 +35,10 @@ class ListDevices(BaseAction):
         if not network_id:
             return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_REQUIRED_PARAM.format(key="network_id"))
 
+        ret_val, self._projection = self._connector._utils._get_field_projection(self._action_result, self._param.get("fields"))
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
         # Make REST call
         ret_val, response = self._connector._utils._make_rest_call(
             endpoint=consts.LIST_DEVICES.format(network_id=network_id), action_result=self._action_result, method="get"
@@ -45,7 +49,7 @@ class ListDevices(BaseAction):
 
         # Process response
         for device in response:
-            self._action_result.add_data(device)
+            self._action_result.add_data(self._projection.project(device))
 
         summary = {"total_devices": len(response)}
         self._action_result.update_summary(summary)
@@ -49,24 +49,107 @@ class ListOrgInventoryDevices(BaseAction):
 
         organization_id = self._param["organization_id"]
 
-        # Use paginator to get all inventory devices with max limit of 1000 per page
-        ret_val, response = self._connector._utils._paginator(
+        ret_val, max_results = self._connector._utils._validate_integer(self._action_result, self._param.get("max_results"), "max_results")
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        ret_val, self._projection = self._connector._utils._get_field_projection(self._action_result, self._param.get("fields"))
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        if self._connector._utils._is_multiple_organizations(organization_id):
+            return self._list_multiple_organizations(organization_id, max_results)
+
+        # Use paginator to stream all inventory devices with max limit of 1000 per page
+        total_devices = 0
+        for ret_val, devices in self._connector._utils._paginator(
             action_result=self._action_result,
             endpoint=consts.ORG_INVENTORY_DEVICES.format(organization_id=organization_id),
             limit=1000,  # Meraki API's maximum limit
+            max_results=max_results,
+            stream=self._param.get("stream_results", False),
+        ):
+            if phantom.is_fail(ret_val):
+                return self._action_result.get_status()
+
+            # Process each device in the page
+            for device in devices:
+                self._action_result.add_data(self._projection.project(device))
+                total_devices += 1
+
+        # Add summary
+        summary = {"total_devices": total_devices, "organization_id": organization_id}
+        self._action_result.update_summary(summary)
+
+        return self._action_result.set_status(
+            phantom.APP_SUCCESS,
+            consts.ACTION_SUCCESS_RESPONSE.format(
+                action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
+            ),
         )
 
+    def _fetch_devices(self, organization_id, action_result, max_results):
+        """Fetch all inventory devices of one organization.
+
+        Args:
+            organization_id: Organization ID
+            action_result: ActionResult object of the organization
+            max_results: Maximum number of devices to return
+
+        Returns:
+            tuple: Status (bool), devices (list)
+        """
+        devices = []
+        for ret_val, page in self._connector._utils._paginator(
+            action_result=action_result,
+            endpoint=consts.ORG_INVENTORY_DEVICES.format(organization_id=organization_id),
+            limit=1000,  # Meraki API's maximum limit
+            max_results=max_results,
+        ):
+            if phantom.is_fail(ret_val):
+                return ret_val, None
+            devices.extend(page)
+
+        return phantom.APP_SUCCESS, devices
+
+    def _list_multiple_organizations(self, organization_id, max_results):
+        """List the inventory devices of several organizations concurrently.
+
+        Args:
+            organization_id: Comma-separated list of organization IDs or 'all'
+            max_results: Maximum number of devices to return per organization
+
+        Returns:
+            bool: Success/failure
+        """
+        ret_val, organization_ids = self._connector._utils._get_organization_ids(self._action_result, organization_id)
         if phantom.is_fail(ret_val):
             return self._action_result.get_status()
 
-        # Process each device in the response
-        for device in response:
-            self._action_result.add_data(device)
+        total_devices = 0
+        failed_organizations = {}
+        for org_id, ret_val, result in self._connector._utils._fan_out(
+            organization_ids, lambda org_id, action_result: self._fetch_devices(org_id, action_result, max_results)
+        ):
+            if phantom.is_fail(ret_val):
+                failed_organizations[org_id] = result
+                continue
+
+            for device in result:
+                device = self._projection.project(device)
+                device["organization_id"] = org_id
+                self._action_result.add_data(device)
+            total_devices += len(result)
 
         # Add summary
-        summary = {"total_devices": len(response), "organization_id": organization_id}
+        summary = {"total_devices": total_devices, "organization_id": organization_id}
+        summary.update(self._connector._utils._get_fan_out_summary(organization_ids, failed_organizations))
         self._action_result.update_summary(summary)
 
+        if failed_organizations and len(failed_organizations) == len(organization_ids):
+            errors = "; ".join(f"{org_id}: {message}" for org_id, message in failed_organizations.items())
+            return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_ALL_ORGANIZATIONS_FAILED.format(errors=errors))
+
         return self._action_result.set_status(
             phantom.APP_SUCCESS,
             consts.ACTION_SUCCESS_RESPONSE.format(
@@ -51,6 +51,9 @@ class ListOrgLicenseStates(BaseAction):
         organization_id = self._param["organization_id"]
 
         try:
+            if self._connector._utils._is_multiple_organizations(organization_id):
+                return self._list_multiple_organizations(organization_id)
+
             # Make REST call
             ret_val, response = self._connector._utils._make_rest_call(
                 consts.ORG_LICENSE_STATE.format(organization_id=organization_id), self._action_result, "get"
@@ -82,3 +85,62 @@ class ListOrgLicenseStates(BaseAction):
         except Exception as e:
             error_message = self._connector._utils._get_error_message_from_exception(e)
             return self._action_result.set_status(phantom.APP_ERROR, f"Error occurred: {error_message}")
+
+    def _fetch_license_state(self, organization_id, action_result):
+        """Fetch the license state of one organization.
+
+        Args:
+            organization_id: Organization ID
+            action_result: ActionResult object of the organization
+
+        Returns:
+            tuple: Status (bool), license states (list)
+        """
+        ret_val, response = self._connector._utils._make_rest_call(
+            consts.ORG_LICENSE_STATE.format(organization_id=organization_id), action_result, "get"
+        )
+        if phantom.is_fail(ret_val):
+            return ret_val, None
+
+        return phantom.APP_SUCCESS, [response]
+
+    def _list_multiple_organizations(self, organization_id):
+        """List the license states of several organizations concurrently.
+
+        Args:
+            organization_id: Comma-separated list of organization IDs or 'all'
+
+        Returns:
+            bool: Success/failure
+        """
+        ret_val, organization_ids = self._connector._utils._get_organization_ids(self._action_result, organization_id)
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        total_licenses = 0
+        failed_organizations = {}
+        for org_id, ret_val, result in self._connector._utils._fan_out(organization_ids, self._fetch_license_state):
+            if phantom.is_fail(ret_val):
+                failed_organizations[org_id] = result
+                continue
+
+            for license_state in result:
+                license_state["organization_id"] = org_id
+                self._action_result.add_data(license_state)
+                total_licenses += len(license_state.get("licenses", []))
+
+        # Add summary
+        summary = {"total_licenses": total_licenses}
+        summary.update(self._connector._utils._get_fan_out_summary(organization_ids, failed_organizations))
+        self._action_result.update_summary(summary)
+
+        if failed_organizations and len(failed_organizations) == len(organization_ids):
+            errors = "; ".join(f"{org_id}: {message}" for org_id, message in failed_organizations.items())
+            return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_ALL_ORGANIZATIONS_FAILED.format(errors=errors))
+
+        return self._action_result.set_status(
+            phantom.APP_SUCCESS,
+            consts.ACTION_SUCCESS_RESPONSE.format(
+                action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
+            ),
+        )
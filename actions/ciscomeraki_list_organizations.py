@@ -31,22 +31,32 @@ class ListOrganizations(BaseAction):
         """
         self._connector.save_progress(consts.EXECUTION_START_MSG.format("list_organizations"))
 
-        # Use paginator to get all organizations with max limit of 1000 per page
-        ret_val, response = self._connector._utils._paginator(
-            action_result=self._action_result,
-            endpoint=consts.LIST_ORGANIZATIONS,
-            limit=1000,  # Meraki API's maximum limit
-        )
+        ret_val, max_results = self._connector._utils._validate_integer(self._action_result, self._param.get("max_results"), "max_results")
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
 
+        ret_val, self._projection = self._connector._utils._get_field_projection(self._action_result, self._param.get("fields"))
         if phantom.is_fail(ret_val):
             return self._action_result.get_status()
 
-        # Process each organization in the response
-        for org in response:
-            self._action_result.add_data(org)
+        # Use paginator to stream all organizations with max limit of 1000 per page
+        total_organizations = 0
+        for ret_val, organizations in self._connector._utils._paginator(
+            action_result=self._action_result,
+            endpoint=consts.LIST_ORGANIZATIONS,
+            limit=1000,  # Meraki API's maximum limit
+            max_results=max_results,
+        ):
+            if phantom.is_fail(ret_val):
+                return self._action_result.get_status()
+
+            # Process each organization in the page
+            for org in organizations:
+                self._action_result.add_data(self._projection.project(org))
+            total_organizations += len(organizations)
 
         # Add summary
-        summary = {"total_organizations": len(response)}
+        summary = {"total_organizations": total_organizations}
         self._action_result.update_summary(summary)
 
         return self._action_result.set_status(
@@ -40,7 +40,15 @@ class RemoveDevice(BaseAction):
         if not serial:
             return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_REQUIRED_PARAM.format(key="serial"))
 
+        ret_val, serials = self._connector._utils._parse_serials(self._action_result, serial, "serial")
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        if len(serials) > 1:
+            return self._remove_multiple_devices(network_id, serials)
+
         # Make REST call
+        serial = serials[0]
         ret_val, response = self._connector._utils._make_rest_call(
             endpoint=consts.REMOVE_DEVICE.format(network_id=network_id, serial=serial), action_result=self._action_result, method="delete"
         )
@@ -60,3 +68,31 @@ class RemoveDevice(BaseAction):
                 action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
             ),
         )
+
+    def _remove_multiple_devices(self, network_id, serials):
+        """Remove several devices from the network through action batches.
+
+        Args:
+            network_id: Network ID
+            serials: Device serial numbers
+
+        Returns:
+            bool: Success/failure
+        """
+        organization_id = self._connector._utils._get_organization_id("networks", network_id)
+        if not organization_id:
+            return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_ORGANIZATION_NOT_FOUND.format(network_id=network_id))
+
+        resource = consts.ACTION_BATCH_NETWORK_DEVICES_RESOURCE.format(network_id=network_id)
+        actions = [{"resource": resource, "operation": "remove", "body": {"serial": serial}} for serial in serials]
+        ret_val = self._connector._utils._run_device_batches(self._action_result, organization_id, serials, actions)
+        self._connector._utils._invalidate_response_cache(consts.REMOVE_DEVICE.format(network_id=network_id, serial=serials[0]))
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        return self._action_result.set_status(
+            phantom.APP_SUCCESS,
+            consts.ACTION_SUCCESS_RESPONSE.format(
+                action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
+            ),
+        )
@@ -21,7 +21,12 @@ from actions import BaseAction
 
 
 class SearchDevices(BaseAction):
-    """Class to handle the search devices action."""
+    """Class to handle the search devices action.
+
+    Devices are searched in a local inventory snapshot of each organization,
+    which is only fetched again from the API once it is older than the
+    max_staleness parameter.
+    """
 
     def _validate_params(self):
         """Validate parameters.
@@ -30,12 +35,22 @@ class SearchDevices(BaseAction):
             bool: Success/failure
         """
         # At least one search parameter should be provided
-        search_params = ["organization_id", "mac", "serial", "model", "tags"]
+        search_params = ["organization_id", "mac", "serial", "model", "tags", "network_id"]
         if not any(self._param.get(param) for param in search_params):
             return self._action_result.set_status(
-                phantom.APP_ERROR, "At least one search parameter (organization_id, mac, serial, model, or tags) must be provided"
+                phantom.APP_ERROR, "At least one search parameter (organization_id, mac, serial, model, tags, or network_id) must be provided"
             )
 
+        ret_val, self._max_staleness = self._connector._utils._validate_integer(
+            self._action_result, self._param.get("max_staleness", consts.DEFAULT_INVENTORY_MAX_STALENESS), "max_staleness", allow_zero=True
+        )
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        ret_val, self._projection = self._connector._utils._get_field_projection(self._action_result, self._param.get("fields"))
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
         return phantom.APP_SUCCESS
 
     def execute(self):
@@ -49,34 +64,35 @@ class SearchDevices(BaseAction):
         if phantom.is_fail(self._validate_params()):
             return self._action_result.get_status()
 
-        # Build search parameters
+        # Build search criteria
         params = {}
-        for param in ["organization_id", "mac", "serial", "model", "tags"]:
+        for param in ["organization_id", "mac", "serial", "model", "tags", "network_id"]:
             if self._param.get(param):
                 if param == "tags":
                     tag_list = [value.strip() for value in self._param[param].split(",") if value.strip()]
                     if tag_list:  # Only add if there are actual tags
-                        params["tags[]"] = tag_list
+                        params["tags"] = tag_list
                 else:
                     params[param] = self._param[param]
         try:
-            # Make REST call
-            ret_val, response = self._connector._utils._make_rest_call(
-                consts.SEARCH_DEVICES.format(organization_id=self._param["organization_id"]),
-                method="get",
-                action_result=self._action_result,
-                params=params,
-            )
+            organization_id = self._param.get("organization_id")
+            search_params = {key: value for key, value in params.items() if key != "organization_id"}
+            if self._connector._utils._is_multiple_organizations(organization_id):
+                return self._search_multiple_organizations(organization_id, search_params, params)
 
+            ret_val, snapshot, refreshed = self._connector._utils._get_device_inventory(
+                self._action_result, organization_id, self._max_staleness
+            )
             if phantom.is_fail(ret_val):
                 return self._action_result.get_status()
 
-            # Process each device in the response
-            for device in response:
-                self._action_result.add_data(device)
+            devices = snapshot.search(**search_params)
+            for device in devices:
+                self._action_result.add_data(self._projection.project(device))
 
             # Add summary
-            summary = {"total_devices_found": len(response), "search_criteria": ", ".join(f"{k}: {v}" for k, v in params.items())}
+            summary = {"total_devices_found": len(devices), "search_criteria": ", ".join(f"{k}: {v}" for k, v in params.items())}
+            summary.update(self._get_inventory_summary([snapshot], refreshed))
             self._action_result.update_summary(summary)
 
             return self._action_result.set_status(
@@ -91,3 +107,87 @@ class SearchDevices(BaseAction):
         except Exception as e:
             error_message = self._connector._utils._get_error_message_from_exception(e)
             return self._action_result.set_status(phantom.APP_ERROR, f"Error occurred: {error_message}")
+
+    def _get_inventory_summary(self, snapshots, refreshed):
+        """Get the summary entries describing the freshness of the searched inventories.
+
+        Args:
+            snapshots: Searched InventorySnapshot objects
+            refreshed: Whether any inventory was fetched from the API in this run
+
+        Returns:
+            dict: Summary entries
+        """
+        return {
+            "inventory_age_seconds": int(max((snapshot.age for snapshot in snapshots), default=0)),
+            "inventory_max_staleness": self._max_staleness,
+            "inventory_refreshed": refreshed,
+        }
+
+    def _fetch_devices(self, organization_id, action_result, search_params):
+        """Search the inventory of one organization.
+
+        Args:
+            organization_id: Organization ID
+            action_result: ActionResult object of the organization
+            search_params: Search criteria
+
+        Returns:
+            tuple: Status (bool), tuple of InventorySnapshot, refreshed flag (bool) and devices (list)
+        """
+        ret_val, snapshot, refreshed = self._connector._utils._get_device_inventory(action_result, organization_id, self._max_staleness)
+        if phantom.is_fail(ret_val):
+            return ret_val, None
+
+        return phantom.APP_SUCCESS, (snapshot, refreshed, snapshot.search(**search_params))
+
+    def _search_multiple_organizations(self, organization_id, search_params, params):
+        """Search for devices in several organizations concurrently.
+
+        Args:
+            organization_id: Comma-separated list of organization IDs or 'all'
+            search_params: Search criteria
+            params: All search criteria, reported in the summary
+
+        Returns:
+            bool: Success/failure
+        """
+        ret_val, organization_ids = self._connector._utils._get_organization_ids(self._action_result, organization_id)
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        total_devices = 0
+        snapshots = []
+        any_refreshed = False
+        failed_organizations = {}
+        for org_id, ret_val, result in self._connector._utils._fan_out(
+            organization_ids, lambda org_id, action_result: self._fetch_devices(org_id, action_result, search_params)
+        ):
+            if phantom.is_fail(ret_val):
+                failed_organizations[org_id] = result
+                continue
+
+            snapshot, refreshed, devices = result
+            snapshots.append(snapshot)
+            any_refreshed = any_refreshed or refreshed
+            for device in devices:
+                # Snapshot devices are shared with later searches, so tag a copy
+                self._action_result.add_data(dict(self._projection.project(device), organization_id=org_id))
+            total_devices += len(devices)
+
+        # Add summary
+        summary = {"total_devices_found": total_devices, "search_criteria": ", ".join(f"{k}: {v}" for k, v in params.items())}
+        summary.update(self._get_inventory_summary(snapshots, any_refreshed))
+        summary.update(self._connector._utils._get_fan_out_summary(organization_ids, failed_organizations))
+        self._action_result.update_summary(summary)
+
+        if failed_organizations and len(failed_organizations) == len(organization_ids):
+            errors = "; ".join(f"{org_id}: {message}" for org_id, message in failed_organizations.items())
+            return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_ALL_ORGANIZATIONS_FAILED.format(errors=errors))
+
+        return self._action_result.set_status(
+            phantom.APP_SUCCESS,
+            consts.ACTION_SUCCESS_RESPONSE.format(
+                action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
+            ),
+        )
@@ -40,6 +40,10 @@ class UpdateDevice(BaseAction):
         if not serial:
             return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_REQUIRED_PARAM.format(key="serial"))
 
+        ret_val, serials = self._connector._utils._parse_serials(self._action_result, serial, "serial")
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
         # Prepare update data
         update_data = {}
         if self._param.get("name"):
@@ -49,7 +53,11 @@ class UpdateDevice(BaseAction):
         if self._param.get("mac"):
             update_data["mac"] = self._param["mac"]
 
+        if len(serials) > 1:
+            return self._update_multiple_devices(network_id, serials, update_data)
+
         # Make REST call
+        serial = serials[0]
         ret_val, response = self._connector._utils._make_rest_call(
             endpoint=consts.UPDATE_DEVICE.format(network_id=network_id, serial=serial),
             action_result=self._action_result,
@@ -72,3 +80,34 @@ class UpdateDevice(BaseAction):
                 action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
             ),
         )
+
+    def _update_multiple_devices(self, network_id, serials, update_data):
+        """Update several devices through action batches.
+
+        Args:
+            network_id: Network ID
+            serials: Device serial numbers
+            update_data: Attributes to set on every device
+
+        Returns:
+            bool: Success/failure
+        """
+        organization_id = self._connector._utils._get_organization_id("networks", network_id)
+        if not organization_id:
+            return self._action_result.set_status(phantom.APP_ERROR, consts.ERROR_ORGANIZATION_NOT_FOUND.format(network_id=network_id))
+
+        actions = [
+            {"resource": consts.ACTION_BATCH_DEVICE_RESOURCE.format(serial=serial), "operation": "update", "body": update_data}
+            for serial in serials
+        ]
+        ret_val = self._connector._utils._run_device_batches(self._action_result, organization_id, serials, actions)
+        self._connector._utils._invalidate_response_cache(consts.UPDATE_DEVICE.format(network_id=network_id, serial=serials[0]))
+        if phantom.is_fail(ret_val):
+            return self._action_result.get_status()
+
+        return self._action_result.set_status(
+            phantom.APP_SUCCESS,
+            consts.ACTION_SUCCESS_RESPONSE.format(
+                action=" ".join([i.capitalize() if idx > 0 else i for idx, i in enumerate(self._connector.get_action_identifier().split("_"))])
+            ),
+        )
@@ -15,12 +15,13 @@
 # and limitations under the License.
 
 import ipaddress
-import json
 
 import phantom.app as phantom
 
 import ciscomeraki_consts as consts
+import ciscomeraki_json
 from actions import BaseAction
+from ciscomeraki_rules import analyze_l3_rules, compact_l3_rules, get_diff_summary, get_unreachable_rules, normalize_l3_rule
 
 
 class UpdateL3FirewallRules(BaseAction):
@@ -96,7 +97,7 @@ class UpdateL3FirewallRules(BaseAction):
         # Parse rules if provided as string
         try:
             if isinstance(rules, str):
-                rules = json.loads(rules)
+                rules = ciscomeraki_json.loads(rules)
 
             if not isinstance(rules, list):
                 return self._action_result.set_status(phantom.APP_ERROR, "Rules must be a list of rule objects")
@@ -107,9 +108,38 @@ class UpdateL3FirewallRules(BaseAction):
                 if not is_valid:
                     return self._action_result.set_status(phantom.APP_ERROR, f"Invalid rule: {error_msg}")
 
-        except json.JSONDecodeError:
+        except ciscomeraki_json.JSONDecodeError:
             return self._action_result.set_status(phantom.APP_ERROR, "Invalid JSON in rules parameter")
 
+        # Collapse CIDRs and merge equivalent rules when asked to
+        if self._param.get("compact_rules", False):
+            rules_before_compaction = len(rules)
+            rules = compact_l3_rules(rules)
+            self._action_result.update_summary({"rules_before_compaction": rules_before_compaction, "rules_after_compaction": len(rules)})
+
+        # Refuse rule sets containing rules that can never match
+        if self._param.get("preflight_check", False):
+            findings, _ = analyze_l3_rules(rules)
+            unreachable = get_unreachable_rules(findings)
+            self._action_result.update_summary({"preflight_findings": len(findings), "preflight_unreachable_rules": len(unreachable)})
+            if unreachable:
+                details = "; ".join(
+                    f"rule {finding['rule_index']} ({finding['finding']}) is covered by rule {finding['related_rule_indexes'][0]}"
+                    for finding in unreachable[: consts.PREFLIGHT_MAX_REPORTED_FINDINGS]
+                )
+                return self._action_result.set_status(
+                    phantom.APP_ERROR, consts.ERROR_PREFLIGHT_CHECK_FAILED.format(count=len(unreachable), details=details)
+                )
+
+        # Skip the update when the network already has these rules
+        changes = self._connector._utils._get_firewall_rule_changes(
+            consts.LIST_L3_FIREWALL_RULES.format(network_id=network_id), rules, normalize_l3_rule, strip_default=True
+        )
+        if changes is not None and not changes["changed"]:
+            self._action_result.add_data({"rules_updated": False, "rules": changes["current"]})
+            self._action_result.update_summary(get_diff_summary(0, changes))
+            return self._action_result.set_status(phantom.APP_SUCCESS, consts.RULES_UNCHANGED_RESPONSE)
+
         # Make REST call
         ret_val, response = self._connector._utils._make_rest_call(
             endpoint=consts.UPDATE_L3_FIREWALL_RULES.format(network_id=network_id),
@@ -122,10 +152,12 @@ class UpdateL3FirewallRules(BaseAction):
             return self._action_result.get_status()
 
         # Process response
-        self._action_result.add_data({"rules_updated": True, "rules": response})
+        data = {"rules_updated": True, "rules": response}
+        if changes is not None:
+            data.update({"added_rules": changes["added"], "removed_rules": changes["removed"], "reordered_rules": changes["reordered"]})
+        self._action_result.add_data(data)
 
-        summary = {"total_rules_updated": len(rules)}
-        self._action_result.update_summary(summary)
+        self._action_result.update_summary(get_diff_summary(len(rules), changes))
 
         return self._action_result.set_status(
             phantom.APP_SUCCESS,
@@ -14,12 +14,12 @@
 # either express or implied. See the License for the specific language governing permissions
 # and limitations under the License.
 
-import json
-
 import phantom.app as phantom
 
 import ciscomeraki_consts as consts
+import ciscomeraki_json
 from actions import BaseAction
+from ciscomeraki_rules import get_diff_summary, normalize_l7_rule
 
 
 class UpdateL7FirewallRules(BaseAction):
@@ -82,7 +82,7 @@ class UpdateL7FirewallRules(BaseAction):
         # Parse rules if provided as string
         try:
             if isinstance(rules, str):
-                rules = json.loads(rules)
+                rules = ciscomeraki_json.loads(rules)
 
             if not isinstance(rules, list):
                 return self._action_result.set_status(phantom.APP_ERROR, "Rules must be a list of rule objects")
@@ -93,9 +93,18 @@ class UpdateL7FirewallRules(BaseAction):
                 if not is_valid:
                     return self._action_result.set_status(phantom.APP_ERROR, f"Invalid rule: {error_msg}")
 
-        except json.JSONDecodeError:
+        except ciscomeraki_json.JSONDecodeError:
             return self._action_result.set_status(phantom.APP_ERROR, "Invalid JSON in rules parameter")
 
+        # Skip the update when the network already has these rules
+        changes = self._connector._utils._get_firewall_rule_changes(
+            consts.LIST_L7_FIREWALL_RULES.format(network_id=network_id), rules, normalize_l7_rule
+        )
+        if changes is not None and not changes["changed"]:
+            self._action_result.add_data({"rules_updated": False, "rules": changes["current"]})
+            self._action_result.update_summary(get_diff_summary(0, changes))
+            return self._action_result.set_status(phantom.APP_SUCCESS, consts.RULES_UNCHANGED_RESPONSE)
+
         # Make REST call
         ret_val, response = self._connector._utils._make_rest_call(
             endpoint=consts.UPDATE_L7_FIREWALL_RULES.format(network_id=network_id),
@@ -108,10 +117,12 @@ class UpdateL7FirewallRules(BaseAction):
             return self._action_result.get_status()
 
         # Process response
-        self._action_result.add_data({"rules_updated": True, "rules": response})
+        data = {"rules_updated": True, "rules": response}
+        if changes is not None:
+            data.update({"added_rules": changes["added"], "removed_rules": changes["removed"], "reordered_rules": changes["reordered"]})
+        self._action_result.add_data(data)
 
-        summary = {"total_rules_updated": len(rules)}
-        self._action_result.update_summary(summary)
+        self._action_result.update_summary(get_diff_summary(len(rules), changes))
 
         return self._action_result.set_status(
             phantom.APP_SUCCESS,
@@ -0,0 +1,134 @@
+#!/usr/bin/python
+# File: import_time.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Measure the cold start import time of every action.
+
+SOAR starts a new process for every action run, so the connector and the
+module of the action are imported each time. Every action is imported in a
+fresh interpreter with ``-X importtime``, and the median over several runs is
+reported along with the slowest modules. Times include the overhead of
+``-X importtime``, so only compare them with other runs of this script. The script exits with status 1 when an
+action exceeds the ``--max-ms`` threshold, so it can guard against regressions.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--max-ms 250] [--top 10] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from actions import ACTIONS
+
+
+IMPORT_TIME_REGEX = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)$")
+
+
+def measure_action(action_id):
+    """Import the connector and the module of an action in a fresh interpreter.
+
+    Args:
+        action_id: Action identifier
+
+    Returns:
+        tuple: Import time in milliseconds (float), cumulative import time in
+            milliseconds of the modules imported by the connector and the action (dict)
+    """
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"import ciscomeraki_connector, actions.ciscomeraki_{action_id} as module\n"
+        f"module.{ACTIONS[action_id]}\n"
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_DIR, capture_output=True, text=True, check=False)
+    if process.returncode != 0:
+        raise RuntimeError(f"Could not import the {action_id} action: {process.stderr.strip().splitlines()[-1]}")
+
+    modules = {}
+    measured = False
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_REGEX.match(line)
+        if not match:
+            continue
+        # The interpreter startup imports come first, up to the site module
+        if not measured:
+            measured = match.group(3) == "site"
+            continue
+        # Modules imported by the connector and the action, with their own imports included
+        if len(match.group(2)) <= 3:
+            modules[match.group(3)] = int(match.group(1)) / 1000
+
+    return float(process.stdout.strip()), modules
+
+
+def main():
+    """Run the benchmark.
+
+    Returns:
+        int: Exit status
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters per action (Default: 5)")
+    parser.add_argument("--max-ms", type=float, help="Fail when the median import time of an action exceeds this many milliseconds")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to report (Default: 10)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for action_id in ACTIONS:
+        totals = []
+        module_times = {}
+        for _ in range(args.runs):
+            total, modules = measure_action(action_id)
+            totals.append(total)
+            for module, time_ms in modules.items():
+                module_times.setdefault(module, []).append(time_ms)
+        slowest = {module: round(statistics.median(times), 2) for module, times in module_times.items()}
+        results[action_id] = {
+            "median_ms": round(statistics.median(totals), 2),
+            "max_ms": round(max(totals), 2),
+            "slowest_modules": dict(sorted(slowest.items(), key=lambda item: item[1], reverse=True)[: args.top]),
+        }
+
+    failed = [action_id for action_id, result in results.items() if args.max_ms is not None and result["median_ms"] > args.max_ms]
+
+    if args.json:
+        print(json.dumps({"actions": results, "max_ms": args.max_ms, "failed": failed}, indent=4))
+    else:
+        for action_id, result in results.items():
+            marker = "  FAIL" if action_id in failed else ""
+            print(f"{action_id:32} median {result['median_ms']:8.2f} ms  max {result['max_ms']:8.2f} ms{marker}")
+        slowest = {}
+        for result in results.values():
+            for module, time_ms in result["slowest_modules"].items():
+                slowest[module] = max(slowest.get(module, 0), time_ms)
+        print("\nSlowest imports:")
+        for module, time_ms in sorted(slowest.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+            print(f"  {module:40} {time_ms:8.2f} ms")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,747 @@
+#!/usr/bin/python
+# File: mock_meraki_server.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Local stand-in for the Meraki dashboard API.
+
+Serves every endpoint the connector calls from a synthetic dataset of
+organizations, networks, devices, clients and firewall rules, with Link header
+pagination, ETags, action batches and optional latency, 429 and 5xx injection.
+Only the standard library is used. Point the asset ``base_url`` at the printed
+URL; any API key is accepted. Request counters are served at ``/_stats``.
+
+Usage:
+    python benchmarks/mock_meraki_server.py [--port 8080] [--devices 50000] [--latency-ms 50] [--error-rate-429 0.05]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+API_PATH = "/api/v1"
+AUTH_HEADER = "X-Cisco-Meraki-API-Key"
+STATS_PATH = "/_stats"
+MAX_PAGE_SIZE = 1000
+MODELS = ["MX68", "MX85", "MR46", "MR56", "MS120-8", "MS250-48", "MV12", "MG21"]
+PRODUCT_TYPES = {"MX": "appliance", "MR": "wireless", "MS": "switch", "MV": "camera", "MG": "cellularGateway"}
+TAGS = ["branch", "hq", "lab", "critical", "guest", "iot"]
+
+
+class Dataset:
+    """Synthetic Meraki organizations and everything they contain.
+
+    Devices are numbered and split evenly over the organizations, and the
+    devices of an organization evenly over its networks. Device and client
+    records are built from their number when requested, so large datasets only
+    keep the serial numbers and the changes made through the API in memory.
+    """
+
+    # Index of the extra network holding the rules with destination 'Any'
+    ANY_DESTINATION_NETWORK_INDEX = 99999
+
+    def __init__(self, organizations=1, networks=10, devices=1000, clients=20, l3_rules=20, l7_rules=5, seed=0, any_destination_l3_rules=0):
+        """Initialize the dataset.
+
+        Args:
+            organizations: Number of organizations
+            networks: Number of networks per organization
+            devices: Total number of devices
+            clients: Number of clients per device
+            l3_rules: Number of L3 firewall rules per network
+            l7_rules: Number of L7 firewall rules per network
+            seed: Seed of the generated values
+            any_destination_l3_rules: Number of L3 firewall rules with destination 'Any' of an extra
+                network without devices in every organization, 0 for no such network
+        """
+        self.seed = seed
+        self.clients_per_device = clients
+        self.lock = threading.Lock()
+        self.organizations = [self.get_organization_id(index) for index in range(organizations)]
+        self.networks = {}  # Network ID -> organization ID
+        self.network_devices = {}  # Network ID -> serials
+        self.inventory = {organization_id: [] for organization_id in self.organizations}
+        self.device_overrides = {}  # Serial -> changed or claimed fields
+        self.serial_numbers = {}  # Serial -> device number
+        self.l3_rules = {}
+        self.l7_rules = {}
+
+        for organization_index, organization_id in enumerate(self.organizations):
+            network_ids = [self.get_network_id(organization_id, index) for index in range(networks)]
+            for network_id in network_ids:
+                self.networks[network_id] = organization_id
+                self.network_devices[network_id] = []
+                self.l3_rules[network_id] = [self._l3_rule(network_id, index) for index in range(l3_rules)]
+                self.l7_rules[network_id] = [self._l7_rule(index) for index in range(l7_rules)]
+            if any_destination_l3_rules:
+                network_id = self.get_network_id(organization_id, self.ANY_DESTINATION_NETWORK_INDEX)
+                self.networks[network_id] = organization_id
+                self.network_devices[network_id] = []
+                self.l3_rules[network_id] = [dict(self._l3_rule(network_id, index), destCidr="Any") for index in range(any_destination_l3_rules)]
+                self.l7_rules[network_id] = []
+
+            first, last = devices * organization_index // organizations, devices * (organization_index + 1) // organizations
+            for number in range(first, last):
+                serial = self.get_serial(number)
+                self.serial_numbers[serial] = number
+                self.inventory[organization_id].append(serial)
+                network_id = network_ids[(number - first) * networks // max(last - first, 1)] if network_ids else None
+                if network_id:
+                    self.network_devices[network_id].append(serial)
+                    self.device_overrides[serial] = {"networkId": network_id}
+
+    @staticmethod
+    def get_organization_id(index):
+        """Get the ID of the organization with the given index."""
+        return str(100000 + index)
+
+    @staticmethod
+    def get_network_id(organization_id, index):
+        """Get the ID of the network with the given index in an organization."""
+        return f"L_{organization_id}{index:05d}"
+
+    @staticmethod
+    def get_serial(number):
+        """Get the serial number of a device number, sorting in the same order."""
+        return f"Q2MK-{number // 10000:04d}-{number % 10000:04d}"
+
+    def _random(self, *key):
+        """Get a random generator seeded by the dataset seed and a key."""
+        return random.Random(f"{self.seed}:{':'.join(str(part) for part in key)}")
+
+    def _l3_rule(self, network_id, index):
+        """Build an L3 firewall rule."""
+        rng = self._random("l3", network_id, index)
+        return {
+            "comment": f"Rule {index}",
+            "policy": rng.choice(["allow", "deny"]),
+            "protocol": rng.choice(["tcp", "udp", "any"]),
+            "srcPort": "Any",
+            "srcCidr": f"10.{rng.randrange(256)}.{rng.randrange(256)}.0/24",
+            "destPort": str(rng.choice([22, 53, 80, 443, 3389])),
+            "destCidr": f"172.{rng.randrange(16, 32)}.{rng.randrange(256)}.0/24",
+            "syslogEnabled": False,
+        }
+
+    def _l7_rule(self, index):
+        """Build an L7 firewall rule."""
+        return {"policy": "deny", "type": "host", "value": f"blocked{index}.example.com"}
+
+    def device(self, serial):
+        """Build the record of a device.
+
+        Args:
+            serial: Serial number
+
+        Returns:
+            dict: Device, or None if the serial is unknown
+        """
+        number = self.serial_numbers.get(serial)
+        overrides = self.device_overrides.get(serial, {})
+        if number is None and not overrides:
+            return None
+
+        rng = self._random("device", serial)
+        model = overrides.get("model") or rng.choice(MODELS)
+        device = {
+            "serial": serial,
+            "name": f"device-{serial[-9:]}",
+            "mac": ":".join(f"{byte:02x}" for byte in [0x0C, 0x8D, 0xDB] + [rng.randrange(256) for _ in range(3)]),
+            "model": model,
+            "productType": PRODUCT_TYPES[model[:2]],
+            "networkId": None,
+            "lanIp": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+            "firmware": f"{model[:2].lower()}-18-{rng.randrange(100, 200)}",
+            "tags": rng.sample(TAGS, rng.randrange(3)),
+            "address": f"{rng.randrange(1, 999)} Main St",
+            "lat": round(rng.uniform(-90, 90), 6),
+            "lng": round(rng.uniform(-180, 180), 6),
+            "notes": "",
+            "url": f"https://n1.meraki.com/devices/{serial}",
+            "details": [],
+            "configurationUpdatedAt": "2025-01-01T00:00:00Z",
+        }
+        device.update(overrides)
+        return device
+
+    def inventory_device(self, serial):
+        """Build the inventory record of a device."""
+        device = self.device(serial)
+        return {
+            "serial": serial,
+            "mac": device["mac"],
+            "name": device["name"],
+            "model": device["model"],
+            "productType": device["productType"],
+            "networkId": device["networkId"],
+            "orderNumber": f"4C{self.serial_numbers.get(serial, 0):08d}",
+            "claimedAt": "2024-06-01T00:00:00Z",
+            "licenseExpirationDate": "2028-06-01T00:00:00Z",
+            "tags": device["tags"],
+            "countryCode": "US",
+            "details": [],
+        }
+
+    def clients(self, serial):
+        """Build the clients of a device."""
+        rng = self._random("clients", serial)
+        return [
+            {
+                "id": f"k{hashlib.sha1(f'{serial}{index}'.encode()).hexdigest()[:6]}",
+                "description": f"client-{index}",
+                "mac": ":".join(f"{rng.randrange(256):02x}" for _ in range(6)),
+                "ip": f"192.168.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                "user": None,
+                "vlan": str(rng.choice([1, 10, 20])),
+                "usage": {"sent": rng.randrange(10**6), "recv": rng.randrange(10**7)},
+                "mdnsName": None,
+                "dhcpHostname": f"host-{index}",
+            }
+            for index in range(self.clients_per_device)
+        ]
+
+    def network_of_serial(self, serial):
+        """Get the network a device is in, or None."""
+        return self.device_overrides.get(serial, {}).get("networkId")
+
+    def move_device(self, serial, network_id):
+        """Add a device to a network, or remove it from its network when network_id is None."""
+        current = self.network_of_serial(serial)
+        if current:
+            self.network_devices[current].remove(serial)
+        if network_id:
+            self.network_devices[network_id].append(serial)
+        self.device_overrides.setdefault(serial, {})["networkId"] = network_id
+
+
+class MockMerakiServer:
+    """Class to run the stand-in API server.
+
+    Faults are injected at random before a request is served: a 429 with a
+    Retry-After header at ``error_rate_429`` and a 500, 502 or 503 at
+    ``error_rate_5xx``. Independently of that, ``rate_limit`` enforces a real
+    per-organization request rate like the dashboard does.
+    """
+
+    def __init__(
+        self,
+        dataset,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate_429=0.0,
+        error_rate_5xx=0.0,
+        retry_after=1.0,
+        rate_limit=0,
+        batch_delay=1.0,
+        seed=0,
+    ):
+        """Initialize the server.
+
+        Args:
+            dataset: Dataset served
+            host: Interface to listen on
+            port: Port to listen on (Default: any free port)
+            latency: Seconds added to every response
+            jitter: Maximum random seconds added on top of the latency
+            error_rate_429: Share of requests answered with a 429
+            error_rate_5xx: Share of requests answered with a 5xx error
+            retry_after: Retry-After value of the 429 responses, in seconds
+            rate_limit: Requests per second allowed per organization, 0 for no limit
+            batch_delay: Seconds an asynchronous action batch takes to complete
+            seed: Seed of the injected faults
+        """
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate_429 = error_rate_429
+        self.error_rate_5xx = error_rate_5xx
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self.batch_delay = batch_delay
+        self.stats = {"requests": 0, "bytes_sent": 0, "statuses": {}}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._batches = {}
+        self._routes = self._build_routes()
+
+        handler = type("MockMerakiHandler", (_RequestHandler,), {"server_state": self})
+        self._httpd = _HTTPServer((host, port), handler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """URL to configure as the asset base_url."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve requests on a background thread.
+
+        Returns:
+            str: Base URL of the server
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        """Serve requests on the current thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self):
+        """Stop serving requests."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _build_routes(self):
+        """Build the table of method, path pattern and handler."""
+        routes = [
+            ("GET", r"/organizations", self._list_organizations),
+            ("GET", r"/organizations/(?P<organization_id>[^/]+)/licenseState", self._get_license_state),
+            ("GET", r"/organizations/(?P<organization_id>[^/]+)/inventory/devices", self._list_inventory),
+            ("POST", r"/organizations/(?P<organization_id>[^/]+)/inventory/devices/claim", self._claim_devices),
+            ("GET", r"/organizations/(?P<organization_id>[^/]+)/devices", self._search_devices),
+            ("GET", r"/organizations/(?P<organization_id>[^/]+)/adaptivePolicy/(?P<kind>policies|acls|groups|settings)", self._adaptive),
+            ("POST", r"/organizations/(?P<organization_id>[^/]+)/actionBatches", self._create_batch),
+            ("GET", r"/organizations/(?P<organization_id>[^/]+)/actionBatches/(?P<batch_id>[^/]+)", self._get_batch),
+            ("GET", r"/networks/(?P<network_id>[^/]+)", self._get_network),
+            ("GET", r"/networks/(?P<network_id>[^/]+)/devices", self._list_network_devices),
+            ("PUT", r"/networks/(?P<network_id>[^/]+)/devices/(?P<serial>[^/]+)", self._update_device),
+            ("DELETE", r"/networks/(?P<network_id>[^/]+)/devices/(?P<serial>[^/]+)", self._remove_device),
+            ("GET", r"/networks/(?P<network_id>[^/]+)/appliance/firewall/(?P<layer>l3|l7)FirewallRules", self._get_rules),
+            ("PUT", r"/networks/(?P<network_id>[^/]+)/appliance/firewall/(?P<layer>l3|l7)FirewallRules", self._update_rules),
+            ("GET", r"/devices/(?P<serial>[^/]+)", self._get_device),
+            ("GET", r"/devices/(?P<serial>[^/]+)/clients", self._list_clients),
+        ]
+        return [(method, re.compile(f"^{API_PATH}{pattern}$"), handler) for method, pattern, handler in routes]
+
+    def handle(self, method, url, headers, body):
+        """Answer a request.
+
+        Args:
+            method: HTTP method
+            url: Request path and query string
+            headers: Request headers
+            body: Request body (bytes)
+
+        Returns:
+            tuple: Status code (int), response headers (dict), response body (bytes)
+        """
+        time.sleep(self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0))
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+
+        if not headers.get(AUTH_HEADER):
+            return self._error(401, "Invalid API key")
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(parsed.path)
+            if match and route_method == method:
+                break
+        else:
+            return self._error(404, "Not found")
+
+        fault = self._inject_fault(match.groupdict().get("organization_id") or match.groupdict().get("network_id"))
+        if fault:
+            return fault
+
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            return self._error(400, "Invalid JSON body")
+
+        with self.dataset.lock:
+            status, result, extra_headers = handler(query=query, payload=payload, path=parsed.path, **match.groupdict())
+
+        if status == 204:
+            return status, extra_headers, b""
+        content = json.dumps(result).encode()
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        if method == "GET" and status == 200:
+            extra_headers["ETag"] = etag
+            if headers.get("If-None-Match") == etag:
+                return 304, extra_headers, b""
+        return status, {"Content-Type": "application/json", **extra_headers}, content
+
+    def _inject_fault(self, scope):
+        """Answer with an injected or rate limit error, or None to serve the request."""
+        with self._lock:
+            draw = self._random.random()
+            if draw < self.error_rate_429:
+                return self._error(429, "Too many requests", {"Retry-After": str(self.retry_after)})
+            if draw < self.error_rate_429 + self.error_rate_5xx:
+                return self._error(self._random.choice([500, 502, 503]), "Injected server error")
+
+            if self.rate_limit:
+                organization_id = self.dataset.networks.get(scope, scope)
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(organization_id, (self.rate_limit, now))
+                tokens = min(self.rate_limit, tokens + (now - updated) * self.rate_limit)
+                if tokens < 1:
+                    self._buckets[organization_id] = (tokens, now)
+                    wait = (1 - tokens) / self.rate_limit
+                    return self._error(429, "Rate limit exceeded", {"Retry-After": f"{max(wait, 0.001):.3f}"})
+                self._buckets[organization_id] = (tokens - 1, now)
+        return None
+
+    @staticmethod
+    def _error(status, message, headers=None):
+        """Build an error response."""
+        return status, {"Content-Type": "application/json", **(headers or {})}, json.dumps({"errors": [message]}).encode()
+
+    def _paginate(self, path, query, keys, build):
+        """Serve one page of a collection with a Link header to the next page.
+
+        Args:
+            path: Request path
+            query: Query parameters
+            keys: Sorted keys of the collection items
+            build: Function building an item from its key
+
+        Returns:
+            tuple: Status code, page of items, headers
+        """
+        try:
+            per_page = min(int(query.get("perPage", [MAX_PAGE_SIZE])[0]), MAX_PAGE_SIZE)
+        except ValueError:
+            return 400, {"errors": ["Invalid perPage"]}, {}
+        if per_page < 3:
+            return 400, {"errors": ["perPage must be at least 3"]}, {}
+
+        start = 0
+        starting_after = query.get("startingAfter", [None])[0]
+        if starting_after is not None:
+            try:
+                start = keys.index(starting_after) + 1
+            except ValueError:
+                start = len(keys)
+        page_keys = keys[start : start + per_page]
+
+        headers = {}
+        if start + per_page < len(keys):
+            params = {key: values for key, values in query.items() if key != "startingAfter"}
+            params["startingAfter"] = [page_keys[-1]]
+            headers["Link"] = f"<{self.base_url}{path}?{urlencode(params, doseq=True)}>; rel=next"
+        return 200, [build(key) for key in page_keys], headers
+
+    def _list_organizations(self, query, path, **kwargs):
+        return self._paginate(
+            path, query, self.dataset.organizations, lambda org_id: {"id": org_id, "name": f"Org {org_id}", "url": "", "api": {"enabled": True}}
+        )
+
+    def _get_license_state(self, organization_id, **kwargs):
+        if organization_id not in self.dataset.inventory:
+            return 404, {"errors": ["Organization not found"]}, {}
+        return 200, {"status": "OK", "expirationDate": "Jun 1, 2028 UTC", "licensedDeviceCounts": {"MX": 10}}, {}
+
+    def _list_inventory(self, organization_id, query, path, **kwargs):
+        if organization_id not in self.dataset.inventory:
+            return 404, {"errors": ["Organization not found"]}, {}
+        return self._paginate(path, query, self.dataset.inventory[organization_id], self.dataset.inventory_device)
+
+    def _claim_devices(self, organization_id, payload, **kwargs):
+        if organization_id not in self.dataset.inventory:
+            return 404, {"errors": ["Organization not found"]}, {}
+        serials = (payload or {}).get("serials") or []
+        for serial in serials:
+            if not re.match(r"^Q[0-9A-Z]{3}-[0-9A-Z]{4}-[0-9A-Z]{4}$", serial):
+                return 400, {"errors": [f"Device with serial {serial} is invalid"]}, {}
+            if serial in self.dataset.device_overrides or serial in self.dataset.serial_numbers:
+                return 400, {"errors": [f"Device with serial {serial} is already claimed"]}, {}
+        for serial in serials:
+            self.dataset.device_overrides[serial] = {"networkId": None}
+            self.dataset.inventory[organization_id].append(serial)
+        return 200, {"serials": serials, "orders": [], "licenses": []}, {}
+
+    def _search_devices(self, organization_id, query, path, **kwargs):
+        if organization_id not in self.dataset.inventory:
+            return 404, {"errors": ["Organization not found"]}, {}
+        serials = [serial for serial in self.dataset.inventory[organization_id] if self.dataset.network_of_serial(serial)]
+        filters = {key: values for key, values in query.items() if key in ("serial", "mac", "model", "networkIds[]", "serials[]", "tags[]")}
+        if filters:
+            serials = [serial for serial in serials if self._matches(self.dataset.device(serial), filters)]
+        return self._paginate(path, query, serials, self.dataset.device)
+
+    @staticmethod
+    def _matches(device, filters):
+        """Check whether a device matches the search filters."""
+        for key, values in filters.items():
+            if key == "networkIds[]" and device["networkId"] not in values:
+                return False
+            if key == "serials[]" and device["serial"] not in values:
+                return False
+            if key == "tags[]" and not set(values) & set(device["tags"]):
+                return False
+            if key in ("serial", "mac", "model") and values[0].lower() not in device[key].lower():
+                return False
+        return True
+
+    def _adaptive(self, organization_id, kind, **kwargs):
+        if organization_id not in self.dataset.inventory:
+            return 404, {"errors": ["Organization not found"]}, {}
+        items = {
+            "policies": [{"adaptivePolicyId": "1", "sourceGroup": {"id": "1", "name": "Infra", "sgt": 2}, "acls": [], "lastEntryRule": "allow"}],
+            "acls": [{"aclId": "1", "name": "Block SSH", "ipVersion": "any", "rules": [{"policy": "deny", "protocol": "tcp", "dstPort": "22"}]}],
+            "groups": [{"groupId": "1", "name": "Infra", "sgt": 2, "isDefaultGroup": False}],
+            "settings": [{"enabledNetworks": list(self.dataset.networks)[:2]}],
+        }
+        return 200, items[kind], {}
+
+    def _get_network(self, network_id, **kwargs):
+        if network_id not in self.dataset.networks:
+            return 404, {"errors": ["Network not found"]}, {}
+        return 200, {"id": network_id, "organizationId": self.dataset.networks[network_id], "name": f"Network {network_id}"}, {}
+
+    def _list_network_devices(self, network_id, **kwargs):
+        if network_id not in self.dataset.networks:
+            return 404, {"errors": ["Network not found"]}, {}
+        return 200, [self.dataset.device(serial) for serial in self.dataset.network_devices[network_id]], {}
+
+    def _update_device(self, network_id, serial, payload, **kwargs):
+        if self.dataset.network_of_serial(serial) != network_id:
+            return 404, {"errors": ["Device not found in network"]}, {}
+        self.dataset.device_overrides[serial].update({key: value for key, value in (payload or {}).items() if key != "serial"})
+        return 200, self.dataset.device(serial), {}
+
+    def _remove_device(self, network_id, serial, **kwargs):
+        if self.dataset.network_of_serial(serial) != network_id:
+            return 404, {"errors": ["Device not found in network"]}, {}
+        self.dataset.move_device(serial, None)
+        return 204, None, {}
+
+    def _get_rules(self, network_id, layer, **kwargs):
+        if network_id not in self.dataset.networks:
+            return 404, {"errors": ["Network not found"]}, {}
+        if layer == "l3":
+            default_rule = {"comment": "Default rule", "policy": "allow", "protocol": "Any", "srcPort": "Any", "srcCidr": "Any"}
+            default_rule.update({"destPort": "Any", "destCidr": "Any", "syslogEnabled": False})
+            return 200, {"rules": [*self.dataset.l3_rules[network_id], default_rule]}, {}
+        return 200, {"rules": self.dataset.l7_rules[network_id]}, {}
+
+    def _update_rules(self, network_id, layer, payload, **kwargs):
+        if network_id not in self.dataset.networks:
+            return 404, {"errors": ["Network not found"]}, {}
+        rules = (payload or {}).get("rules")
+        if not isinstance(rules, list):
+            return 400, {"errors": ["'rules' must be an array"]}, {}
+        (self.dataset.l3_rules if layer == "l3" else self.dataset.l7_rules)[network_id] = rules
+        return self._get_rules(network_id, layer)
+
+    def _get_device(self, serial, **kwargs):
+        device = self.dataset.device(serial)
+        if device is None:
+            return 404, {"errors": ["Device not found"]}, {}
+        return 200, device, {}
+
+    def _list_clients(self, serial, **kwargs):
+        if self.dataset.device(serial) is None:
+            return 404, {"errors": ["Device not found"]}, {}
+        return 200, self.dataset.clients(serial), {}
+
+    def _create_batch(self, organization_id, payload, **kwargs):
+        payload = payload or {}
+        actions = payload.get("actions") or []
+        limit = 20 if payload.get("synchronous") else 100
+        if not actions or len(actions) > limit:
+            return 400, {"errors": [f"An action batch must hold between 1 and {limit} actions"]}, {}
+
+        errors = []
+        for action in actions:
+            error = self._run_batch_action(action, dry_run=True)
+            if error:
+                errors.append(error)
+        if not errors:
+            for action in actions:
+                self._run_batch_action(action)
+
+        batch_id = str(len(self._batches) + 1)
+        batch = {
+            "id": batch_id,
+            "organizationId": organization_id,
+            "confirmed": True,
+            "synchronous": bool(payload.get("synchronous")),
+            "actions": actions,
+            "status": {"completed": False, "failed": bool(errors), "errors": errors, "createdResources": []},
+            "completes_at": time.monotonic() + (0 if payload.get("synchronous") else self.batch_delay),
+        }
+        self._batches[batch_id] = batch
+        return 201, self._batch_view(batch), {}
+
+    def _get_batch(self, batch_id, **kwargs):
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            return 404, {"errors": ["Action batch not found"]}, {}
+        return 200, self._batch_view(batch), {}
+
+    @staticmethod
+    def _batch_view(batch):
+        """Get the API representation of an action batch."""
+        view = {key: value for key, value in batch.items() if key != "completes_at"}
+        view["status"] = dict(batch["status"], completed=not batch["status"]["failed"] and time.monotonic() >= batch["completes_at"])
+        return view
+
+    def _run_batch_action(self, action, dry_run=False):
+        """Apply one action of a batch.
+
+        Args:
+            action: Batch action
+            dry_run: Only check that the action can be applied
+
+        Returns:
+            str: Error message, or None on success
+        """
+        resource, operation, body = action.get("resource", ""), action.get("operation"), action.get("body") or {}
+        match = re.match(r"^/devices/([^/]+)$", resource)
+        if match and operation == "update":
+            serial = match.group(1)
+            if self.dataset.device(serial) is None:
+                return f"Device {serial} not found"
+            if not dry_run:
+                self.dataset.device_overrides.setdefault(serial, {}).update(body)
+            return None
+
+        match = re.match(r"^/networks/([^/]+)/devices$", resource)
+        if match and operation in ("claim", "remove"):
+            network_id = match.group(1)
+            if network_id not in self.dataset.networks:
+                return f"Network {network_id} not found"
+            serials = body.get("serials") or [body.get("serial")]
+            for serial in serials:
+                if self.dataset.device(serial) is None:
+                    return f"Device {serial} not found"
+                if operation == "remove" and self.dataset.network_of_serial(serial) != network_id:
+                    return f"Device {serial} is not in network {network_id}"
+                if operation == "claim" and self.dataset.network_of_serial(serial):
+                    return f"Device {serial} is already in a network"
+            if not dry_run:
+                for serial in serials:
+                    self.dataset.move_device(serial, network_id if operation == "claim" else None)
+            return None
+
+        return f"Unsupported action {operation} on {resource}"
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server accepting the connection bursts of concurrent clients."""
+
+    daemon_threads = True
+    # The default backlog of 5 drops connections when many requests start at once
+    request_queue_size = 128
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Request handler forwarding every request to the MockMerakiServer."""
+
+    protocol_version = "HTTP/1.1"
+    server_state = None
+
+    def log_message(self, format, *args):
+        """Keep the console quiet."""
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.path == STATS_PATH:
+            # Counters of the server itself, outside the API and not counted
+            with self.server_state._lock:
+                content = json.dumps(self.server_state.stats).encode()
+            self._send(200, {"Content-Type": "application/json"}, content)
+            return
+
+        status, headers, content = self.server_state.handle(self.command, self.path, self.headers, body)
+        self._send(status, headers, content)
+
+        state = self.server_state
+        with state._lock:
+            state.stats["requests"] += 1
+            state.stats["bytes_sent"] += len(content)
+            state.stats["statuses"][status] = state.stats["statuses"].get(status, 0) + 1
+
+    def _send(self, status, headers, content):
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+
+def main():
+    """Run the server until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (Default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (Default: 8080)")
+    parser.add_argument("--organizations", type=int, default=1, help="Number of organizations (Default: 1)")
+    parser.add_argument("--networks", type=int, default=10, help="Number of networks per organization (Default: 10)")
+    parser.add_argument("--devices", type=int, default=1000, help="Total number of devices (Default: 1000)")
+    parser.add_argument("--clients", type=int, default=20, help="Number of clients per device (Default: 20)")
+    parser.add_argument("--l3-rules", type=int, default=20, help="Number of L3 firewall rules per network (Default: 20)")
+    parser.add_argument(
+        "--any-destination-l3-rules",
+        type=int,
+        default=0,
+        help="Number of L3 firewall rules with destination 'Any' of an extra network per organization, 0 for none (Default: 0)",
+    )
+    parser.add_argument("--l7-rules", type=int, default=5, help="Number of L7 firewall rules per network (Default: 5)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Milliseconds added to every response (Default: 0)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Maximum random milliseconds added to the latency (Default: 0)")
+    parser.add_argument("--error-rate-429", type=float, default=0, help="Share of requests answered with a 429 (Default: 0)")
+    parser.add_argument("--error-rate-5xx", type=float, default=0, help="Share of requests answered with a 5xx error (Default: 0)")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After of the injected 429 responses in seconds (Default: 1)")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per second allowed per organization, 0 for none (Default: 0)")
+    parser.add_argument("--batch-delay", type=float, default=1, help="Seconds an asynchronous action batch takes (Default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the dataset and the injected faults (Default: 0)")
+    args = parser.parse_args()
+
+    dataset = Dataset(
+        args.organizations, args.networks, args.devices, args.clients, args.l3_rules, args.l7_rules, args.seed, args.any_destination_l3_rules
+    )
+    server = MockMerakiServer(
+        dataset,
+        args.host,
+        args.port,
+        args.latency_ms / 1000,
+        args.jitter_ms / 1000,
+        args.error_rate_429,
+        args.error_rate_5xx,
+        args.retry_after,
+        args.rate_limit,
+        args.batch_delay,
+        args.seed,
+    )
+    # The first line is read by run_benchmarks.py to find the port
+    print(f"Serving {len(dataset.organizations)} organizations and {len(dataset.serial_numbers)} devices on {server.base_url}", flush=True)
+    print(f"Organization IDs: {', '.join(dataset.organizations[:5])}{' ...' if len(dataset.organizations) > 5 else ''}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+#!/usr/bin/python
+# File: run_benchmarks.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Benchmark every action against the local Meraki API stand-in.
+
+For every dataset scale, mock_meraki_server.py is started with that many
+devices and every action is run several times against it. The runs of an action
+happen in a fresh process, like on SOAR, which also keeps the peak RSS and CPU
+time of one action apart from the others. The report holds, per action:
+
+- requests_per_second: API requests served divided by the time spent in the action
+- p50_ms, p99_ms: Latency of one action run
+- cpu_ms: CPU time of the process, over all the runs
+- json_cpu_ms: CPU time spent in ciscomeraki_json.loads and dumps
+- validate_rule_cpu_ms: CPU time spent in the _validate_rule firewall rule validators
+- peak_rss_mb: Peak resident memory of the process
+
+Results are compared with a baseline saved by an earlier run with ``--output``.
+A metric worse than the baseline by more than ``--threshold``, and by more than
+its noise floor, is a regression and makes the script exit with status 1.
+Baselines are only comparable on the same machine with the same --latency-ms,
+so none is committed: save one with ``--output benchmarks/baseline.json`` first.
+Without a baseline a warning is printed and nothing is compared; a missing
+baseline given with ``--baseline`` is an error, and ``--baseline ""`` skips the
+comparison on purpose.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--scales 1k,50k,200k] [--actions list_devices,...] [--iterations 5]
+        [--baseline benchmarks/baseline.json] [--threshold 0.2] [--output results.json] [--json]
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from mock_meraki_server import STATS_PATH, Dataset
+
+
+SCALES = {"1k": 1000, "50k": 50000, "200k": 200000}
+DEVICES_PER_NETWORK = 1000
+CLAIM_BATCH_SIZE = 10
+ANY_DESTINATION_L3_RULES = 4000
+SERVER_START_TIMEOUT = 120
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+SERVER_URL_REGEX = re.compile(r"on (http://\S+)$")
+
+# Metric: (whether a higher value is worse, differences under this are noise)
+METRICS = {
+    "requests_per_second": (False, 5.0),
+    "p50_ms": (True, 5.0),
+    "p99_ms": (True, 10.0),
+    "cpu_ms": (True, 10.0),
+    "json_cpu_ms": (True, 5.0),
+    "validate_rule_cpu_ms": (True, 1.0),
+    "peak_rss_mb": (True, 5.0),
+}
+
+L3_RULE = {
+    "comment": "Benchmark",
+    "policy": "deny",
+    "protocol": "tcp",
+    "srcPort": "1-65535",
+    "srcCidr": "10.0.0.0/8",
+    "destPort": "22",
+    "destCidr": "192.168.0.0/16",
+}
+L7_RULE = {"policy": "deny", "type": "host", "value": "benchmark.example.com"}
+
+
+def get_scenarios():
+    """Get the parameters of every run of every benchmarked action.
+
+    The dataset layout of mock_meraki_server.py is the same at every scale, so
+    the same organization, network and devices exist in all of them.
+
+    Returns:
+        dict: Scenario name -> (action identifier, function of the run index returning the action parameters)
+    """
+    organization_id = Dataset.get_organization_id(0)
+    network_id = Dataset.get_network_id(organization_id, 0)
+    any_destination_network_id = Dataset.get_network_id(organization_id, Dataset.ANY_DESTINATION_NETWORK_INDEX)
+    serial = Dataset.get_serial(0)
+    rules = json.dumps([dict(L3_RULE, comment=f"Benchmark {index}", destPort=str(index + 1)) for index in range(50)])
+
+    return {
+        "test_connectivity": ("test_connectivity", lambda run: {}),
+        "list_organizations": ("list_organizations", lambda run: {"bypass_cache": True}),
+        "list_org_inventory_devices": ("list_org_inventory_devices", lambda run: {"organization_id": organization_id, "bypass_cache": True}),
+        "list_org_inventory_devices[stream_results]": (
+            "list_org_inventory_devices",
+            lambda run: {"organization_id": organization_id, "bypass_cache": True, "stream_results": True},
+        ),
+        "list_org_license_states": ("list_org_license_states", lambda run: {"organization_id": organization_id}),
+        "search_devices": ("search_devices", lambda run: {"organization_id": organization_id, "model": "MX", "bypass_cache": True}),
+        "list_devices": ("list_devices", lambda run: {"network_id": network_id, "bypass_cache": True}),
+        "update_device": ("update_device", lambda run: {"network_id": network_id, "serial": serial, "name": f"benchmark-{run}"}),
+        # Every run removes another device of the first network
+        "remove_device": ("remove_device", lambda run: {"network_id": network_id, "serial": Dataset.get_serial(1 + run)}),
+        "list_device_clients": ("list_device_clients", lambda run: {"serial": serial}),
+        "list_device_clients[stream_results]": ("list_device_clients", lambda run: {"serial": serial, "stream_results": True}),
+        "claim_device": (
+            "claim_device",
+            lambda run: {
+                "organization_id": organization_id,
+                "serials": ",".join(f"Q2BN-{run:04d}-{index:04d}" for index in range(CLAIM_BATCH_SIZE)),
+            },
+        ),
+        "list_l3_firewall_rules": ("list_l3_firewall_rules", lambda run: {"network_id": network_id, "bypass_cache": True}),
+        "update_l3_firewall_rules": ("update_l3_firewall_rules", lambda run: {"network_id": network_id, "rules": rules}),
+        "analyze_l3_firewall_rules": ("analyze_l3_firewall_rules", lambda run: {"network_id": network_id, "bypass_cache": True}),
+        # Rules sharing their destination must not be compared pairwise
+        "analyze_l3_firewall_rules[any_destination]": (
+            "analyze_l3_firewall_rules",
+            lambda run: {"network_id": any_destination_network_id, "bypass_cache": True},
+        ),
+        "check_l3_firewall_flows": (
+            "check_l3_firewall_flows",
+            lambda run: {"network_id": network_id, "src_ip": "10.1.1.1", "dest_ip": "192.168.1.1", "dest_port": "22", "bypass_cache": True},
+        ),
+        "list_l7_firewall_rules": ("list_l7_firewall_rules", lambda run: {"network_id": network_id, "bypass_cache": True}),
+        "update_l7_firewall_rules": ("update_l7_firewall_rules", lambda run: {"network_id": network_id, "rules": json.dumps([L7_RULE])}),
+        "list_adaptive_policies": ("list_adaptive_policies", lambda run: {"organization_id": organization_id, "bypass_cache": True}),
+        "list_adaptive_policy_acls": ("list_adaptive_policy_acls", lambda run: {"organization_id": organization_id, "bypass_cache": True}),
+        "list_adaptive_policy_groups": ("list_adaptive_policy_groups", lambda run: {"organization_id": organization_id, "bypass_cache": True}),
+        "list_adaptive_policy_settings": (
+            "list_adaptive_policy_settings",
+            lambda run: {"organization_id": organization_id, "bypass_cache": True},
+        ),
+    }
+
+
+def _instrument(cpu_times):
+    """Wrap the JSON codec and the rule validators to add up the CPU time spent in them.
+
+    Args:
+        cpu_times: Dictionary the CPU seconds are added to, per metric
+    """
+    import ciscomeraki_json
+    from actions import ACTIONS
+
+    lock = threading.Lock()
+
+    def timed(function, metric):
+        def wrapper(*args, **kwargs):
+            # The CPU time of the calling thread only, as actions use worker threads
+            start = time.thread_time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.thread_time() - start
+                with lock:
+                    cpu_times[metric] += elapsed
+
+        return wrapper
+
+    ciscomeraki_json.loads = timed(ciscomeraki_json.loads, "json_cpu_ms")
+    ciscomeraki_json.dumps = timed(ciscomeraki_json.dumps, "json_cpu_ms")
+    for action_id, class_name in ACTIONS.items():
+        action_class = getattr(__import__(f"actions.ciscomeraki_{action_id}", fromlist=[class_name]), class_name)
+        if "_validate_rule" in vars(action_class):
+            action_class._validate_rule = timed(action_class._validate_rule, "validate_rule_cpu_ms")
+
+
+def _run_action(base_url, action_id, params, queue):
+    """Run an action once per set of parameters and report its measurements.
+
+    Runs in a separate process, so that the peak RSS and CPU time only cover this action.
+
+    Args:
+        base_url: URL of the stand-in server
+        action_id: Action identifier
+        params: Parameters of every run
+        queue: Queue the measurements are put on
+    """
+    import resource
+
+    import phantom.app as phantom
+
+    from ciscomeraki_connector import CiscoMerakiConnector
+
+    state_dir = tempfile.mkdtemp(prefix="ciscomeraki_benchmark_")
+
+    class BenchmarkConnector(CiscoMerakiConnector):
+        """Connector keeping its state in a private directory, so runs start from the same state."""
+
+        def get_state_dir(self):
+            return state_dir
+
+        def load_state(self):
+            return self._benchmark_state
+
+        def save_state(self, state):
+            self._benchmark_state = state
+
+    cpu_times = {"json_cpu_ms": 0.0, "validate_rule_cpu_ms": 0.0}
+    _instrument(cpu_times)
+    config = {"base_url": base_url, "api_key": "benchmark", "verify_server_cert": False}
+    latencies = []
+    errors = []
+    state = {}
+    cpu_start = time.process_time()
+    for param in params:
+        connector = BenchmarkConnector()
+        connector._benchmark_state = state
+        in_json = {"action": action_id, "identifier": action_id, "config": config, "parameters": [param]}
+        start = time.perf_counter()
+        connector._handle_action(json.dumps(in_json), None)
+        latencies.append(time.perf_counter() - start)
+        state = connector._benchmark_state
+        errors.extend(result.get_message() for result in connector.get_action_results() if phantom.is_fail(result.get_status()))
+    cpu_time = time.process_time() - cpu_start
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    queue.put(
+        {
+            "latencies": latencies,
+            "cpu_ms": cpu_time * 1000,
+            "json_cpu_ms": cpu_times["json_cpu_ms"] * 1000,
+            "validate_rule_cpu_ms": cpu_times["validate_rule_cpu_ms"] * 1000,
+            "peak_rss_mb": peak_rss,
+            "errors": errors,
+        }
+    )
+
+
+def _percentile(values, percent):
+    """Get the nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def _get_server_requests(base_url):
+    """Get the number of requests served by the stand-in server so far."""
+    with urllib.request.urlopen(f"{base_url}{STATS_PATH}") as response:
+        return json.loads(response.read())["requests"]
+
+
+def start_server(devices, latency_ms):
+    """Start the stand-in server in a separate process.
+
+    Args:
+        devices: Number of devices of the dataset
+        latency_ms: Milliseconds added to every response
+
+    Returns:
+        tuple: Server process, base URL
+    """
+    command = [
+        sys.executable,
+        os.path.join(BENCHMARKS_DIR, "mock_meraki_server.py"),
+        "--port",
+        "0",
+        "--devices",
+        str(devices),
+        "--networks",
+        str(max(devices // DEVICES_PER_NETWORK, 1)),
+        "--latency-ms",
+        str(latency_ms),
+        "--batch-delay",
+        "0",
+        "--any-destination-l3-rules",
+        str(ANY_DESTINATION_L3_RULES),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    # The dataset is built before the server prints its URL
+    timer = threading.Timer(SERVER_START_TIMEOUT, process.kill)
+    timer.start()
+    try:
+        match = SERVER_URL_REGEX.search(process.stdout.readline().strip())
+    finally:
+        timer.cancel()
+    if not match:
+        process.kill()
+        raise RuntimeError(f"Could not start the stand-in server with {devices} devices")
+    return process, match.group(1)
+
+
+def benchmark_scale(devices, scenarios, iterations, latency_ms):
+    """Benchmark actions against a dataset.
+
+    Args:
+        devices: Number of devices of the dataset
+        scenarios: Names of the scenarios to run
+        iterations: Number of runs of every action
+        latency_ms: Milliseconds added to every response
+
+    Returns:
+        dict: Measurements per scenario
+    """
+    process, base_url = start_server(devices, latency_ms)
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    try:
+        for name, (action_id, get_params) in get_scenarios().items():
+            if name not in scenarios:
+                continue
+            queue = context.Queue()
+            requests_before = _get_server_requests(base_url)
+            worker = context.Process(target=_run_action, args=(base_url, action_id, [get_params(run) for run in range(iterations)], queue))
+            worker.start()
+            measurements = queue.get()
+            worker.join()
+            requests = _get_server_requests(base_url) - requests_before
+
+            latencies = measurements.pop("latencies")
+            results[name] = {
+                "requests": requests,
+                "requests_per_second": round(requests / sum(latencies), 2),
+                "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+                "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+                **{metric: round(value, 2) for metric, value in measurements.items() if metric != "errors"},
+                "failed_runs": len(measurements["errors"]),
+                "errors": measurements["errors"][:3],
+            }
+    finally:
+        process.kill()
+        process.wait()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Find the metrics that regressed from the baseline.
+
+    Args:
+        results: Measurements per scale and scenario
+        baseline: Baseline measurements per scale and scenario
+        threshold: Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        list: Regressions, as dicts
+    """
+    regressions = []
+    for scale, scenarios in results.items():
+        for name, metrics in scenarios.items():
+            expected = baseline.get(scale, {}).get(name)
+            if not expected:
+                continue
+            for metric, (higher_is_worse, noise) in METRICS.items():
+                if metric not in expected or not expected[metric]:
+                    continue
+                change = (metrics[metric] - expected[metric]) / expected[metric]
+                if not higher_is_worse:
+                    change = -change
+                if change > threshold and abs(metrics[metric] - expected[metric]) > noise:
+                    regressions.append(
+                        {
+                            "scale": scale,
+                            "scenario": name,
+                            "metric": metric,
+                            "baseline": expected[metric],
+                            "value": metrics[metric],
+                            "change": round(change, 3),
+                        }
+                    )
+    return regressions
+
+
+def main():
+    """Run the benchmarks.
+
+    Returns:
+        int: Exit status
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default=",".join(SCALES), help=f"Comma-separated dataset scales, of {', '.join(SCALES)} (Default: all)")
+    parser.add_argument("--actions", help="Comma-separated scenarios to run (Default: all)")
+    parser.add_argument("--iterations", type=int, default=5, help="Number of runs of every action (Default: 5)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Milliseconds the stand-in server adds to every response (Default: 0)")
+    parser.add_argument("--baseline", help="Baseline results to compare with, or an empty string for none (Default: benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression of a metric (Default: 0.2)")
+    parser.add_argument("--output", help="Write the results to this file, to use as a baseline later")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    all_scenarios = list(get_scenarios())
+    scenarios = [name.strip() for name in args.actions.split(",") if name.strip()] if args.actions else all_scenarios
+    unknown += [name for name in scenarios if name not in all_scenarios]
+    if unknown:
+        parser.error(f"Unknown scales or actions: {', '.join(unknown)}")
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f"Baseline {args.baseline} not found")
+    if args.baseline is None:
+        args.baseline = DEFAULT_BASELINE
+        if not os.path.exists(args.baseline):
+            print(
+                f"WARNING: no baseline at {args.baseline}, regressions are not checked; save one with --output {os.path.relpath(args.baseline)}",
+                file=sys.stderr,
+            )
+            args.baseline = None
+
+    results = {}
+    for scale in scales:
+        results[scale] = benchmark_scale(SCALES[scale], scenarios, args.iterations, args.latency_ms)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file).get("results", {})
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "latency_ms": args.latency_ms,
+        },
+        "results": results,
+        "baseline": args.baseline if baseline else None,
+        "threshold": args.threshold,
+        "regressions": regressions,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=4)
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        for scale, scenarios_results in results.items():
+            print(f"\n{scale} devices")
+            print(f"  {'action':44} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'cpu ms':>9} {'json ms':>8} {'rule ms':>8} {'rss MB':>7}")
+            for name, metrics in scenarios_results.items():
+                failed = f"  {metrics['failed_runs']} FAILED: {metrics['errors'][0]}" if metrics["failed_runs"] else ""
+                print(
+                    f"  {name:44} {metrics['requests_per_second']:9.1f} {metrics['p50_ms']:9.1f} {metrics['p99_ms']:9.1f}"
+                    f" {metrics['cpu_ms']:9.1f} {metrics['json_cpu_ms']:8.1f} {metrics['validate_rule_cpu_ms']:8.1f}"
+                    f" {metrics['peak_rss_mb']:7.1f}{failed}"
+                )
+        if baseline:
+            print(f"\n{len(regressions)} regressions over {args.threshold:.0%} from {args.baseline}")
+            for regression in regressions:
+                print(
+                    f"  {regression['scale']:5} {regression['scenario']:44} {regression['metric']:20}"
+                    f" {regression['baseline']:10.2f} -> {regression['value']:10.2f} ({regression['change']:+.0%})"
+                )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
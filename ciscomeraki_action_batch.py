@@ -0,0 +1,210 @@
+#!/usr/bin/python
+# File: ciscomeraki_action_batch.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import re
+import time
+
+import phantom.app as phantom
+from phantom.action_result import ActionResult
+
+import ciscomeraki_consts as consts
+
+
+# Status of an operation in the results of ActionBatchRunner.run
+OPERATION_COMPLETED = "completed"
+OPERATION_FAILED = "failed"
+OPERATION_PENDING = "pending"
+OPERATION_NOT_SUBMITTED = "not_submitted"
+
+
+class ActionBatchRunner:
+    """Class to run bulk write operations through Meraki action batches.
+
+    Up to 20 operations are sent as one synchronous batch. Larger sets are split
+    into asynchronous batches of up to 100 operations, of which at most five are
+    left unfinished at any time as Meraki requires, and the batches are polled
+    until they finish or the action time budget runs out. A batch is applied
+    atomically, so every operation gets the status of its batch, unless failed
+    batches are bisected: then a failed batch is split in halves and resubmitted
+    until the failing operations are isolated.
+    """
+
+    def __init__(self, utils, organization_id):
+        """Initialize the runner.
+
+        Args:
+            utils: CiscoMerakiUtils instance used for the API calls
+            organization_id: Organization the batches are created in
+        """
+        self._utils = utils
+        self._organization_id = organization_id
+
+    def run(self, actions, bisect=False):
+        """Run operations in action batches.
+
+        Args:
+            actions: Batch actions, each a dict of resource, operation and body
+            bisect: Split failed batches to find the operations causing the failure (Default: False)
+
+        Returns:
+            list: One result per action, in the same order, with the status,
+                the action batch ID and the error message if any
+        """
+        synchronous = len(actions) <= consts.ACTION_BATCH_MAX_SYNC_ACTIONS
+        chunk_size = consts.ACTION_BATCH_MAX_SYNC_ACTIONS if synchronous else consts.ACTION_BATCH_MAX_ACTIONS
+        chunks = [(start, actions[start : start + chunk_size]) for start in range(0, len(actions), chunk_size)]
+        results = [None] * len(actions)
+        retried = chunks if bisect else None  # Halves of failed batches are submitted next
+
+        running = {}  # Unfinished batch ID -> chunk
+        poll_interval = consts.ACTION_BATCH_POLL_INTERVAL
+        while chunks or running:
+            while chunks and len(running) < consts.ACTION_BATCH_MAX_RUNNING:
+                chunk = chunks.pop(0)
+                ret_val, batch = self._create_batch(chunk[1], synchronous)
+                if phantom.is_fail(ret_val):
+                    # Only a rejection caused by some of the operations can be narrowed down;
+                    # an invalid API key or organization rejects every half the same way
+                    if re.match(consts.VALIDATION_ERROR_REGEX, batch) and self._bisect(retried, chunk):
+                        continue
+                    self._set_results(results, chunk, OPERATION_FAILED, error=batch)
+                elif not self._finish_batch(results, chunk, batch, retried):
+                    running[batch["id"]] = chunk
+
+            if not running:
+                continue
+
+            if self._utils._retry_policy.get_remaining_time() <= poll_interval + consts.RETRY_MIN_REQUEST_TIME:
+                # Out of time: the running batches keep going on the Meraki side
+                for batch_id, chunk in running.items():
+                    self._set_results(results, chunk, OPERATION_PENDING, batch_id)
+                for chunk in chunks:
+                    self._set_results(results, chunk, OPERATION_NOT_SUBMITTED, error="Action time budget exhausted")
+                break
+
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, consts.ACTION_BATCH_MAX_POLL_INTERVAL)
+            for batch_id, chunk in list(running.items()):
+                ret_val, batch = self._utils._make_rest_call(
+                    consts.ACTION_BATCH_DETAILS.format(organization_id=self._organization_id, action_batch_id=batch_id), ActionResult()
+                )
+                # Keep polling batches whose status could not be fetched
+                if phantom.is_success(ret_val) and self._finish_batch(results, chunk, batch, retried):
+                    del running[batch_id]
+
+        return results
+
+    def _create_batch(self, actions, synchronous):
+        """Create an action batch.
+
+        Args:
+            actions: Batch actions
+            synchronous: Whether Meraki should run the batch before responding
+
+        Returns:
+            tuple: Status (bool), created batch (dict) or error message (str)
+        """
+        action_result = ActionResult()
+        ret_val, batch = self._utils._make_rest_call(
+            consts.ACTION_BATCHES.format(organization_id=self._organization_id),
+            action_result,
+            method="post",
+            json={"confirmed": True, "synchronous": synchronous, "actions": actions},
+        )
+        if phantom.is_fail(ret_val):
+            return ret_val, action_result.get_message()
+        if not isinstance(batch, dict) or not batch.get("id"):
+            return phantom.APP_ERROR, "Unexpected response while creating the action batch"
+
+        return phantom.APP_SUCCESS, batch
+
+    def _finish_batch(self, results, chunk, batch, retried=None):
+        """Record the results of a batch if it has finished.
+
+        Args:
+            results: Results of all operations
+            chunk: Offset of the batch in the operations and its actions
+            batch: Action batch returned by the API
+            retried: Chunks left to submit, where the halves of a failed batch
+                are put to bisect it, or None to fail all its operations
+
+        Returns:
+            bool: True if the batch has finished
+        """
+        status = batch.get("status") or {}
+        if status.get("failed"):
+            if self._bisect(retried, chunk):
+                return True
+            errors = "; ".join(str(error) for error in status.get("errors") or []) or "Action batch failed"
+            self._set_results(results, chunk, OPERATION_FAILED, batch["id"], errors)
+            return True
+        if status.get("completed"):
+            self._set_results(results, chunk, OPERATION_COMPLETED, batch["id"])
+            return True
+
+        return False
+
+    @staticmethod
+    def _bisect(retried, chunk):
+        """Submit the halves of a failed batch next, to find the failing operations.
+
+        Args:
+            retried: Chunks left to submit, or None when failed batches are not bisected
+            chunk: Offset of the failed batch in the operations and its actions
+
+        Returns:
+            bool: True if the batch was split, False if it cannot be
+        """
+        start, actions = chunk
+        if retried is None or len(actions) == 1:
+            return False
+
+        middle = len(actions) // 2
+        retried[:0] = [(start, actions[:middle]), (start + middle, actions[middle:])]
+        return True
+
+    def _set_results(self, results, chunk, status, action_batch_id=None, error=None):
+        """Set the result of every operation of a batch.
+
+        Args:
+            results: Results of all operations
+            chunk: Offset of the batch in the operations and its actions
+            status: Status of the operations
+            action_batch_id: ID of the action batch
+            error: Error message
+        """
+        start, actions = chunk
+        for index in range(start, start + len(actions)):
+            results[index] = {"status": status, "action_batch_id": action_batch_id, "error": error}
+
+
+def get_batch_summary(results):
+    """Get the summary entries of a bulk write.
+
+    Args:
+        results: Results returned by ActionBatchRunner.run
+
+    Returns:
+        dict: Summary entries
+    """
+    statuses = [result["status"] for result in results]
+    return {
+        "total_operations": len(results),
+        "operations_completed": statuses.count(OPERATION_COMPLETED),
+        "operations_failed": statuses.count(OPERATION_FAILED),
+        "operations_pending": statuses.count(OPERATION_PENDING) + statuses.count(OPERATION_NOT_SUBMITTED),
+        "action_batch_ids": list(dict.fromkeys(result["action_batch_id"] for result in results if result["action_batch_id"])),
+    }
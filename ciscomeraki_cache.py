@@ -0,0 +1,243 @@
+#!/usr/bin/python
+# File: ciscomeraki_cache.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+import ciscomeraki_consts as consts
+import ciscomeraki_json
+from ciscomeraki_store import LockedStateFile
+
+
+class ResponseCache:
+    """Class to cache API responses of read-only requests across action runs.
+
+    Each body is kept in its own file inside the cache directory, next to a small
+    locked index holding the expiry time, size and endpoint of every entry. The
+    index is ordered from least to most recently used, and entries are evicted
+    from the front once the total size exceeds the byte budget.
+    """
+
+    def __init__(self, cache_dir, max_bytes=consts.RESPONSE_CACHE_MAX_BYTES):
+        """Initialize the response cache.
+
+        Args:
+            cache_dir: Directory holding the cache, or None to disable caching
+            max_bytes: Maximum total size of the cached bodies
+        """
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._index = None
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError:
+                return
+            self._index = LockedStateFile(os.path.join(cache_dir, consts.RESPONSE_CACHE_INDEX))
+
+    def _get_entry_path(self, key):
+        """Get the path of the file holding the body of an entry."""
+        return os.path.join(self._cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Get a fresh cache entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            dict: Cached body and Link header, or None on a miss
+        """
+        if self._index is None:
+            return None
+
+        with self._index.locked() as index:
+            entry = index.pop(key, None)
+            if entry is None:
+                return None
+            if entry["expires"] <= time.time():
+                self._remove_file(key)
+                return None
+
+            try:
+                with open(self._get_entry_path(key), "rb") as entry_file:
+                    cached = ciscomeraki_json.loads(entry_file.read())
+            except (OSError, ValueError):
+                return None
+
+            # Mark as most recently used
+            index[key] = entry
+            return cached
+
+    def put(self, key, template, path_params, body, link, size, ttl):
+        """Store a response in the cache.
+
+        Args:
+            key: Cache key
+            template: Endpoint template of the request
+            path_params: Values of the endpoint template placeholders
+            body: Parsed response body
+            link: Link header of the response
+            size: Size of the response body in bytes
+            ttl: Number of seconds the entry stays fresh
+        """
+        if self._index is None or size > self._max_bytes:
+            return
+
+        with self._index.locked() as index:
+            try:
+                fd, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as entry_file:
+                    entry_file.write(ciscomeraki_json.dumps({"body": body, "link": link}))
+                os.replace(temp_path, self._get_entry_path(key))
+            except OSError:
+                return
+
+            index.pop(key, None)
+            index[key] = {"template": template, "params": path_params, "size": size, "expires": time.time() + ttl}
+
+            total_size = sum(entry["size"] for entry in index.values())
+            while total_size > self._max_bytes:
+                evicted_key = next(iter(index))
+                total_size -= index.pop(evicted_key)["size"]
+                self._remove_file(evicted_key)
+
+    def invalidate(self, template, path_params):
+        """Remove the entries of an endpoint template.
+
+        Args:
+            template: Endpoint template whose entries are removed
+            path_params: Placeholder values the entries must match; placeholders
+                missing here match any value
+
+        Returns:
+            int: Number of removed entries
+        """
+        if self._index is None:
+            return 0
+
+        with self._index.locked() as index:
+            keys = [
+                key
+                for key, entry in index.items()
+                if entry["template"] == template and all(entry["params"].get(name) == value for name, value in path_params.items())
+            ]
+            for key in keys:
+                del index[key]
+                self._remove_file(key)
+        return len(keys)
+
+    def _remove_file(self, key):
+        """Remove the file holding the body of an entry."""
+        try:
+            os.remove(self._get_entry_path(key))
+        except OSError:
+            pass
+
+
+class ETagCache:
+    """Class to keep the last response of conditional GET requests across action runs.
+
+    Only the validators of every entry (ETag and Link header) live in the app
+    state, ordered from least to most recently used; each body is kept in its
+    own file inside the cache directory, so the state file stays small.
+    """
+
+    def __init__(self, validators, cache_dir, max_entries=consts.ETAG_CACHE_MAX_ENTRIES):
+        """Initialize the ETag cache.
+
+        Args:
+            validators: Dictionary of the app state holding the validators
+            cache_dir: Directory holding the bodies, or None to disable caching
+            max_entries: Maximum number of cached responses
+        """
+        self._validators = validators
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError:
+                self._cache_dir = None
+
+        # Entries of earlier versions held their body in the state
+        for key in [key for key, entry in validators.items() if "body" in entry]:
+            del validators[key]
+
+    def _get_entry_path(self, key):
+        """Get the path of the file holding the body of an entry."""
+        return os.path.join(self._cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()}.json")
+
+    def get(self, key):
+        """Get an entry and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            dict: Cached ETag, body and Link header, or None
+        """
+        if self._cache_dir is None:
+            return None
+
+        with self._lock:
+            entry = self._validators.pop(key, None)
+            if entry is None:
+                return None
+
+            try:
+                with open(self._get_entry_path(key), "rb") as entry_file:
+                    body = ciscomeraki_json.loads(entry_file.read())
+            except (OSError, ValueError):
+                return None
+
+            self._validators[key] = entry
+        return {"etag": entry["etag"], "body": body, "link": entry.get("link")}
+
+    def put(self, key, etag, body, link):
+        """Store a response, evicting the least recently used entries once the cache is full.
+
+        Args:
+            key: Cache key
+            etag: ETag header of the response
+            body: Parsed response body
+            link: Link header of the response
+        """
+        if self._cache_dir is None:
+            return
+
+        with self._lock:
+            try:
+                fd, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as entry_file:
+                    entry_file.write(ciscomeraki_json.dumps(body))
+                os.replace(temp_path, self._get_entry_path(key))
+            except OSError:
+                return
+
+            self._validators.pop(key, None)
+            self._validators[key] = {"etag": etag, "link": link}
+            while len(self._validators) > self._max_entries:
+                evicted_key = next(iter(self._validators))
+                del self._validators[evicted_key]
+                try:
+                    os.remove(self._get_entry_path(evicted_key))
+                except OSError:
+                    pass
@@ -0,0 +1,243 @@
+#!/usr/bin/python
+# File: ciscomeraki_coalesce.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import copy
+import fcntl
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from requests.structures import CaseInsensitiveDict
+
+import ciscomeraki_consts as consts
+import ciscomeraki_json
+
+
+class _Flight:
+    """Request in flight in the current process, and its result once it lands."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+# Requests in flight in this process, shared by all connector instances
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+class RequestCoalescer:
+    """Class to make identical GET requests sent at the same time only once.
+
+    Within the process, the first caller of a key makes the request and later
+    callers wait for its result. Across processes, such as parallel playbook
+    branches, the caller making the request holds a lock file of the key in the
+    coalescing directory and publishes a successful result in a result file
+    next to it; callers of other processes wait for the lock, then use the
+    result if it was written after they started waiting. A result is never
+    served to a caller that started after it was written, so coalescing only
+    shares requests in flight and never serves stale data.
+    """
+
+    def __init__(self, coalesce_dir, wait_timeout=consts.COALESCE_WAIT_TIMEOUT, result_ttl=consts.COALESCE_RESULT_TTL):
+        """Initialize the coalescer.
+
+        Args:
+            coalesce_dir: Directory holding the lock and result files, or None
+                to coalesce within the process only
+            wait_timeout: Maximum number of seconds to wait for the request of another process
+            result_ttl: Number of seconds after which result files are removed
+        """
+        self._coalesce_dir = coalesce_dir
+        self._wait_timeout = wait_timeout
+        self._result_ttl = result_ttl
+        self._lock = threading.Lock()
+        self.coalesced = 0
+        if coalesce_dir:
+            try:
+                os.makedirs(coalesce_dir, exist_ok=True)
+            except OSError:
+                self._coalesce_dir = None
+
+    def run(self, key, send):
+        """Make a request, or share the result of the identical request in flight.
+
+        Args:
+            key: Coalescing key of the request
+            send: Function making the request, returning a tuple of status
+                (bool), response (dict), response headers (dict) and error
+                message (str) or None
+
+        Returns:
+            tuple: Result of send, and whether it was shared by another request (bool)
+        """
+        with _flights_lock:
+            flight = _flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            self._add_coalesced()
+            ret_val, resp_json, resp_headers, error_message = flight.result
+            # Every caller gets its own copy to modify
+            return (ret_val, copy.deepcopy(resp_json), resp_headers, error_message), True
+
+        try:
+            flight.result, shared = self._run_across_processes(key, send)
+        except Exception as e:
+            flight.result = (False, None, {}, str(e))
+            raise
+        finally:
+            with _flights_lock:
+                del _flights[key]
+            flight.done.set()
+        return flight.result, shared
+
+    def _run_across_processes(self, key, send):
+        """Make a request, or share the result of the identical request of another process.
+
+        Args:
+            key: Coalescing key of the request
+            send: Function making the request
+
+        Returns:
+            tuple: Result of send, and whether it was shared by another request (bool)
+        """
+        started = time.time()
+        with self._locked(key) as locked:
+            if locked:
+                shared = self._read_result(key, started)
+                if shared is not None:
+                    self._add_coalesced()
+                    return shared, True
+
+            result = send()
+            if locked and result[0]:
+                self._write_result(key, result[1], result[2].get("Link"))
+        return result, False
+
+    def _add_coalesced(self):
+        """Count a request answered by another request."""
+        with self._lock:
+            self.coalesced += 1
+
+    def _get_path(self, key, suffix):
+        """Get the path of the lock or result file of a key."""
+        return os.path.join(self._coalesce_dir, f"{key}{suffix}")
+
+    @contextmanager
+    def _locked(self, key):
+        """Hold the lock file of a key while making its request.
+
+        Gives up after the wait timeout, so a stuck process cannot hold up the
+        others for longer.
+
+        Yields:
+            bool: Whether the lock is held
+        """
+        if self._coalesce_dir is None:
+            yield False
+            return
+
+        path = self._get_path(key, ".lock")
+        try:
+            lock_file = open(path, "a")
+        except OSError:
+            yield False
+            return
+
+        with lock_file:
+            deadline = time.monotonic() + self._wait_timeout
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        yield False
+                        return
+                    time.sleep(consts.COALESCE_POLL_INTERVAL)
+
+            try:
+                yield True
+            finally:
+                # Processes already waiting on the lock still get it and find
+                # the result; new ones create a fresh lock file
+                try:
+                    if os.stat(path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                        os.remove(path)
+                except OSError:
+                    pass
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_result(self, key, started):
+        """Read the result another process published for a key.
+
+        Args:
+            key: Coalescing key of the request
+            started: Time the caller started waiting
+
+        Returns:
+            tuple: Status (bool), response (dict), response headers (dict) and
+                error message (None), or None if there is no result newer than started
+        """
+        try:
+            with open(self._get_path(key, ".json"), "rb") as result_file:
+                result = ciscomeraki_json.loads(result_file.read())
+        except (OSError, ValueError):
+            return None
+
+        if result.get("written", 0) < started:
+            return None
+
+        resp_headers = CaseInsensitiveDict({"Link": result["link"]}) if result.get("link") else {}
+        return True, result["body"], resp_headers, None
+
+    def _write_result(self, key, body, link):
+        """Publish the result of a request for the processes waiting on it.
+
+        Args:
+            key: Coalescing key of the request
+            body: Parsed response body
+            link: Link header of the response
+        """
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self._coalesce_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as result_file:
+                result_file.write(ciscomeraki_json.dumps({"written": time.time(), "body": body, "link": link}))
+            os.replace(temp_path, self._get_path(key, ".json"))
+        except OSError:
+            return
+
+        self._remove_expired_results()
+
+    def _remove_expired_results(self):
+        """Remove the result files nobody can be waiting on anymore."""
+        expired = time.time() - self._result_ttl
+        try:
+            with os.scandir(self._coalesce_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.name.endswith((".json", ".tmp")) and entry.stat().st_mtime < expired:
+                            os.remove(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
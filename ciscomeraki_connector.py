@@ -12,13 +12,23 @@
 # the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
 # either express or implied. See the License for the specific language governing permissions
 # and limitations under the License.
+import copy
+import os
+import time
 from importlib import import_module
 
 import phantom.app as phantom
+import requests
 from phantom.base_connector import BaseConnector
 
-from actions import BaseAction
+import ciscomeraki_consts as consts
+from actions import ACTIONS
 from ciscomeraki_auth import CiscoMerakiAuth
+from ciscomeraki_coalesce import RequestCoalescer
+from ciscomeraki_metrics import RequestMetrics, TimedHTTPAdapter
+from ciscomeraki_rate_limiter import TokenBucketRateLimiter
+from ciscomeraki_retry import RetryPolicy
+from ciscomeraki_store import get_state_file, get_state_path
 from ciscomeraki_utils import CiscoMerakiUtils
 
 
@@ -30,7 +40,17 @@ class CiscoMerakiConnector(BaseConnector):
         super().__init__()
         self._utils = None
         self._state = None
+        self._loaded_state = None
         self._auth = None
+        self._session = None
+        self._rate_limiter = None
+        self._time_budget = consts.DEFAULT_ACTION_TIME_BUDGET
+        self._action_time_budgets = {}
+        self._max_workers = consts.DEFAULT_MAX_WORKERS
+        self._request_metrics_file_size = consts.DEFAULT_REQUEST_METRICS_FILE_SIZE
+        self._include_request_metrics = False
+        self._profile_actions = set()
+        self._profile_top_n = consts.DEFAULT_PROFILE_TOP_N
 
     def initialize(self):
         """Initialize the connector with configuration."""
@@ -38,32 +58,236 @@ class CiscoMerakiConnector(BaseConnector):
         if not isinstance(self._state, dict):
             self.debug_print("Resetting state file with empty dictionary")
             self._state = {}
+        self._loaded_state = copy.deepcopy(self._state)
 
         # Initialize auth and utils
         self._auth = CiscoMerakiAuth(self)
         self._utils = CiscoMerakiUtils(self)
 
+        # Requests of all concurrently running actions share the per-organization budget
+        config = self.get_config()
+        ret_val, rate_limit = self._utils._validate_integer(
+            self, config.get("rate_limit_per_second", consts.DEFAULT_RATE_LIMIT_PER_SECOND), "rate_limit_per_second", allow_zero=True
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+        if rate_limit:
+            self._rate_limiter = TokenBucketRateLimiter(get_state_file(self, consts.RATE_LIMIT_STATE_FILE), rate_limit)
+
+        ret_val, self._time_budget = self._utils._validate_integer(
+            self, config.get("action_time_budget", consts.DEFAULT_ACTION_TIME_BUDGET), "action_time_budget"
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+
+        ret_val, self._action_time_budgets = self._parse_action_time_budgets(config.get("action_time_budgets"))
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+
+        ret_val, self._max_workers = self._utils._validate_integer(
+            self, config.get("max_concurrent_requests", consts.DEFAULT_MAX_WORKERS), "max_concurrent_requests"
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+
+        ret_val, self._request_metrics_file_size = self._utils._validate_integer(
+            self, config.get("request_metrics_file_size", consts.DEFAULT_REQUEST_METRICS_FILE_SIZE), "request_metrics_file_size", allow_zero=True
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+        self._include_request_metrics = config.get("include_request_metrics", False)
+
+        ret_val, self._profile_actions = self._parse_profile_actions(config.get("profile_actions"))
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+
+        ret_val, self._profile_top_n = self._utils._validate_integer(
+            self, config.get("profile_top_n", consts.DEFAULT_PROFILE_TOP_N), "profile_top_n"
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+
+        # The connection pool must be large enough for all concurrent workers
+        self._session = self._create_session()
+
         return phantom.APP_SUCCESS
 
     def finalize(self):
         """Perform cleanup operations."""
+        # Only write the state file when the action changed it
+        if self._state is not None and self._state != self._loaded_state:
+            self.save_state(self._state)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         return phantom.APP_SUCCESS
 
+    def _create_session(self):
+        """Create the keep-alive HTTP session shared by all requests of the action run.
+
+        Returns:
+            requests.Session: Session with a pooled HTTP adapter mounted
+        """
+        session = requests.Session()
+        adapter = TimedHTTPAdapter(
+            pool_connections=consts.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=max(consts.HTTP_POOL_MAXSIZE, self._max_workers),
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _parse_action_time_budgets(self, action_time_budgets):
+        """Parse the per-action time budget overrides.
+
+        Args:
+            action_time_budgets: Comma-separated 'action:seconds' pairs
+
+        Returns:
+            tuple: Status (bool), time budget per action identifier (dict)
+        """
+        budgets = {}
+        if not action_time_budgets:
+            return phantom.APP_SUCCESS, budgets
+
+        for pair in action_time_budgets.split(","):
+            if not pair.strip():
+                continue
+            action_id, _, seconds = pair.partition(":")
+            ret_val, seconds = self._utils._validate_integer(self, seconds.strip() or None, "action_time_budgets")
+            if phantom.is_fail(ret_val) or not action_id.strip() or seconds is None:
+                return self.set_status(phantom.APP_ERROR, consts.ERROR_INVALID_TIME_BUDGETS), None
+            budgets[action_id.strip()] = seconds
+
+        return phantom.APP_SUCCESS, budgets
+
+    def _parse_profile_actions(self, profile_actions):
+        """Parse the identifiers of the actions to profile.
+
+        Args:
+            profile_actions: Comma-separated action identifiers, or 'all'
+
+        Returns:
+            tuple: Status (bool), action identifiers (set)
+        """
+        action_ids = {action_id.strip() for action_id in (profile_actions or "").split(",") if action_id.strip()}
+        if consts.PROFILE_ALL_ACTIONS in action_ids:
+            return phantom.APP_SUCCESS, set(ACTIONS)
+
+        unknown = sorted(action_ids - set(ACTIONS))
+        if unknown:
+            return self.set_status(phantom.APP_ERROR, consts.ERROR_INVALID_PROFILE_ACTIONS.format(actions=", ".join(unknown))), None
+
+        return phantom.APP_SUCCESS, action_ids
+
     def handle_action(self, param):
         """Main action handler."""
         # Get the action identifier only once
         action_id = self.get_action_identifier()
         self.debug_print("action_id", action_id)
 
-        action_name = f"actions.ciscomeraki_{action_id}"
-        import_module(action_name, package="actions")
+        if action_id in self._profile_actions:
+            return self._profile_action(action_id, param)
+        return self._run_action(action_id, param)
+
+    def _profile_action(self, action_id, param):
+        """Run an action under the profiler and attach the profile to its result.
+
+        The top functions and allocation sites are added to the action summary.
+        When the run belongs to a container, the full report is also added to
+        the vault.
+
+        Args:
+            action_id: Action identifier
+            param: Action parameters
+
+        Returns:
+            bool: Status of the action
+        """
+        from ciscomeraki_profiler import ActionProfiler
+
+        profiler = ActionProfiler(self._profile_top_n)
+        ret_val = profiler.run(self._run_action, action_id, param)
+
+        action_results = self.get_action_results()
+        if not action_results:
+            return ret_val
+
+        summary = {"profile": profiler.get_summary()}
+        try:
+            vault_id = self._add_profile_to_vault(action_id, profiler.get_report())
+        except Exception as e:
+            self.debug_print(f"Could not add the profile to the vault: {self._utils._get_error_message_from_exception(e)}")
+            vault_id = None
+        if vault_id:
+            summary["profile_vault_id"] = vault_id
+        action_results[-1].update_summary(summary)
+        return ret_val
+
+    def _add_profile_to_vault(self, action_id, report):
+        """Add a profile report to the vault of the container of the action run.
+
+        Args:
+            action_id: Action identifier
+            report: Profile report
+
+        Returns:
+            str: Vault ID, or None if the run has no container
+        """
+        container_id = self.get_container_id()
+        if not container_id:
+            return None
+
+        import phantom.rules as phantom_rules
+        from phantom.vault import Vault
+
+        file_name = consts.PROFILE_REPORT_FILE_NAME.format(action_id=action_id, timestamp=int(time.time()))
+        file_path = os.path.join(Vault.get_vault_tmp_dir(), file_name)
+        with open(file_path, "w", encoding="utf-8") as report_file:
+            report_file.write(report)
+
+        success, message, vault_id = phantom_rules.vault_add(container=container_id, file_location=file_path, file_name=file_name)
+        if not success:
+            self.debug_print(f"Could not add the profile to the vault: {message}")
+            return None
+        return vault_id
+
+    def _run_action(self, action_id, param):
+        """Run an action.
+
+        Args:
+            action_id: Action identifier
+            param: Action parameters
+
+        Returns:
+            bool: Status of the action
+        """
+        # Only the module of the running action is imported
+        class_name = ACTIONS.get(action_id)
+        if class_name is None:
+            self.debug_print("Action not implemented")
+            return phantom.APP_ERROR
 
-        base_action_sub_classes = BaseAction.__subclasses__()
-        self.debug_print(f"Finding action module: {action_name}")
-        for action_class in base_action_sub_classes:
-            if action_class.__module__ == action_name:
-                action = action_class(self, param)
-                return action.execute()
+        action_class = getattr(import_module(f"actions.ciscomeraki_{action_id}"), class_name)
 
-        self.debug_print("Action not implemented")
-        return phantom.APP_ERROR
+        # Retries of this run must fit in the time budget of the action
+        self._utils._retry_policy = RetryPolicy(self._action_time_budgets.get(action_id, self._time_budget))
+        self._utils._bypass_cache = param.get("bypass_cache", False)
+        metrics_path = get_state_path(self, consts.REQUEST_METRICS_FILE) if self._request_metrics_file_size else None
+        self._utils._request_metrics = RequestMetrics(keep_records=metrics_path is not None)
+        self._utils._request_coalescer = RequestCoalescer(get_state_path(self, consts.COALESCE_DIR))
+        action = action_class(self, param)
+        ret_val = action.execute()
+        action._action_result.update_summary(self._utils._retry_policy.get_summary())
+        # Opt-in, so the summary of every action keeps the datapaths declared in the manifest
+        if self._include_request_metrics:
+            action._action_result.update_summary(
+                {"coalesced_requests": self._utils._request_coalescer.coalesced, "request_metrics": self._utils._request_metrics.get_summary()}
+            )
+        if metrics_path:
+            try:
+                self._utils._request_metrics.append_to_file(metrics_path, self._request_metrics_file_size * 1024, action=action_id)
+            except OSError as e:
+                self.debug_print(f"Could not write the request metrics file: {e}")
+        return ret_val
@@ -23,6 +23,7 @@ TEST_CONNECTIVITY_START_MSG = "Connecting to {0}"
 SUCCESS_TEST_CONNECTIVITY = "Test Connectivity Passed"
 ERROR_TEST_CONNECTIVITY = "Test Connectivity Failed"
 ACTION_SUCCESS_RESPONSE = "Action {action} has been executed successfully"
+RULES_UNCHANGED_RESPONSE = "The network already has these firewall rules, no update was made"
 
 # Error Messages
 ERROR_INVALID_INT_PARAM = "Please provide a valid integer value in the '{key}' parameter"
@@ -33,6 +34,17 @@ ERROR_ZERO_INT_PARAM = "Please provide a non-zero positive integer value in the
 ERROR_NEG_INT_PARAM = "Please provide a positive integer value in the '{key}' parameter"
 ERROR_REQUIRED_PARAM = "Required parameter '{key}' not specified"
 ERROR_INVALID_PARAM = "Please provide a valid value for parameter '{key}'"
+ERROR_ALL_ORGANIZATIONS_FAILED = "Request failed for all organizations. {errors}"
+ERROR_ALL_DEVICES_FAILED = "Request failed for all devices. {errors}"
+ERROR_ORGANIZATION_NOT_FOUND = "Could not determine the organization of network '{network_id}'"
+ERROR_ALL_OPERATIONS_FAILED = "All {total} operations failed. {errors}"
+ERROR_NETWORK_OR_RULES_REQUIRED = "Please provide either the 'network_id' or the 'rules' parameter"
+ERROR_FLOWS_REQUIRED = "Please provide either the 'flows' parameter or both the 'src_ip' and 'dest_ip' parameters"
+ERROR_INVALID_FLOW_PORT = "Please provide an integer between 1 and 65535 as the '{key}' of flow {number}, got '{port}'"
+ERROR_PREFLIGHT_CHECK_FAILED = "Pre-flight check failed, {count} rules can never match: {details}"
+ERROR_STREAM_PARSE = "Error while reading the streamed response. {error}"
+ERROR_INVALID_TIME_BUDGETS = "Please provide the 'action_time_budgets' as comma-separated 'action:seconds' pairs"
+ERROR_INVALID_PROFILE_ACTIONS = "Please provide valid action identifiers or 'all' in the 'profile_actions' parameter. Unknown actions: {actions}"
 
 # API Endpoints
 # Organization endpoints
@@ -62,6 +74,11 @@ UPDATE_L7_FIREWALL_RULES = "/networks/{network_id}/appliance/firewall/l7Firewall
 
 # Request Parameters
 REQUEST_DEFAULT_TIMEOUT = 30
+HTTP_METHODS = ["get", "post", "put", "delete", "patch"]
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 16
+DEFAULT_MAX_WORKERS = 8
+ALL_ORGANIZATIONS = "all"
 EMPTY_RESPONSE_STATUS_CODES = [200, 204]
 DEFAULT_PAGE_SIZE = 100
 MAX_PAGE_SIZE = 1000
@@ -79,6 +96,9 @@ FIREWALL_RULE = "firewall_rule"
 # Firewall Rule Properties
 L3_RULE_REQUIRED_FIELDS = ["policy", "protocol", "srcPort", "srcCidr", "destPort", "destCidr", "comment"]
 L7_RULE_REQUIRED_FIELDS = ["policy", "type", "value"]
+L3_DEFAULT_RULE_COMMENT = "Default rule"
+PREFLIGHT_MAX_REPORTED_FINDINGS = 10
+FLOW_FIELDS = ["protocol", "src_ip", "src_port", "dest_ip", "dest_port"]
 
 # Parameter Validation
 MIN_PAGE_SIZE = 3
@@ -88,8 +108,131 @@ VALID_PROTOCOLS = ["tcp", "udp", "icmp", "any"]
 VALID_TYPES = ["application", "applicationCategory", "host", "port", "ipRange"]
 
 # Rate limiting constants
-MAX_RETRIES = 3
+MAX_RETRIES = 5
 INITIAL_RETRY_DELAY = 1  # seconds
+MAX_RETRY_DELAY = 30  # seconds
+RETRY_MIN_REQUEST_TIME = 5  # seconds left for the retried request before the deadline
+RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+RETRYABLE_NON_IDEMPOTENT_STATUS_CODES = [429, 503]
+IDEMPOTENT_HTTP_METHODS = ["get", "put", "delete"]
+DEFAULT_ACTION_TIME_BUDGET = 300  # seconds
+DEFAULT_RATE_LIMIT_PER_SECOND = 10  # Meraki allows 10 requests per second per organization
+RATE_LIMIT_STATE_FILE = "ciscomeraki_rate_limits.json"
+RATE_LIMIT_BUCKET_EXPIRY = 60  # seconds
+GLOBAL_RATE_LIMIT_KEY = "global"
+SCOPED_ENDPOINT_REGEX = r"^/(organizations|networks|devices)/([^/?]+)"
+NETWORK_DETAILS = "/networks/{network_id}"
+DEVICE_DETAILS = "/devices/{serial}"
+MAX_ORGANIZATION_MAPPINGS = 5000  # networks and devices whose organization is kept in the state, each
+ORGANIZATION_LOOKUP_CHUNK_SIZE = 100  # serials looked up per organization devices request
+
+# State keys
+STATE_NETWORK_ORGANIZATIONS = "network_organizations"
+STATE_DEVICE_ORGANIZATIONS = "device_organizations"
+STATE_ETAG_CACHE = "etag_cache"
+
+# Conditional GET (ETag) cache
+ETAG_CACHE_DIR = "ciscomeraki_etag_cache"
+ETAG_CACHE_MAX_ENTRIES = 32
+ETAG_CACHE_MAX_BODY_SIZE = 256 * 1024  # bytes
+ETAG_CACHE_ENDPOINTS = [
+    LIST_ORGANIZATIONS,
+    ORG_LICENSE_STATE,
+    LIST_ADAPTIVE_POLICIES,
+    LIST_ADAPTIVE_POLICY_ACLS,
+    LIST_ADAPTIVE_POLICY_GROUPS,
+    LIST_ADAPTIVE_POLICY_SETTINGS,
+    LIST_L3_FIREWALL_RULES,
+    LIST_L7_FIREWALL_RULES,
+]
+
+# Response cache
+RESPONSE_CACHE_DIR = "ciscomeraki_response_cache"
+RESPONSE_CACHE_INDEX = "index.json"
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Number of seconds a cached response stays fresh, per endpoint
+RESPONSE_CACHE_TTLS = {
+    LIST_ORGANIZATIONS: 300,
+    ORG_LICENSE_STATE: 300,
+    ORG_INVENTORY_DEVICES: 60,
+    SEARCH_DEVICES: 60,
+    LIST_DEVICES: 60,
+    LIST_ADAPTIVE_POLICIES: 300,
+    LIST_ADAPTIVE_POLICY_ACLS: 300,
+    LIST_ADAPTIVE_POLICY_GROUPS: 300,
+    LIST_ADAPTIVE_POLICY_SETTINGS: 300,
+    LIST_L3_FIREWALL_RULES: 120,
+    LIST_L7_FIREWALL_RULES: 120,
+}
+# Cached endpoints invalidated by a successful write, per written endpoint
+RESPONSE_CACHE_INVALIDATIONS = {
+    UPDATE_DEVICE: [LIST_DEVICES, SEARCH_DEVICES, ORG_INVENTORY_DEVICES],
+    CLAIM_DEVICES: [ORG_INVENTORY_DEVICES, SEARCH_DEVICES, ORG_LICENSE_STATE],
+    UPDATE_L3_FIREWALL_RULES: [LIST_L3_FIREWALL_RULES],
+    UPDATE_L7_FIREWALL_RULES: [LIST_L7_FIREWALL_RULES],
+}
+
+# Coalescing of identical concurrent GET requests
+COALESCE_DIR = "ciscomeraki_inflight"
+COALESCE_WAIT_TIMEOUT = REQUEST_DEFAULT_TIMEOUT  # seconds to wait for the request of another process
+COALESCE_RESULT_TTL = 60  # seconds a published result is kept for waiting processes
+COALESCE_POLL_INTERVAL = 0.05  # seconds
+
+# Streamed responses
+STREAM_CHUNK_SIZE = 65536  # Bytes read from the connection at a time
+
+# Output field projection
+ALL_FIELDS = "*"  # Value of the 'fields' parameter keeping whole records
+
+# Device claims
+DEFAULT_CLAIM_CHUNK_SIZE = 50
+VALIDATION_ERROR_REGEX = r"^Status Code: (400|422)\b"  # Rejections caused by some of the serials
+ALREADY_CLAIMED_REGEX = r"already (been )?claimed|already in"
+
+# Action batches
+ACTION_BATCHES = "/organizations/{organization_id}/actionBatches"
+ACTION_BATCH_DETAILS = "/organizations/{organization_id}/actionBatches/{action_batch_id}"
+ACTION_BATCH_DEVICE_RESOURCE = "/devices/{serial}"
+ACTION_BATCH_NETWORK_DEVICES_RESOURCE = "/networks/{network_id}/devices"
+ACTION_BATCH_MAX_SYNC_ACTIONS = 20  # Meraki limit for synchronous batches
+ACTION_BATCH_MAX_ACTIONS = 100  # Meraki limit for asynchronous batches
+ACTION_BATCH_MAX_RUNNING = 5  # Meraki limit of unfinished asynchronous batches per organization
+ACTION_BATCH_POLL_INTERVAL = 2  # seconds
+ACTION_BATCH_MAX_POLL_INTERVAL = 15  # seconds
+
+# Device inventory snapshots
+INVENTORY_DIR = "ciscomeraki_inventory"
+DEFAULT_INVENTORY_MAX_STALENESS = 3600  # seconds
+
+# Request metrics
+REQUEST_METRICS_FILE = "ciscomeraki_request_metrics.jsonl"
+DEFAULT_REQUEST_METRICS_FILE_SIZE = 0  # KB, 0 disables the metrics file
+# Endpoint templates the request metrics are grouped by
+ENDPOINT_TEMPLATES = [
+    LIST_ORGANIZATIONS,
+    ORG_LICENSE_STATE,
+    ORG_INVENTORY_DEVICES,
+    CLAIM_DEVICES,
+    SEARCH_DEVICES,
+    LIST_DEVICES,
+    UPDATE_DEVICE,
+    LIST_DEVICE_CLIENTS,
+    LIST_ADAPTIVE_POLICIES,
+    LIST_ADAPTIVE_POLICY_ACLS,
+    LIST_ADAPTIVE_POLICY_GROUPS,
+    LIST_ADAPTIVE_POLICY_SETTINGS,
+    LIST_L3_FIREWALL_RULES,
+    LIST_L7_FIREWALL_RULES,
+    NETWORK_DETAILS,
+    DEVICE_DETAILS,
+    ACTION_BATCHES,
+    ACTION_BATCH_DETAILS,
+]
+
+# Profiling
+PROFILE_ALL_ACTIONS = "all"
+DEFAULT_PROFILE_TOP_N = 20
+PROFILE_REPORT_FILE_NAME = "ciscomeraki_profile_{action_id}_{timestamp}.txt"
 
 # API URLs and endpoints
 MERAKI_API_BASE_URL = "https://api.meraki.com/api/v1/{}"
@@ -0,0 +1,238 @@
+#!/usr/bin/python
+# File: ciscomeraki_inventory.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import os
+import tempfile
+import time
+
+import ciscomeraki_json
+
+
+# Normalization applied to the values of every indexed field, both when
+# indexing and when searching
+INDEXED_FIELDS = {
+    "serial": str.upper,
+    "mac": str.lower,
+    "model": str.upper,
+    "networkId": str,
+    "tags": str,
+}
+
+# Fields the API filters match as substrings; the others match exact values only
+SUBSTRING_FIELDS = ("serial", "mac", "model")
+
+# Version of the index layout, persisted snapshots with another version are reindexed
+INDEX_VERSION = 2
+
+
+class InventorySnapshot:
+    """Class to answer device searches from a local copy of an organization's devices.
+
+    Every indexed field maps its normalized values to the positions of the devices
+    holding them, so searches never scan the device list. Searches follow the
+    filters of the organization devices endpoint: MAC addresses, serials and
+    models match every device containing the value, by a scan of the index keys,
+    while network IDs and tags match exact values only.
+    """
+
+    def __init__(self, devices, updated=None, indexes=None):
+        """Initialize the snapshot.
+
+        Args:
+            devices: Devices of the organization
+            updated: Time the devices were fetched (Default: now)
+            indexes: Prebuilt indexes (Default: built from the devices)
+        """
+        self.devices = devices
+        self.updated = updated or time.time()
+        self.indexes = indexes or self._build_indexes(devices)
+        self._key_lengths = {}
+
+    @staticmethod
+    def _build_indexes(devices):
+        """Build the hash indexes of the indexed fields.
+
+        Args:
+            devices: Devices of the organization
+
+        Returns:
+            dict: Device positions per normalized value, per field
+        """
+        indexes = {field: {} for field in INDEXED_FIELDS}
+        for position, device in enumerate(devices):
+            for field, normalize in INDEXED_FIELDS.items():
+                values = device.get(field)
+                if not values:
+                    continue
+                for value in values if isinstance(values, list) else [values]:
+                    indexes[field].setdefault(normalize(value), []).append(position)
+        return indexes
+
+    @property
+    def age(self):
+        """Number of seconds since the devices were fetched."""
+        return max(time.time() - self.updated, 0)
+
+    def _lookup(self, field, value):
+        """Get the positions of the devices matching a value of a field.
+
+        Args:
+            field: Indexed field
+            value: Searched value
+
+        Returns:
+            set: Device positions
+        """
+        index = self.indexes[field]
+        value = INDEXED_FIELDS[field](value)
+        if field not in SUBSTRING_FIELDS:
+            return set(index.get(value, []))
+
+        # No key is longer than the value, so it can only match itself
+        if field not in self._key_lengths:
+            self._key_lengths[field] = max(map(len, index), default=0)
+        if len(value) >= self._key_lengths[field]:
+            return set(index.get(value, []))
+
+        positions = set()
+        for key, key_positions in index.items():
+            if value in key:
+                positions.update(key_positions)
+        return positions
+
+    def search(self, mac=None, serial=None, model=None, network_id=None, tags=None):
+        """Search for devices matching all the given criteria.
+
+        Args:
+            mac: MAC address or part of it
+            serial: Serial number or part of it
+            model: Device model or part of it
+            network_id: Network ID
+            tags: Tags, case-sensitive, a device matches if it has any of them
+
+        Returns:
+            list: Matching devices in inventory order
+        """
+        positions = None
+        for field, value in (("mac", mac), ("serial", serial), ("model", model), ("networkId", network_id)):
+            if value:
+                matches = self._lookup(field, value)
+                positions = matches if positions is None else positions & matches
+
+        if tags:
+            matches = set()
+            for tag in tags:
+                matches.update(self._lookup("tags", tag))
+            positions = matches if positions is None else positions & matches
+
+        if positions is None:
+            return list(self.devices)
+
+        return [self.devices[position] for position in sorted(positions)]
+
+    def to_dict(self):
+        """Serialize the snapshot.
+
+        Returns:
+            dict: Devices, fetch time and indexes
+        """
+        return {"updated": self.updated, "devices": self.devices, "indexes": self.indexes, "index_version": INDEX_VERSION}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserialize a snapshot.
+
+        Args:
+            data: Serialized snapshot
+
+        Returns:
+            InventorySnapshot: The snapshot
+        """
+        indexes = data.get("indexes") if data.get("index_version") == INDEX_VERSION else None
+        return cls(data["devices"], data["updated"], indexes)
+
+
+class InventoryStore:
+    """Class to persist inventory snapshots in the app state directory."""
+
+    def __init__(self, directory):
+        """Initialize the store.
+
+        Args:
+            directory: Directory holding the snapshots, or None to keep them in memory only
+        """
+        self._directory = directory
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError:
+                self._directory = None
+
+    def load(self, key):
+        """Load a snapshot.
+
+        Args:
+            key: Snapshot key
+
+        Returns:
+            InventorySnapshot: The snapshot or None if there is none
+        """
+        if not self._directory:
+            return None
+
+        try:
+            with open(os.path.join(self._directory, f"{key}.json"), "rb") as snapshot_file:
+                return InventorySnapshot.from_dict(ciscomeraki_json.loads(snapshot_file.read()))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, key, snapshot):
+        """Save a snapshot, replacing the previous one atomically.
+
+        Args:
+            key: Snapshot key
+            snapshot: InventorySnapshot to save
+        """
+        if not self._directory:
+            return
+
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as snapshot_file:
+                snapshot_file.write(ciscomeraki_json.dumps(snapshot.to_dict()))
+            os.replace(temp_path, os.path.join(self._directory, f"{key}.json"))
+        except OSError:
+            pass
+
+    def remove(self, key=None):
+        """Remove a snapshot.
+
+        Args:
+            key: Snapshot key, or None to remove every snapshot
+        """
+        if not self._directory:
+            return
+
+        try:
+            names = [f"{key}.json"] if key else os.listdir(self._directory)
+        except OSError:
+            return
+
+        for name in names:
+            try:
+                os.remove(os.path.join(self._directory, name))
+            except OSError:
+                pass
@@ -0,0 +1,71 @@
+#!/usr/bin/python
+# File: ciscomeraki_json.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import json
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# JSON codec of the app: orjson when it is installed, the standard library
+# otherwise. Documents are decoded straight from bytes, so response bodies are
+# never decoded to a str first. Documents orjson rejects, such as values with
+# integers wider than 64 bits or non-string keys, go through the standard
+# library instead.
+BACKEND = "orjson" if orjson is not None else "json"
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """Decode a JSON document.
+
+    Args:
+        data: Document as bytes or str
+
+    Returns:
+        Decoded value
+
+    Raises:
+        JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let the standard library accept what orjson does not and raise its own error
+            pass
+    return json.loads(data)
+
+
+def dumps(value):
+    """Encode a value as a compact JSON document.
+
+    Args:
+        value: Value to encode
+
+    Returns:
+        bytes: UTF-8 encoded document
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,331 @@
+#!/usr/bin/python
+# File: ciscomeraki_metrics.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import fcntl
+import json
+import os
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+
+# Connection timings of the request attempt running on the current thread
+_attempt_timings = threading.local()
+
+
+class _TimedConnectionMixin:
+    """Mixin timing the DNS resolution and the connection setup of new connections.
+
+    The timings are added to the attempt registered on the current thread by
+    RequestRecord.start_attempt; connections opened outside of an attempt are
+    not timed. Reused keep-alive connections add nothing.
+    """
+
+    def connect(self):
+        """Connect to the host, including the TLS handshake for HTTPS."""
+        timings = getattr(_attempt_timings, "current", None)
+        if timings is None:
+            return super().connect()
+
+        dns_before = timings["dns"]
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            timings["connect"] += time.perf_counter() - start - (timings["dns"] - dns_before)
+
+    def _new_conn(self):
+        """Resolve the host, then open a socket to the first reachable address."""
+        timings = getattr(_attempt_timings, "current", None)
+        if timings is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)))
+        except OSError:
+            # Let urllib3 resolve again and raise its own error
+            addresses = [host]
+        timings["dns"] += time.perf_counter() - start
+
+        # Only the socket connects to the resolved address; the TLS server name
+        # and certificate checks happen after this method and use the host
+        try:
+            for index, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError):
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    """HTTP connection recording its DNS and connect times."""
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    """HTTPS connection recording its DNS and connect times."""
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP connection pool of timed connections."""
+
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS connection pool of timed connections."""
+
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTP adapter opening timed connections."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager and make it use the timed connection pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+class RequestRecord:
+    """Class to record one API request, over all of its retries."""
+
+    def __init__(self, method, endpoint):
+        """Initialize the record.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint template of the request
+        """
+        self.method = method.upper()
+        self.endpoint = endpoint
+        self.status = None
+        self.attempts = 0
+        self.retries = 0
+        self.retry_after_wait = 0.0
+        self.dns = 0.0
+        self.connect = 0.0
+        self.ttfb = 0.0
+        self.bytes = 0
+        self._start = time.perf_counter()
+        self.total = 0.0
+        self._timings = None
+
+    def start_attempt(self):
+        """Start timing an attempt made on the current thread."""
+        self.attempts += 1
+        self._timings = {"dns": 0.0, "connect": 0.0}
+        _attempt_timings.current = self._timings
+
+    def end_attempt(self, response=None, stream=False):
+        """Stop timing the current attempt.
+
+        Args:
+            response: Response received, or None if the request failed
+            stream: Whether the response body is streamed and not read yet
+        """
+        _attempt_timings.current = None
+        self.dns += self._timings["dns"]
+        self.connect += self._timings["connect"]
+        if response is None:
+            self.status = None
+            return
+
+        self.status = response.status_code
+        # The elapsed time runs from sending the request to parsing the headers, including a new connection
+        self.ttfb += max(response.elapsed.total_seconds() - self._timings["dns"] - self._timings["connect"], 0)
+        if stream:
+            self.bytes = int(response.headers.get("Content-Length") or 0)
+        else:
+            self.bytes = len(response.content)
+
+    def add_retry(self, delay, retry_after):
+        """Record a retry.
+
+        Args:
+            delay: Number of seconds waited before the retry
+            retry_after: Delay requested by the server in the Retry-After header, or None
+        """
+        self.retries += 1
+        if retry_after is not None:
+            self.retry_after_wait += delay
+
+    def finish(self):
+        """Stop the clock of the request."""
+        _attempt_timings.current = None
+        self.total = time.perf_counter() - self._start
+
+    @property
+    def failed(self):
+        """Whether the request ended without a successful response."""
+        return self.status is None or self.status >= 400
+
+    def to_dict(self):
+        """Get the record as a dictionary.
+
+        Returns:
+            dict: Record, with times in milliseconds
+        """
+        return {
+            "method": self.method,
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "dns_ms": round(self.dns * 1000, 2),
+            "connect_ms": round(self.connect * 1000, 2),
+            "ttfb_ms": round(self.ttfb * 1000, 2),
+            "total_ms": round(self.total * 1000, 2),
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "retry_after_wait_seconds": round(self.retry_after_wait, 2),
+        }
+
+
+class RequestMetrics:
+    """Class to collect the API requests of an action run.
+
+    Requests are aggregated per method and endpoint template as they finish.
+    The individual records are only kept when they are to be written to the
+    metrics file.
+    """
+
+    def __init__(self, keep_records=False):
+        """Initialize the collector.
+
+        Args:
+            keep_records: Whether to keep every request record for append_to_file
+        """
+        self._keep_records = keep_records
+        self._lock = threading.Lock()
+        self._stats = {}
+        self.records = []
+
+    def start_request(self, method, endpoint):
+        """Start recording a request.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint template of the request
+
+        Returns:
+            RequestRecord: Record to fill in while making the request
+        """
+        return RequestRecord(method, endpoint)
+
+    def finish_request(self, record):
+        """Add a request to the statistics, unless it never reached the server.
+
+        Args:
+            record: Record of the request
+        """
+        record.finish()
+        if not record.attempts:
+            return
+
+        with self._lock:
+            stats = self._stats.setdefault(
+                f"{record.method} {record.endpoint}",
+                {
+                    "requests": 0,
+                    "errors": 0,
+                    "bytes": 0,
+                    "retries": 0,
+                    "retry_after_wait": 0.0,
+                    "dns": 0.0,
+                    "connect": 0.0,
+                    "ttfb": 0.0,
+                    "total": 0.0,
+                    "max_total": 0.0,
+                },
+            )
+            stats["requests"] += 1
+            stats["errors"] += record.failed
+            stats["bytes"] += record.bytes
+            stats["retries"] += record.retries
+            stats["retry_after_wait"] += record.retry_after_wait
+            stats["dns"] += record.dns
+            stats["connect"] += record.connect
+            stats["ttfb"] += record.ttfb
+            stats["total"] += record.total
+            stats["max_total"] = max(stats["max_total"], record.total)
+            if self._keep_records:
+                self.records.append(record)
+
+    def get_summary(self):
+        """Get the request statistics of the action run.
+
+        Returns:
+            dict: Statistics per 'METHOD endpoint template', with average and maximum times in milliseconds
+        """
+        with self._lock:
+            return {
+                key: {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "bytes": stats["bytes"],
+                    "retries": stats["retries"],
+                    "retry_after_wait_seconds": round(stats["retry_after_wait"], 2),
+                    "avg_dns_ms": round(stats["dns"] * 1000 / stats["requests"], 2),
+                    "avg_connect_ms": round(stats["connect"] * 1000 / stats["requests"], 2),
+                    "avg_ttfb_ms": round(stats["ttfb"] * 1000 / stats["requests"], 2),
+                    "avg_total_ms": round(stats["total"] * 1000 / stats["requests"], 2),
+                    "max_total_ms": round(stats["max_total"] * 1000, 2),
+                }
+                for key, stats in self._stats.items()
+            }
+
+    def append_to_file(self, path, max_bytes, **fields):
+        """Append the request records as JSON lines to a rolling metrics file.
+
+        When the file would grow past max_bytes, it is renamed with a '.1'
+        suffix, replacing the previous one, and a new file is started. Appends
+        of concurrently running actions are serialized with a lock file.
+
+        Args:
+            path: Path of the metrics file
+            max_bytes: Maximum size of the file in bytes
+            **fields: Fields added to every record, such as the action identifier
+        """
+        with self._lock:
+            records = self.records
+            self.records = []
+        if not records:
+            return
+
+        timestamp = round(time.time(), 3)
+        lines = "".join(json.dumps({"timestamp": timestamp, **fields, **record.to_dict()}) + "\n" for record in records).encode("utf-8")
+        with open(f"{path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    size = 0
+                if size and size + len(lines) > max_bytes:
+                    os.replace(path, f"{path}.1")
+                with open(path, "ab") as metrics_file:
+                    metrics_file.write(lines)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
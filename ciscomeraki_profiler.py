@@ -0,0 +1,140 @@
+#!/usr/bin/python
+# File: ciscomeraki_profiler.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+
+class ActionProfiler:
+    """Class to profile the CPU time and memory allocations of an action run.
+
+    A single cProfile profiler is enabled on the thread running the action.
+    Before Python 3.12 it only sees that thread; from 3.12 on, profiling is
+    global to the interpreter, so it also sees the worker threads of
+    concurrent requests. No profiler is ever started on another thread, as
+    only one can be active at a time from 3.12 on. Memory allocations of all
+    threads are traced with tracemalloc.
+    """
+
+    def __init__(self, top_n):
+        """Initialize the profiler.
+
+        Args:
+            top_n: Number of functions and allocation sites to report
+        """
+        self._top_n = top_n
+        self._stats = None
+        self._allocations = []
+        self._peak_memory = 0
+        self._elapsed = 0.0
+
+    def run(self, function, *args, **kwargs):
+        """Call a function while profiling it.
+
+        Args:
+            function: Function to call
+            *args: Positional arguments of the function
+            **kwargs: Keyword arguments of the function
+
+        Returns:
+            Return value of the function
+        """
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            return profiler.runcall(function, *args, **kwargs)
+        finally:
+            self._elapsed = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            self._peak_memory = tracemalloc.get_traced_memory()[1]
+            if not was_tracing:
+                tracemalloc.stop()
+            self._collect(profiler, snapshot)
+
+    def _collect(self, profiler, snapshot):
+        """Keep the profile and the top allocation sites of the run.
+
+        Args:
+            profiler: cProfile profiler of the run
+            snapshot: tracemalloc snapshot taken at the end of the run
+        """
+        self._stats = pstats.Stats(profiler)
+        snapshot = snapshot.filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, "<frozen *>")]
+        )
+        self._allocations = snapshot.statistics("lineno")[: self._top_n]
+
+    @staticmethod
+    def _format_function(function):
+        """Format a pstats function key as 'file:line(name)'."""
+        file_name, line, name = function
+        if file_name == "~":
+            # Built-in functions have no file
+            return name
+        return f"{os.path.basename(file_name)}:{line}({name})"
+
+    def get_summary(self):
+        """Get the top functions and allocation sites of the run.
+
+        Returns:
+            dict: Profile summary, with times in seconds and sizes in bytes
+        """
+        functions = sorted(self._stats.stats.items(), key=lambda item: item[1][3], reverse=True)[: self._top_n]
+        return {
+            "profiled_seconds": round(self._elapsed, 3),
+            "peak_traced_memory_bytes": self._peak_memory,
+            "top_functions": [
+                {
+                    "function": self._format_function(function),
+                    "calls": calls,
+                    "own_seconds": round(own_time, 4),
+                    "cumulative_seconds": round(cumulative_time, 4),
+                }
+                for function, (_, calls, own_time, cumulative_time, _) in functions
+            ],
+            "top_allocations": [
+                {
+                    "location": f"{os.path.basename(statistic.traceback[0].filename)}:{statistic.traceback[0].lineno}",
+                    "size_bytes": statistic.size,
+                    "count": statistic.count,
+                }
+                for statistic in self._allocations
+            ],
+        }
+
+    def get_report(self):
+        """Get the full profile of the run as text.
+
+        Returns:
+            str: Functions sorted by cumulative and by own time, then the top allocation sites
+        """
+        output = io.StringIO()
+        output.write(f"Profiled {self._elapsed:.3f} seconds, peak traced memory {self._peak_memory} bytes\n\n")
+        self._stats.stream = output
+        self._stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats()
+        self._stats.sort_stats(pstats.SortKey.TIME).print_stats(self._top_n)
+        output.write("Top allocation sites\n")
+        for statistic in self._allocations:
+            output.write(f"{statistic}\n")
+        return output.getvalue()
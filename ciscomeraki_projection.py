@@ -0,0 +1,104 @@
+#!/usr/bin/python
+# File: ciscomeraki_projection.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+DATA_PATH_PREFIX = "action_result.data.*."
+
+
+class FieldProjection:
+    """Class to reduce API records to a set of fields before they are added to the action result.
+
+    Fields are dotted paths such as ``cloud.region.name``. They are compiled once
+    into a tree of keys, so projecting a record only visits the kept keys. A
+    path ending on an object keeps the whole object, and a path going through a
+    list is applied to every object of the list.
+    """
+
+    def __init__(self, fields=None):
+        """Initialize the projection.
+
+        Args:
+            fields: Dotted paths of the fields to keep, or None to keep whole records
+        """
+        self.fields = fields
+        self._tree = None if fields is None else {}
+        for field in fields or []:
+            node = self._tree
+            keys = field.split(".")
+            for key in keys[:-1]:
+                child = node.setdefault(key, {})
+                if child is None:
+                    # An enclosing object is already kept whole
+                    break
+                node = child
+            else:
+                node[keys[-1]] = None
+
+    def project(self, record):
+        """Project a record.
+
+        Args:
+            record: API record
+
+        Returns:
+            dict: New record holding only the projected fields, or the record
+                itself when whole records are kept
+        """
+        return self._project(record, self._tree)
+
+    def _project(self, value, tree):
+        """Project a value on a subtree of keys.
+
+        Args:
+            value: Value to project
+            tree: Kept keys, each mapped to its own subtree or None to keep the whole value
+
+        Returns:
+            Projected value
+        """
+        if tree is None:
+            return value
+        if isinstance(value, list):
+            return [self._project(item, tree) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        return {key: self._project(value[key], subtree) for key, subtree in tree.items() if key in value}
+
+
+def get_default_fields(app_json, action_id):
+    """Get the fields an action declares in its output data paths.
+
+    Args:
+        app_json: App manifest
+        action_id: Action identifier
+
+    Returns:
+        list: Dotted paths of the declared fields, empty if the action declares none
+    """
+    for action in app_json.get("actions", []):
+        if action.get("identifier") != action_id:
+            continue
+
+        fields = []
+        for output in action.get("output", []):
+            data_path = output.get("data_path", "")
+            if data_path.startswith(DATA_PATH_PREFIX):
+                field = ".".join(key for key in data_path[len(DATA_PATH_PREFIX) :].split(".") if key != "*")
+                if field not in fields:
+                    fields.append(field)
+        return fields
+
+    return []
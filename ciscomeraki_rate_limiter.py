@@ -0,0 +1,77 @@
+#!/usr/bin/python
+# File: ciscomeraki_rate_limiter.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import time
+
+import ciscomeraki_consts as consts
+
+
+class TokenBucketRateLimiter:
+    """Class to throttle API requests with one token bucket per organization.
+
+    The buckets live in a ``LockedStateFile``, so all action processes running at
+    the same time draw from the same budget. A caller that finds the bucket empty
+    reserves the next token and sleeps until it becomes available, which keeps
+    waiting callers in arrival order instead of letting them compete.
+    """
+
+    def __init__(self, store, rate, capacity=None):
+        """Initialize the rate limiter.
+
+        Args:
+            store: LockedStateFile holding the buckets
+            rate: Number of requests allowed per second
+            capacity: Maximum burst size (Default: rate)
+        """
+        self._store = store
+        self._rate = float(rate)
+        self._capacity = float(capacity or rate)
+
+    def reserve(self, key):
+        """Take a token from the bucket of the given key.
+
+        Args:
+            key: Bucket key, usually the organization ID
+
+        Returns:
+            float: Number of seconds to wait before sending the request
+        """
+        with self._store.locked() as buckets:
+            now = time.time()
+            bucket = buckets.get(key) or {"tokens": self._capacity, "updated": now}
+            elapsed = max(now - bucket["updated"], 0)
+            tokens = min(self._capacity, bucket["tokens"] + elapsed * self._rate) - 1
+            buckets[key] = {"tokens": tokens, "updated": now}
+
+            # Drop buckets that have been refilled and unused for a while
+            for stale_key in [k for k, v in buckets.items() if now - v["updated"] > consts.RATE_LIMIT_BUCKET_EXPIRY]:
+                del buckets[stale_key]
+
+        return -tokens / self._rate if tokens < 0 else 0
+
+    def acquire(self, key):
+        """Wait until a request for the given key may be sent.
+
+        Args:
+            key: Bucket key, usually the organization ID
+
+        Returns:
+            float: Number of seconds waited
+        """
+        wait = self.reserve(key)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
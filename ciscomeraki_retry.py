@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# File: ciscomeraki_retry.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import random
+import threading
+import time
+
+import requests
+
+import ciscomeraki_consts as consts
+
+
+class RetryPolicy:
+    """Class to decide whether and when a failed request is retried.
+
+    Delays follow the "decorrelated jitter" scheme: every delay is drawn between
+    the base delay and three times the previous one, capped at the maximum delay.
+    All retries of an action run share one time budget, so backing off never
+    keeps the action running past its deadline.
+    """
+
+    def __init__(self, time_budget, max_retries=consts.MAX_RETRIES):
+        """Initialize the retry policy.
+
+        Args:
+            time_budget: Number of seconds the action run may spend in total
+            max_retries: Maximum number of retries of a single request
+        """
+        self._deadline = time.monotonic() + time_budget
+        self._max_retries = max_retries
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.wait_time = 0.0
+
+    def is_retryable_status(self, status_code, method):
+        """Check whether a response status code is worth retrying.
+
+        Args:
+            status_code: HTTP status code of the response
+            method: HTTP method of the request
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        if method.lower() in consts.IDEMPOTENT_HTTP_METHODS:
+            return status_code in consts.RETRYABLE_STATUS_CODES
+        # The server may already have acted on a non-idempotent request
+        return status_code in consts.RETRYABLE_NON_IDEMPOTENT_STATUS_CODES
+
+    def is_retryable_exception(self, e, method):
+        """Check whether a request exception is worth retrying.
+
+        Args:
+            e: Exception raised by requests
+            method: HTTP method of the request
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        if isinstance(e, requests.exceptions.ConnectTimeout):
+            return True
+        if method.lower() not in consts.IDEMPOTENT_HTTP_METHODS:
+            return False
+        return isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+    def next_delay(self, previous_delay, retry_after=None):
+        """Get the delay before the next retry.
+
+        Args:
+            previous_delay: Delay used before the previous retry, or None for the first retry
+            retry_after: Delay requested by the server in the Retry-After header
+
+        Returns:
+            float: Number of seconds to wait
+        """
+        previous_delay = previous_delay or consts.INITIAL_RETRY_DELAY
+        delay = min(consts.MAX_RETRY_DELAY, random.uniform(consts.INITIAL_RETRY_DELAY, previous_delay * 3))
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    def can_retry(self, retries, delay):
+        """Check whether another retry fits in the retry count and the time budget.
+
+        Args:
+            retries: Number of retries already made for the request
+            delay: Delay before the next retry
+
+        Returns:
+            bool: True if the request may be retried
+        """
+        if retries >= self._max_retries:
+            return False
+        # Leave room for the retried request itself before the deadline
+        return time.monotonic() + delay + consts.RETRY_MIN_REQUEST_TIME <= self._deadline
+
+    def get_remaining_time(self):
+        """Get the number of seconds left in the time budget.
+
+        Returns:
+            float: Remaining seconds, zero once the deadline has passed
+        """
+        return max(self._deadline - time.monotonic(), 0)
+
+    def wait(self, delay):
+        """Sleep before a retry and record it in the statistics.
+
+        Args:
+            delay: Number of seconds to wait
+        """
+        with self._lock:
+            self.retries += 1
+            self.wait_time += delay
+        time.sleep(delay)
+
+    def get_summary(self):
+        """Get the retry statistics of the action run.
+
+        Returns:
+            dict: Number of retries and seconds spent waiting
+        """
+        return {"retries": self.retries, "retry_wait_seconds": round(self.wait_time, 2)}
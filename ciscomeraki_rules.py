@@ -0,0 +1,871 @@
+#!/usr/bin/python
+# File: ciscomeraki_rules.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import ipaddress
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+import ciscomeraki_consts as consts
+
+
+def _normalize_value(value):
+    """Normalize a free-form rule value for comparison."""
+    return str(value).strip().lower()
+
+
+def _normalize_cidrs(cidrs):
+    """Normalize a comma-separated list of CIDRs, IPs or 'any' for comparison.
+
+    Host addresses get their prefix length and the list order is ignored, so
+    '10.0.0.1, 10.0.0.0/8' and '10.0.0.0/8,10.0.0.1/32' compare equal.
+    """
+    values = set()
+    for value in str(cidrs).split(","):
+        value = _normalize_value(value)
+        try:
+            value = str(ipaddress.ip_network(value, strict=False))
+        except ValueError:
+            pass
+        values.add(value)
+    return tuple(sorted(values))
+
+
+def normalize_l3_rule(rule):
+    """Get the comparison key of an L3 firewall rule.
+
+    Args:
+        rule: L3 firewall rule
+
+    Returns:
+        tuple: Normalized rule fields
+    """
+    return (
+        _normalize_value(rule.get("policy", "")),
+        _normalize_value(rule.get("protocol", "")),
+        _normalize_cidrs(rule.get("srcCidr", "")),
+        _normalize_value(rule.get("srcPort", "")).replace(" ", ""),
+        _normalize_cidrs(rule.get("destCidr", "")),
+        _normalize_value(rule.get("destPort", "")).replace(" ", ""),
+        str(rule.get("comment") or "").strip(),
+        bool(rule.get("syslogEnabled", False)),
+    )
+
+
+def normalize_l7_rule(rule):
+    """Get the comparison key of an L7 firewall rule.
+
+    Args:
+        rule: L7 firewall rule
+
+    Returns:
+        tuple: Normalized rule fields
+    """
+    value = rule.get("value", "")
+    # Applications are returned as objects, but only their ID matters
+    if isinstance(value, dict):
+        value = value.get("id", "")
+    return _normalize_value(rule.get("policy", "")), _normalize_value(rule.get("type", "")), _normalize_value(value)
+
+
+def strip_default_l3_rule(rules):
+    """Remove the default allow rule that Meraki appends to every L3 rule list.
+
+    Args:
+        rules: L3 firewall rules as returned by the API
+
+    Returns:
+        list: Rules without the default rule
+    """
+    if rules and str(rules[-1].get("comment", "")).strip().lower() == consts.L3_DEFAULT_RULE_COMMENT.lower():
+        return rules[:-1]
+    return rules
+
+
+def _longest_increasing_subsequence(values):
+    """Get the positions of a longest strictly increasing subsequence in O(n log n).
+
+    Args:
+        values: Sequence of comparable values
+
+    Returns:
+        set: Positions in values of the subsequence
+    """
+    tails = []  # Smallest tail value of the increasing subsequences of each length
+    tail_positions = []
+    previous = [None] * len(values)
+    for position, value in enumerate(values):
+        length = bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[length] = value
+            tail_positions[length] = position
+        previous[position] = tail_positions[length - 1] if length else None
+
+    positions = set()
+    position = tail_positions[-1] if tail_positions else None
+    while position is not None:
+        positions.add(position)
+        position = previous[position]
+    return positions
+
+
+def diff_rules(current_rules, desired_rules, normalize):
+    """Compare the current rules of a network with the rules about to be applied.
+
+    Rules are matched on their normalized form. Matched rules that are not part
+    of the longest run kept in the same relative order are reported as reordered.
+
+    Args:
+        current_rules: Rules currently configured
+        desired_rules: Rules about to be applied
+        normalize: Function returning the comparison key of a rule
+
+    Returns:
+        dict: Whether anything changed, and the added, removed and reordered rules
+    """
+    current_keys = [normalize(rule) for rule in current_rules]
+    desired_keys = [normalize(rule) for rule in desired_rules]
+
+    # Positions of every key in the current rules, consumed in order so that
+    # duplicate rules are matched one to one
+    current_positions = defaultdict(list)
+    for position, key in reversed(list(enumerate(current_keys))):
+        current_positions[key].append(position)
+
+    added = []
+    matched = []  # (desired position, current position)
+    for position, key in enumerate(desired_keys):
+        if current_positions[key]:
+            matched.append((position, current_positions[key].pop()))
+        else:
+            added.append(desired_rules[position])
+
+    matched_current = {current for _, current in matched}
+    removed = [rule for position, rule in enumerate(current_rules) if position not in matched_current]
+
+    in_order = _longest_increasing_subsequence([current for _, current in matched])
+    reordered = [desired_rules[desired] for index, (desired, _) in enumerate(matched) if index not in in_order]
+
+    return {
+        "changed": current_keys != desired_keys,
+        "added": added,
+        "removed": removed,
+        "reordered": reordered,
+    }
+
+
+def get_diff_summary(total_rules_updated, changes):
+    """Get the summary entries of a rule update.
+
+    Args:
+        total_rules_updated: Number of rules sent to the network
+        changes: Changes returned by diff_rules, or None if the current rules could not be compared
+
+    Returns:
+        dict: Summary entries
+    """
+    summary = {"total_rules_updated": total_rules_updated}
+    if changes is not None:
+        summary.update(
+            {
+                "rules_changed": changes["changed"],
+                "rules_added": len(changes["added"]),
+                "rules_removed": len(changes["removed"]),
+                "rules_reordered": len(changes["reordered"]),
+            }
+        )
+    return summary
+
+
+class IntervalTree:
+    """Static centered interval tree answering overlap queries in O(log n + k).
+
+    Every node keeps the intervals containing its center point, sorted by start
+    and by end, so a query only walks one root-to-leaf path plus the nodes whose
+    center falls inside the queried interval.
+    """
+
+    def __init__(self, intervals):
+        """Build the tree.
+
+        Args:
+            intervals: Iterable of (start, end, value) tuples with inclusive bounds
+        """
+        self._root = self._build(list(intervals))
+
+    def _build(self, intervals):
+        """Build the subtree holding the given intervals."""
+        if not intervals:
+            return None
+
+        points = sorted(point for start, end, _ in intervals for point in (start, end))
+        center = points[len(points) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        return (
+            center,
+            sorted(here, key=lambda interval: interval[0]),
+            sorted(here, key=lambda interval: interval[1], reverse=True),
+            self._build(left),
+            self._build(right),
+        )
+
+    def overlapping(self, start, end):
+        """Find the intervals overlapping an interval.
+
+        Args:
+            start: Start of the queried interval
+            end: End of the queried interval
+
+        Yields:
+            tuple: Overlapping (start, end, value) intervals
+        """
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            if node is None:
+                continue
+
+            center, by_start, by_end, left, right = node
+            if end < center:
+                for interval in by_start:
+                    if interval[0] > end:
+                        break
+                    yield interval
+                nodes.append(left)
+            elif start > center:
+                for interval in by_end:
+                    if interval[1] < start:
+                        break
+                    yield interval
+                nodes.append(right)
+            else:
+                # Every interval of the node contains the center, which is inside the query
+                yield from by_start
+                nodes.append(left)
+                nodes.append(right)
+
+
+# IPv4 addresses take the first 2^32 values of the address space, IPv6
+# addresses the following 2^128 values
+IPV6_OFFSET = 1 << 32
+ADDRESS_SPACE = (0, IPV6_OFFSET + (1 << 128) - 1)
+PORT_SPACE = (1, 65535)
+ALL_PROTOCOLS = frozenset(["tcp", "udp", "icmp", "icmp6"])
+
+
+def _merge_intervals(intervals):
+    """Merge overlapping and adjacent intervals.
+
+    Args:
+        intervals: Iterable of (start, end) tuples
+
+    Returns:
+        list: Sorted, disjoint intervals
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _parse_network(value):
+    """Parse an IP address or CIDR, host bits set or not.
+
+    Plain IPv4 values are parsed by hand, which is several times faster than the
+    ipaddress module on large rule sets.
+
+    Args:
+        value: IP address or CIDR
+
+    Returns:
+        tuple: IP version, first and last address as integers, or None if the value is not an address
+    """
+    address, _, prefix = value.strip().partition("/")
+    octets = address.split(".")
+    if (
+        len(octets) == 4
+        and all(octet.isdigit() and len(octet) <= 3 and (octet == "0" or octet[0] != "0") for octet in octets)
+        and (not prefix or prefix.isdigit())
+    ):
+        prefix_length = int(prefix) if prefix else 32
+        if prefix_length <= 32 and all(int(octet) <= 255 for octet in octets):
+            integer = int(octets[0]) << 24 | int(octets[1]) << 16 | int(octets[2]) << 8 | int(octets[3])
+            host_mask = (1 << (32 - prefix_length)) - 1
+            return 4, integer & ~host_mask, integer | host_mask
+
+    try:
+        network = ipaddress.ip_network(value.strip(), strict=False)
+    except ValueError:
+        return None
+    return network.version, int(network.network_address), int(network.broadcast_address)
+
+
+def cidr_to_interval(value):
+    """Convert an IP address or CIDR to an interval of the address space.
+
+    Args:
+        value: IP address or CIDR
+
+    Returns:
+        tuple: First and last address, or None if the value is not an address
+    """
+    network = _parse_network(value)
+    if network is None:
+        return None
+    version, start, end = network
+    offset = IPV6_OFFSET if version == 6 else 0
+    return offset + start, offset + end
+
+
+def _parse_cidrs(value):
+    """Parse the srcCidr or destCidr field of a rule.
+
+    Returns:
+        list: Disjoint address intervals, or None if a value is not an address
+            (e.g. a VLAN or FQDN reference)
+    """
+    intervals = []
+    for cidr in str(value).split(","):
+        if cidr.strip().lower() == "any":
+            return [ADDRESS_SPACE]
+        interval = cidr_to_interval(cidr)
+        if interval is None:
+            return None
+        intervals.append(interval)
+    return _merge_intervals(intervals)
+
+
+def parse_port(value):
+    """Parse a single port.
+
+    Args:
+        value: Port as an integer or string
+
+    Returns:
+        int: The port, or None if the value is not an integer between 1 and 65535
+    """
+    try:
+        port = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not port.is_integer() or not PORT_SPACE[0] <= port <= PORT_SPACE[1]:
+        return None
+    return int(port)
+
+
+def _parse_ports(value):
+    """Parse the srcPort or destPort field of a rule.
+
+    Returns:
+        list: Disjoint port intervals, or None if the value is not valid
+    """
+    intervals = []
+    for port in str(value).split(","):
+        port = port.strip().lower()
+        if port == "any":
+            return [PORT_SPACE]
+        start, _, end = port.partition("-")
+        start, end = parse_port(start), parse_port(end or start)
+        if start is None or end is None or start > end:
+            return None
+        intervals.append((start, end))
+    return _merge_intervals(intervals)
+
+
+def _parse_protocols(value):
+    """Parse the protocol field of a rule.
+
+    Returns:
+        frozenset: Protocols matched by the rule
+    """
+    value = str(value).strip().lower()
+    return ALL_PROTOCOLS if value == "any" else frozenset([value])
+
+
+def _intervals_contain(outer, inner):
+    """Check whether every interval of inner lies within one interval of outer (both merged)."""
+    position = 0
+    for start, end in inner:
+        while position < len(outer) and outer[position][1] < start:
+            position += 1
+        if position == len(outer) or outer[position][0] > start or outer[position][1] < end:
+            return False
+    return True
+
+
+def _intervals_overlap(first, second):
+    """Check whether two sorted lists of disjoint intervals overlap."""
+    i = j = 0
+    while i < len(first) and j < len(second):
+        if first[i][1] < second[j][0]:
+            i += 1
+        elif second[j][1] < first[i][0]:
+            j += 1
+        else:
+            return True
+    return False
+
+
+# Source addresses, source ports, destination addresses and destination ports
+RULE_DIMENSIONS = 4
+
+
+class RuleSpace:
+    """Set of packets matched by an L3 firewall rule, one interval list per dimension."""
+
+    __slots__ = ("dimensions", "protocols")
+
+    def __init__(self, protocols, src_cidrs, src_ports, dest_cidrs, dest_ports):
+        self.protocols = protocols
+        self.dimensions = (src_cidrs, src_ports, dest_cidrs, dest_ports)
+
+    @classmethod
+    def from_rule(cls, rule):
+        """Get the packet set of a rule.
+
+        Args:
+            rule: L3 firewall rule
+
+        Returns:
+            RuleSpace: The packet set, or None if a field cannot be analyzed
+        """
+        dimensions = (
+            _parse_cidrs(rule.get("srcCidr", "any")),
+            _parse_ports(rule.get("srcPort", "any")),
+            _parse_cidrs(rule.get("destCidr", "any")),
+            _parse_ports(rule.get("destPort", "any")),
+        )
+        if any(dimension is None for dimension in dimensions):
+            return None
+        return cls(_parse_protocols(rule.get("protocol", "any")), *dimensions)
+
+    def contains(self, other):
+        """Check whether every packet matched by other is matched by this space."""
+        return other.protocols <= self.protocols and all(map(_intervals_contain, self.dimensions, other.dimensions))
+
+    def overlaps(self, other):
+        """Check whether some packet is matched by both spaces."""
+        return bool(self.protocols & other.protocols) and all(map(_intervals_overlap, self.dimensions, other.dimensions))
+
+
+class RuleIndex:
+    """Index of rule spaces finding the rules that may overlap a space.
+
+    Every dimension (source and destination addresses and ports) has its own
+    interval tree. A query walks the dimensions together and stops at the first
+    one with no more matches, so rules sharing a destination, such as 'Any',
+    are still told apart by their source or ports.
+    """
+
+    def __init__(self, spaces):
+        """Build the index.
+
+        Args:
+            spaces: RuleSpace of every rule, None for the rules left out
+        """
+        analyzed = [(position, space) for position, space in enumerate(spaces) if space is not None]
+        self._trees = [
+            IntervalTree((start, end, position) for position, space in analyzed for start, end in space.dimensions[dimension])
+            for dimension in range(RULE_DIMENSIONS)
+        ]
+
+    def candidates(self, space):
+        """Find the rules whose space may overlap a space.
+
+        Args:
+            space: Queried RuleSpace
+
+        Returns:
+            set: Positions of the rules overlapping the space in the most selective dimension
+        """
+        # Take one match of every dimension at a time, so the cost is bounded
+        # by the dimension with the fewest matches
+        searches = [(self._overlapping(tree, intervals), set()) for tree, intervals in zip(self._trees, space.dimensions)]
+        while True:
+            for positions, found in searches:
+                position = next(positions, None)
+                if position is None:
+                    return found
+                found.add(position)
+
+    @staticmethod
+    def _overlapping(tree, intervals):
+        """Find the rules overlapping any of several intervals in one dimension.
+
+        Yields:
+            int: Rule positions, repeated for rules overlapping several intervals
+        """
+        for start, end in intervals:
+            for _, _, position in tree.overlapping(start, end):
+                yield position
+
+
+# Kinds of findings reported by analyze_l3_rules
+FINDING_DUPLICATE = "duplicate"
+FINDING_REDUNDANT = "redundant"
+FINDING_SHADOWED = "shadowed"
+FINDING_CONFLICT = "conflict"
+
+
+def analyze_l3_rules(rules):
+    """Find L3 firewall rules that never match or whose effect depends on their order.
+
+    A rule fully covered by an earlier rule never matches: it is a duplicate if
+    both are equal, redundant if they share the policy and shadowed otherwise.
+    A rule partially overlapping an earlier rule with the other policy is
+    reported as a conflict. Candidate pairs come from a RuleIndex, so rules
+    disjoint in their most selective dimension are never compared.
+
+    Args:
+        rules: L3 firewall rules in evaluation order, without the default rule
+
+    Returns:
+        tuple: Findings (list of dict), positions of the rules that could not be analyzed (list)
+    """
+    spaces = [RuleSpace.from_rule(rule) for rule in rules]
+    unanalyzed = [position for position, space in enumerate(spaces) if space is None]
+    index = RuleIndex(spaces)
+
+    findings = []
+    never_matching = set()
+    for position, space in enumerate(spaces):
+        if space is None:
+            continue
+
+        # Rules that never match are covered by an earlier rule found first anyway
+        candidates = sorted(earlier for earlier in index.candidates(space) if earlier < position and earlier not in never_matching)
+        conflicts = []
+        for earlier in candidates:
+            earlier_space = spaces[earlier]
+            if earlier_space.contains(space):
+                same_policy = _normalize_value(rules[earlier].get("policy")) == _normalize_value(rules[position].get("policy"))
+                if not same_policy:
+                    finding = FINDING_SHADOWED
+                elif space.contains(earlier_space):
+                    finding = FINDING_DUPLICATE
+                else:
+                    finding = FINDING_REDUNDANT
+                findings.append(_get_finding(rules, position, finding, [earlier]))
+                never_matching.add(position)
+                break
+
+            # A later rule covering an earlier exception of the other policy is intended
+            if (
+                _normalize_value(rules[earlier].get("policy")) != _normalize_value(rules[position].get("policy"))
+                and not space.contains(earlier_space)
+                and earlier_space.overlaps(space)
+            ):
+                conflicts.append(earlier)
+        else:
+            if conflicts:
+                findings.append(_get_finding(rules, position, FINDING_CONFLICT, conflicts))
+
+    return findings, unanalyzed
+
+
+def _get_finding(rules, position, finding, related):
+    """Build a finding of analyze_l3_rules.
+
+    Args:
+        rules: Analyzed rules
+        position: Position of the rule the finding is about
+        finding: Kind of finding
+        related: Positions of the earlier rules involved
+
+    Returns:
+        dict: The finding
+    """
+    return {
+        "rule_index": position,
+        "finding": finding,
+        "related_rule_indexes": related,
+        "rule": rules[position],
+        "related_rules": [rules[index] for index in related],
+    }
+
+
+def get_analysis_summary(findings, unanalyzed):
+    """Get the summary entries of a rule analysis.
+
+    Args:
+        findings: Findings returned by analyze_l3_rules
+        unanalyzed: Positions of the rules that could not be analyzed
+
+    Returns:
+        dict: Summary entries
+    """
+    kinds = [finding["finding"] for finding in findings]
+    return {
+        "total_findings": len(findings),
+        "duplicate_rules": kinds.count(FINDING_DUPLICATE),
+        "redundant_rules": kinds.count(FINDING_REDUNDANT),
+        "shadowed_rules": kinds.count(FINDING_SHADOWED),
+        "conflicting_rules": kinds.count(FINDING_CONFLICT),
+        "unanalyzed_rules": len(unanalyzed),
+    }
+
+
+def get_unreachable_rules(findings):
+    """Get the findings about rules that can never match.
+
+    Args:
+        findings: Findings returned by analyze_l3_rules
+
+    Returns:
+        list: Duplicate, redundant and shadowed rule findings
+    """
+    return [finding for finding in findings if finding["finding"] != FINDING_CONFLICT]
+
+
+def _interval_to_cidrs(start, end, version):
+    """Split an address interval into the fewest CIDR blocks covering it exactly.
+
+    Args:
+        start: First address as an integer
+        end: Last address as an integer
+        version: IP version of the addresses
+
+    Returns:
+        list: CIDR strings
+    """
+    address_class, total_bits = (ipaddress.IPv4Address, 32) if version == 4 else (ipaddress.IPv6Address, 128)
+    cidrs = []
+    while start <= end:
+        # Largest block aligned on start, shrunk until it fits in the interval
+        size = start & -start if start else 1 << total_bits
+        while start + size - 1 > end:
+            size >>= 1
+        cidrs.append(f"{address_class(start)}/{total_bits - size.bit_length() + 1}")
+        start += size
+    return cidrs
+
+
+def collapse_cidrs(values):
+    """Collapse addresses and CIDRs into the minimal list of supernets.
+
+    Works like ipaddress.collapse_addresses, on plain integer intervals so large
+    lists stay fast. Values that are not addresses are kept as they are, and
+    'any' absorbs everything.
+
+    Args:
+        values: Addresses, CIDRs or other rule values
+
+    Returns:
+        list: Collapsed values
+    """
+    intervals = {4: [], 6: []}
+    others = []
+    for value in values:
+        value = value.strip()
+        if value.lower() == "any":
+            return ["Any"]
+        network = _parse_network(value)
+        if network is None:
+            if value not in others:
+                others.append(value)
+            continue
+        intervals[network[0]].append(network[1:])
+
+    cidrs = []
+    for version, version_intervals in intervals.items():
+        for start, end in _merge_intervals(version_intervals):
+            cidrs.extend(_interval_to_cidrs(start, end, version))
+    return cidrs + others
+
+
+def _merge_rule_cidrs(rules, field, key_fields):
+    """Merge rules that differ only in one CIDR field, keeping the order of first appearance.
+
+    Args:
+        rules: Rules sharing the same policy
+        field: CIDR field merged, srcCidr or destCidr
+        key_fields: Other fields that must be equal for rules to merge
+
+    Returns:
+        list: Merged rules
+    """
+    groups = {}
+    for rule in rules:
+        key = tuple(_normalize_value(rule.get(name, "")) for name in key_fields)
+        if key in groups:
+            groups[key][1].extend(str(rule.get(field, "")).split(","))
+        else:
+            groups[key] = (dict(rule), str(rule.get(field, "")).split(","))
+
+    merged = []
+    for rule, values in groups.values():
+        rule[field] = ",".join(collapse_cidrs(values))
+        merged.append(rule)
+    return merged
+
+
+def compact_l3_rules(rules):
+    """Compact L3 firewall rules without changing which traffic they allow or deny.
+
+    Only runs of consecutive rules with the same policy are compacted, as rules
+    can be reordered freely inside such a run. Within a run, rules differing only
+    in their destination CIDRs are merged and their CIDRs collapsed into minimal
+    supernets, then the same is done for the source CIDRs. The merged rule keeps
+    the comment of the first rule of its group.
+
+    Args:
+        rules: L3 firewall rules in evaluation order, without the default rule
+
+    Returns:
+        list: Compacted rules
+    """
+    dest_key = ("protocol", "srcCidr", "srcPort", "destPort", "syslogEnabled")
+    src_key = ("protocol", "destCidr", "srcPort", "destPort", "syslogEnabled")
+
+    compacted = []
+    position = 0
+    while position < len(rules):
+        policy = _normalize_value(rules[position].get("policy", ""))
+        run_end = position
+        while run_end < len(rules) and _normalize_value(rules[run_end].get("policy", "")) == policy:
+            run_end += 1
+
+        run = _merge_rule_cidrs(rules[position:run_end], "destCidr", dest_key)
+        compacted.extend(_merge_rule_cidrs(run, "srcCidr", src_key))
+        position = run_end
+    return compacted
+
+
+class _IntervalTable:
+    """Lookup table giving the rules matching a value of one dimension.
+
+    The dimension is cut into elementary segments at every rule boundary, and
+    each segment holds the bitmask of the rules covering it, so a lookup is a
+    single binary search.
+    """
+
+    def __init__(self, rule_intervals):
+        """Build the table.
+
+        Args:
+            rule_intervals: Disjoint intervals of every rule, in rule order
+        """
+        events = defaultdict(int)
+        for position, intervals in enumerate(rule_intervals):
+            bit = 1 << position
+            for start, end in intervals:
+                events[start] ^= bit
+                events[end + 1] ^= bit
+
+        self._starts = sorted(events)
+        self._masks = []
+        mask = 0
+        for point in self._starts:
+            mask ^= events[point]
+            self._masks.append(mask)
+
+    def lookup(self, value):
+        """Get the bitmask of the rules matching a value."""
+        index = bisect_right(self._starts, value) - 1
+        return self._masks[index] if index >= 0 else 0
+
+
+class CompiledL3Rules:
+    """L3 firewall rules compiled for fast first-match evaluation of flows.
+
+    Every dimension (protocol, source and destination address, source and
+    destination port) maps a flow value to the bitmask of the rules matching it.
+    ANDing the masks gives all matching rules, and the lowest set bit is the
+    rule Meraki applies.
+    """
+
+    def __init__(self, rules):
+        """Compile the rules.
+
+        Args:
+            rules: L3 firewall rules in evaluation order, including the default rule
+        """
+        self.rules = rules
+        spaces = [RuleSpace.from_rule(rule) for rule in rules]
+        # Rules referring to VLANs or FQDNs cannot be evaluated and never match
+        self.unevaluated_mask = sum(1 << position for position, space in enumerate(spaces) if space is None)
+
+        self._protocol_masks = {
+            protocol: sum(1 << position for position, space in enumerate(spaces) if space is not None and protocol in space.protocols)
+            for protocol in ALL_PROTOCOLS
+        }
+        self._tables = [_IntervalTable([space.dimensions[dimension] if space else [] for space in spaces]) for dimension in range(4)]
+        self._all_ports_masks = [
+            sum(1 << position for position, space in enumerate(spaces) if space is not None and space.dimensions[dimension] == [PORT_SPACE])
+            for dimension in (1, 3)
+        ]
+
+    def evaluate(self, protocol, src_ip, dest_ip, src_port=None, dest_port=None):
+        """Find the rule applied to a flow.
+
+        Ports are ignored for protocols without ports. A missing port only
+        matches rules allowing any port.
+
+        Args:
+            protocol: tcp, udp, icmp or icmp6
+            src_ip: Source IP address
+            dest_ip: Destination IP address
+            src_port: Source port
+            dest_port: Destination port
+
+        Returns:
+            tuple: Position of the matching rule or None, whether an unevaluated rule comes first (bool)
+
+        Raises:
+            ValueError: If an address, a port or the protocol is not valid
+        """
+        protocol = _normalize_value(protocol)
+        if protocol not in ALL_PROTOCOLS:
+            raise ValueError(f"Invalid protocol: {protocol}")
+
+        mask = self._protocol_masks[protocol]
+        for table, address in ((self._tables[0], src_ip), (self._tables[2], dest_ip)):
+            interval = cidr_to_interval(str(address))
+            if interval is None or interval[0] != interval[1]:
+                raise ValueError(f"Invalid IP address: {address}")
+            mask &= table.lookup(interval[0])
+
+        if protocol in ("tcp", "udp"):
+            for table, all_ports_mask, port in (
+                (self._tables[1], self._all_ports_masks[0], src_port),
+                (self._tables[3], self._all_ports_masks[1], dest_port),
+            ):
+                if port in (None, ""):
+                    mask &= all_ports_mask
+                    continue
+                parsed_port = parse_port(port)
+                if parsed_port is None:
+                    raise ValueError(f"Invalid port: {port}")
+                mask &= table.lookup(parsed_port)
+
+        if not mask:
+            return None, bool(self.unevaluated_mask)
+
+        position = (mask & -mask).bit_length() - 1
+        return position, bool(self.unevaluated_mask & ((1 << position) - 1))
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+# File: ciscomeraki_store.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+
+class LockedStateFile:
+    """Class to share a JSON document between concurrently running action processes.
+
+    Every access holds an exclusive ``flock`` on the file, so a read-modify-write
+    cycle is atomic across processes. When no path is given the document is kept
+    in memory and only shared between the threads of the current process.
+    """
+
+    def __init__(self, path=None):
+        """Initialize the store.
+
+        Args:
+            path: Path of the JSON file, or None for an in-memory store
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._memory = {}
+
+    @contextmanager
+    def locked(self):
+        """Lock the store and yield its content for reading and updating.
+
+        Changes made to the yielded dictionary are written back when the
+        context exits.
+
+        Yields:
+            dict: Content of the store
+        """
+        with self._lock:
+            if self._path is None:
+                yield self._memory
+                return
+
+            with open(self._path, "a+", encoding="utf-8") as state_file:
+                fcntl.flock(state_file, fcntl.LOCK_EX)
+                try:
+                    state_file.seek(0)
+                    raw = state_file.read()
+                    try:
+                        data = json.loads(raw) if raw else {}
+                    except ValueError:
+                        data = {}
+                    if not isinstance(data, dict):
+                        data = {}
+
+                    yield data
+
+                    state_file.seek(0)
+                    state_file.truncate()
+                    state_file.write(json.dumps(data))
+                    state_file.flush()
+                finally:
+                    fcntl.flock(state_file, fcntl.LOCK_UN)
+
+
+def get_state_path(connector, file_name):
+    """Get the path of a file or directory inside the app state directory.
+
+    Args:
+        connector: The connector instance
+        file_name: Name of the file or directory inside the state directory
+
+    Returns:
+        str: The path or None if the state directory is not available
+    """
+    try:
+        state_dir = connector.get_state_dir()
+    except Exception:
+        state_dir = None
+
+    if not state_dir or not os.path.isdir(state_dir):
+        return None
+
+    return os.path.join(state_dir, file_name)
+
+
+def get_state_file(connector, file_name):
+    """Get a locked store located in the app state directory.
+
+    Falls back to an in-memory store when the state directory is not available.
+
+    Args:
+        connector: The connector instance
+        file_name: Name of the file inside the state directory
+
+    Returns:
+        LockedStateFile: The store
+    """
+    path = get_state_path(connector, file_name)
+    if path is None:
+        connector.debug_print(f"State directory not available, keeping {file_name} in memory")
+        return LockedStateFile()
+
+    return LockedStateFile(path)
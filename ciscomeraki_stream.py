@@ -0,0 +1,140 @@
+#!/usr/bin/python
+# File: ciscomeraki_stream.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+import codecs
+import json
+import re
+
+
+WHITESPACE_REGEX = re.compile(r"[ \t\n\r]*")
+VALUE_DELIMITERS = " \t\n\r,]"
+
+# States of iter_json_array between two elements
+EXPECT_ARRAY = "array"
+EXPECT_FIRST_VALUE = "first_value"
+EXPECT_VALUE = "value"
+EXPECT_SEPARATOR = "separator"
+
+
+def iter_json_array(chunks):
+    """Yield the elements of a JSON array as its bytes arrive.
+
+    Only the unparsed tail of the document is buffered: every element is
+    decoded as soon as it is complete, so memory scales with the size of one
+    element plus one chunk rather than with the whole document.
+
+    Args:
+        chunks: Iterable of byte chunks of a UTF-8 encoded JSON array
+
+    Yields:
+        Decoded elements of the array, in order
+
+    Raises:
+        ValueError: If the document is not a valid JSON array
+    """
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    exhausted = False
+    state = EXPECT_ARRAY
+
+    while True:
+        position = WHITESPACE_REGEX.match(buffer, position).end()
+        if position < len(buffer):
+            char = buffer[position]
+            if state == EXPECT_ARRAY:
+                if char != "[":
+                    raise ValueError("Response is not a JSON array")
+                position += 1
+                state = EXPECT_FIRST_VALUE
+                continue
+
+            if char == "]" and state in (EXPECT_FIRST_VALUE, EXPECT_SEPARATOR):
+                return
+
+            if state == EXPECT_SEPARATOR:
+                if char != ",":
+                    raise ValueError(f"Expecting ',' delimiter at position {position}")
+                position += 1
+                state = EXPECT_VALUE
+                continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The element may be incomplete, unless all the data has arrived
+                if exhausted:
+                    raise
+                value, end = None, None
+
+            # A number cut by the end of the chunk also decodes, so only accept
+            # a value once the character after it has arrived
+            if end is not None and (exhausted or (end < len(buffer) and buffer[end] in VALUE_DELIMITERS)):
+                yield value
+                position = end
+                state = EXPECT_SEPARATOR
+                continue
+
+        if exhausted:
+            raise ValueError("Unexpected end of the JSON array")
+
+        # Drop the parsed data before reading more
+        buffer = buffer[position:]
+        position = 0
+        chunk = next(chunks, None)
+        if chunk is None:
+            buffer += utf8_decoder.decode(b"", final=True)
+            exhausted = True
+        else:
+            buffer += utf8_decoder.decode(chunk)
+
+
+class JSONArrayStream:
+    """Class to iterate over the records of a streamed JSON array response.
+
+    The response body is read in chunks while iterating, and the connection is
+    released when the stream is closed, whether or not it was read to the end.
+    """
+
+    def __init__(self, response, chunk_size):
+        """Initialize the stream.
+
+        Args:
+            response: requests response opened with stream=True
+            chunk_size: Number of bytes to read at a time
+        """
+        self._response = response
+        self._records = iter_json_array(response.iter_content(chunk_size))
+
+    def __iter__(self):
+        """Get the iterator over the records."""
+        return self
+
+    def __next__(self):
+        """Get the next record.
+
+        Raises:
+            StopIteration: At the end of the array
+            ValueError: If the body is not a valid JSON array
+        """
+        return next(self._records)
+
+    def close(self):
+        """Stop reading and release the connection."""
+        self._records.close()
+        self._response.close()
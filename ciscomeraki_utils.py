@@ -14,15 +14,28 @@
 # either express or implied. See the License for the specific language governing permissions
 # and limitations under the License.
 
-import json
-import time
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
 
 import phantom.app as phantom
 import requests
-from bs4 import BeautifulSoup
+from phantom.action_result import ActionResult
+from requests.structures import CaseInsensitiveDict
 
 import ciscomeraki_consts as consts
+import ciscomeraki_json
+from ciscomeraki_cache import ETagCache, ResponseCache
+from ciscomeraki_coalesce import RequestCoalescer
+from ciscomeraki_inventory import InventorySnapshot, InventoryStore
+from ciscomeraki_metrics import RequestMetrics
+from ciscomeraki_projection import FieldProjection, get_default_fields
+from ciscomeraki_retry import RetryPolicy
+from ciscomeraki_store import get_state_path
+from ciscomeraki_stream import JSONArrayStream
 
 
 class CiscoMerakiUtils:
@@ -35,6 +48,23 @@ class CiscoMerakiUtils:
             connector: The connector instance
         """
         self._connector = connector
+        self._base_url = f"{connector.get_config().get('base_url', '').rstrip('/')}{consts.API_PATH}"
+        self._session_ready = False
+        self._scoped_endpoint_regex = re.compile(consts.SCOPED_ENDPOINT_REGEX)
+        self._retry_policy = RetryPolicy(consts.DEFAULT_ACTION_TIME_BUDGET)
+        self._request_metrics = RequestMetrics()
+        self._request_coalescer = RequestCoalescer(get_state_path(connector, consts.COALESCE_DIR))
+        self._endpoint_templates = self._compile_endpoint_template_map(consts.ENDPOINT_TEMPLATES)
+        self._etag_cache_regexes = self._compile_endpoint_templates(consts.ETAG_CACHE_ENDPOINTS)
+        self._etag_cache = ETagCache(connector._state.setdefault(consts.STATE_ETAG_CACHE, {}), get_state_path(connector, consts.ETAG_CACHE_DIR))
+        self._cache_lock = threading.Lock()
+        self._organizations_lock = threading.Lock()
+        self._response_cache = ResponseCache(get_state_path(connector, consts.RESPONSE_CACHE_DIR))
+        self._response_cache_templates = self._compile_endpoint_template_map(consts.RESPONSE_CACHE_TTLS)
+        self._invalidation_templates = self._compile_endpoint_template_map(consts.RESPONSE_CACHE_INVALIDATIONS)
+        self._bypass_cache = False
+        self._inventory_store = InventoryStore(get_state_path(connector, consts.INVENTORY_DIR))
+        self._inventories = {}
 
     def _get_error_message_from_exception(self, e):
         """Get appropriate error message from the exception.
@@ -59,6 +89,412 @@ class CiscoMerakiUtils:
 
         return f"Error Code: {error_code}. Error Message: {error_msg}"
 
+    def _get_session(self):
+        """Get the connector's pooled HTTP session, preparing it on first use.
+
+        The authentication headers are built once and attached to the session,
+        so they are reused by every request in the action run.
+
+        Returns:
+            requests.Session: The session or None if the API key is not configured
+        """
+        if self._session_ready:
+            return self._connector._session
+
+        headers = self._connector._auth.get_headers()
+        if headers is None:
+            return None
+        headers["User-Agent"] = "Splunk SOAR Cisco Test"  # Add User-Agent
+
+        session = self._connector._session
+        session.headers.update(headers)
+        session.verify = self._connector.get_config().get("verify_server_cert", True)
+        self._session_ready = True
+        return session
+
+    def _compile_endpoint_templates(self, templates):
+        """Compile endpoint templates such as '/networks/{network_id}/devices' into regexes.
+
+        Args:
+            templates: Endpoint templates from the constants module
+
+        Returns:
+            list: Compiled regexes with one named group per placeholder
+        """
+        return [re.compile("^" + re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", re.escape(template)) + "$") for template in templates]
+
+    def _compile_endpoint_template_map(self, templates):
+        """Compile endpoint templates and keep them next to their regexes.
+
+        Args:
+            templates: Endpoint templates from the constants module
+
+        Returns:
+            list: Tuples of endpoint template and compiled regex
+        """
+        return list(zip(templates, self._compile_endpoint_templates(templates)))
+
+    def _match_endpoint(self, endpoint, templates):
+        """Find the endpoint template an endpoint was built from.
+
+        Args:
+            endpoint: REST endpoint
+            templates: Tuples of endpoint template and compiled regex
+
+        Returns:
+            tuple: Endpoint template and placeholder values (dict), or None and None
+        """
+        for template, regex in templates:
+            match = regex.match(endpoint)
+            if match:
+                return template, match.groupdict()
+        return None, None
+
+    def _get_response_cache_key(self, full_url, params):
+        """Get the response cache key of a request.
+
+        The API key is part of the key, as assets with different API keys may
+        see different data.
+
+        Args:
+            full_url: Full URL of the request
+            params: Query parameters
+
+        Returns:
+            str: Cache key
+        """
+        api_key = self._connector.get_config().get("api_key", "")
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return hashlib.sha256(f"{api_key}\n{full_url}?{query}".encode()).hexdigest()
+
+    def _invalidate_response_cache(self, endpoint):
+        """Remove the cached responses made stale by a successful write.
+
+        Args:
+            endpoint: REST endpoint that was written to
+        """
+        template, path_params = self._match_endpoint(endpoint, self._invalidation_templates)
+        if not template:
+            return
+
+        if "network_id" in path_params:
+            organization_id = self._connector._state.get(consts.STATE_NETWORK_ORGANIZATIONS, {}).get(path_params["network_id"])
+            if organization_id:
+                path_params["organization_id"] = organization_id
+
+        if consts.SEARCH_DEVICES in consts.RESPONSE_CACHE_INVALIDATIONS[template]:
+            if "serial" in path_params:
+                organization_id = self._connector._state.get(consts.STATE_DEVICE_ORGANIZATIONS, {}).get(path_params["serial"])
+                if organization_id:
+                    path_params["organization_id"] = organization_id
+            self._invalidate_device_inventory(path_params.get("organization_id"))
+
+        for read_template in consts.RESPONSE_CACHE_INVALIDATIONS[template]:
+            # Placeholders that cannot be filled in match every cached entry of the template
+            placeholders = re.findall(r"\{(\w+)\}", read_template)
+            params = {name: value for name, value in path_params.items() if name in placeholders}
+            removed = self._response_cache.invalidate(read_template, params)
+            if removed:
+                self._connector.debug_print(f"Invalidated {removed} cached responses of {read_template}")
+
+    def _get_inventory_key(self, organization_id):
+        """Get the key of the device inventory snapshot of an organization.
+
+        Args:
+            organization_id: Organization ID
+
+        Returns:
+            str: Snapshot key
+        """
+        api_key = self._connector.get_config().get("api_key", "")
+        return hashlib.sha256(f"{api_key}\n{self._base_url}\n{organization_id}".encode()).hexdigest()
+
+    def _get_device_inventory(self, action_result, organization_id, max_staleness):
+        """Get the device inventory snapshot of an organization.
+
+        The snapshot saved in the state directory is used while it is younger than
+        the staleness bound; otherwise the devices are fetched again and a new
+        snapshot is saved for the following action runs.
+
+        Args:
+            action_result: ActionResult object
+            organization_id: Organization ID
+            max_staleness: Maximum age of the snapshot in seconds
+
+        Returns:
+            tuple: Status (bool), InventorySnapshot, whether the snapshot was refreshed (bool)
+        """
+        key = self._get_inventory_key(organization_id)
+        if not self._bypass_cache:
+            with self._cache_lock:
+                snapshot = self._inventories.get(key)
+            snapshot = snapshot or self._inventory_store.load(key)
+            if snapshot is not None and snapshot.age <= max_staleness:
+                with self._cache_lock:
+                    self._inventories[key] = snapshot
+                return phantom.APP_SUCCESS, snapshot, False
+
+        devices = []
+        # The snapshot is a cache of its own, so always fetch the devices from the API
+        for ret_val, page in self._paginator(
+            action_result, consts.SEARCH_DEVICES.format(organization_id=organization_id), limit=1000, use_response_cache=False
+        ):
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), None, False
+            devices.extend(page)
+
+        snapshot = InventorySnapshot(devices)
+        self._inventory_store.save(key, snapshot)
+        with self._cache_lock:
+            self._inventories[key] = snapshot
+            # The devices tell which organization every network belongs to
+            for network_id in snapshot.indexes["networkId"]:
+                self._remember_organization("networks", network_id, organization_id)
+        return phantom.APP_SUCCESS, snapshot, True
+
+    def _invalidate_device_inventory(self, organization_id=None):
+        """Drop the device inventory snapshot of an organization after a write.
+
+        Args:
+            organization_id: Organization ID, or None to drop every snapshot
+        """
+        key = self._get_inventory_key(organization_id) if organization_id else None
+        with self._cache_lock:
+            if key:
+                self._inventories.pop(key, None)
+            else:
+                self._inventories.clear()
+        self._inventory_store.remove(key)
+
+    def _get_firewall_rule_changes(self, endpoint, rules, normalize, strip_default=False):
+        """Compare the firewall rules of a network with the rules about to be applied.
+
+        Args:
+            endpoint: REST endpoint of the network's firewall rules
+            rules: Rules about to be applied
+            normalize: Function returning the comparison key of a rule
+            strip_default: Whether to ignore the default rule appended by Meraki
+
+        Returns:
+            dict: Changes as returned by diff_rules, or None if the current rules could not be fetched
+        """
+        from ciscomeraki_rules import diff_rules, strip_default_l3_rule
+
+        # Compare against the live configuration rather than a cached copy
+        ret_val, response = self._make_rest_call(endpoint, ActionResult(), use_response_cache=False)
+        if phantom.is_fail(ret_val) or not isinstance(response, dict):
+            self._connector.debug_print(f"Could not fetch the current rules of {endpoint}, updating without comparing")
+            return None
+
+        current_rules = response.get("rules", [])
+        if strip_default:
+            current_rules = strip_default_l3_rule(current_rules)
+
+        changes = diff_rules(current_rules, rules, normalize)
+        changes["current"] = response
+        return changes
+
+    def _get_etag_cache_key(self, method, endpoint, params):
+        """Get the conditional GET cache key of a request.
+
+        Args:
+            method: HTTP method
+            endpoint: REST endpoint
+            params: Query parameters
+
+        Returns:
+            str: Cache key or None if the request is not cacheable
+        """
+        if method.lower() != "get" or not any(regex.match(endpoint) for regex in self._etag_cache_regexes):
+            return None
+
+        return f"{endpoint}?{urlencode(sorted((params or {}).items()), doseq=True)}"
+
+    def _get_etag_cache_entry(self, key):
+        """Get a conditional GET cache entry and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            dict: Cached ETag, body and Link header, or None
+        """
+        if key is None:
+            return None
+
+        return self._etag_cache.get(key)
+
+    def _store_etag_cache_entry(self, key, response, resp_json):
+        """Store a response in the conditional GET cache.
+
+        The least recently used entries are evicted once the cache is full.
+
+        Args:
+            key: Cache key
+            response: Response from server
+            resp_json: Parsed response body
+        """
+        etag = response.headers.get("ETag")
+        if not etag or len(response.content) > consts.ETAG_CACHE_MAX_BODY_SIZE:
+            return
+
+        self._etag_cache.put(key, etag, resp_json, response.headers.get("Link"))
+
+    def _get_rate_limit_key(self, endpoint):
+        """Get the rate limit bucket of an endpoint.
+
+        Meraki enforces its rate limit per organization, so network and device
+        scoped endpoints are mapped to the organization they belong to.
+
+        Args:
+            endpoint: REST endpoint
+
+        Returns:
+            str: Rate limit bucket key
+        """
+        match = self._scoped_endpoint_regex.match(endpoint)
+        if not match:
+            return consts.GLOBAL_RATE_LIMIT_KEY
+
+        scope, scope_id = match.groups()
+        organization_id = scope_id if scope == "organizations" else self._get_organization_id(scope, scope_id)
+        if not organization_id:
+            return f"{scope}:{scope_id}"
+
+        return f"organizations:{organization_id}"
+
+    def _get_organization_id(self, scope, scope_id):
+        """Get the organization a network or device belongs to.
+
+        The mapping is cached in the state file, so the lookup request is only
+        made the first time a network or device is seen.
+
+        Args:
+            scope: Either networks or devices
+            scope_id: Network ID or device serial
+
+        Returns:
+            str: Organization ID or None if it could not be determined
+        """
+        state_key = consts.STATE_NETWORK_ORGANIZATIONS if scope == "networks" else consts.STATE_DEVICE_ORGANIZATIONS
+        organization_id = self._connector._state.get(state_key, {}).get(scope_id)
+        if organization_id:
+            return organization_id
+
+        organization_id = None
+        if scope == "networks":
+            ret_val, response = self._make_rest_call(
+                consts.NETWORK_DETAILS.format(network_id=scope_id), ActionResult(), rate_limit_key=consts.GLOBAL_RATE_LIMIT_KEY
+            )
+            if phantom.is_success(ret_val) and isinstance(response, dict):
+                organization_id = response.get("organizationId")
+        else:
+            ret_val, response = self._make_rest_call(
+                consts.DEVICE_DETAILS.format(serial=scope_id), ActionResult(), rate_limit_key=consts.GLOBAL_RATE_LIMIT_KEY
+            )
+            if phantom.is_success(ret_val) and isinstance(response, dict) and response.get("networkId"):
+                organization_id = self._get_organization_id("networks", response["networkId"])
+
+        if organization_id:
+            self._remember_organization(scope, scope_id, organization_id)
+        return organization_id
+
+    def _remember_organization(self, scope, scope_id, organization_id):
+        """Keep the organization of a network or device in the state.
+
+        Only the most recently seen networks and devices are kept, so the state
+        file does not grow without bound.
+
+        Args:
+            scope: Either networks or devices
+            scope_id: Network ID or device serial
+            organization_id: Organization ID
+        """
+        state_key = consts.STATE_NETWORK_ORGANIZATIONS if scope == "networks" else consts.STATE_DEVICE_ORGANIZATIONS
+        with self._organizations_lock:
+            organizations = self._connector._state.setdefault(state_key, {})
+            organizations.pop(scope_id, None)
+            organizations[scope_id] = organization_id
+            while len(organizations) > consts.MAX_ORGANIZATION_MAPPINGS:
+                del organizations[next(iter(organizations))]
+
+    def _resolve_device_organizations(self, serials):
+        """Find the organizations of many devices at once, for their rate limit buckets.
+
+        Looking up a single device costs up to two requests, for the device and
+        then its network. Instead, the unknown serials are looked up with the
+        serials filter of the organization devices endpoint: nothing more when
+        the API key sees a single organization, otherwise one request per
+        organization and chunk of serials. Serials not found keep the lookup
+        of their first request.
+
+        Args:
+            serials: Device serial numbers
+        """
+        known = self._connector._state.get(consts.STATE_DEVICE_ORGANIZATIONS, {})
+        unresolved = [serial for serial in serials if serial not in known]
+        if not unresolved:
+            return
+
+        ret_val, organizations = self._make_rest_call(consts.LIST_ORGANIZATIONS, ActionResult())
+        if phantom.is_fail(ret_val) or not isinstance(organizations, list) or not organizations:
+            return
+
+        organization_ids = [str(organization["id"]) for organization in organizations if organization.get("id")]
+        if len(organization_ids) == 1:
+            for serial in unresolved:
+                self._remember_organization("devices", serial, organization_ids[0])
+            return
+
+        chunks = [
+            unresolved[index : index + consts.ORGANIZATION_LOOKUP_CHUNK_SIZE]
+            for index in range(0, len(unresolved), consts.ORGANIZATION_LOOKUP_CHUNK_SIZE)
+        ]
+        # Looking up every device on its own is cheaper for a few devices in many organizations
+        if len(organization_ids) * len(chunks) >= 2 * len(unresolved):
+            return
+
+        unresolved = set(unresolved)
+        for organization_id in organization_ids:
+            for chunk in chunks:
+                chunk = [serial for serial in chunk if serial in unresolved]
+                if not chunk:
+                    continue
+                ret_val, devices = self._make_rest_call(
+                    consts.SEARCH_DEVICES.format(organization_id=organization_id),
+                    ActionResult(),
+                    params={"serials[]": chunk, "perPage": consts.MAX_PAGE_SIZE},
+                    use_response_cache=False,
+                )
+                if phantom.is_fail(ret_val) or not isinstance(devices, list):
+                    continue
+                for device in devices:
+                    if device.get("serial") in unresolved:
+                        unresolved.discard(device["serial"])
+                        self._remember_organization("devices", device["serial"], organization_id)
+                        if device.get("networkId"):
+                            self._remember_organization("networks", device["networkId"], organization_id)
+            if not unresolved:
+                return
+
+    def _throttle(self, rate_limit_key):
+        """Wait for the client side rate limiter before sending a request.
+
+        Args:
+            rate_limit_key: Rate limit bucket key
+
+        Returns:
+            float: Number of seconds waited
+        """
+        rate_limiter = self._connector._rate_limiter
+        if rate_limiter is None:
+            return 0
+
+        waited = rate_limiter.acquire(rate_limit_key)
+        if waited:
+            self._connector.debug_print(f"Throttled request for {rate_limit_key} by {waited:.2f} seconds")
+        return waited
+
     def _process_empty_response(self, response, action_result):
         """Process empty response from server.
 
@@ -86,6 +522,9 @@ class CiscoMerakiUtils:
         Returns:
             bool: Success/failure
         """
+        # Only error pages are HTML, so the parser is not loaded on the common path
+        from bs4 import BeautifulSoup
+
         # An html response, treat it like an error
         status_code = response.status_code
         try:
@@ -112,7 +551,7 @@ class CiscoMerakiUtils:
             tuple: Status (bool), processed response (dict)
         """
         try:
-            resp_json = response.json()
+            resp_json = ciscomeraki_json.loads(response.content)
         except Exception as e:
             error_message = self._get_error_message_from_exception(e)
             return action_result.set_status(phantom.APP_ERROR, f"Unable to parse JSON response. Error: {error_message}"), None
@@ -132,7 +571,7 @@ class CiscoMerakiUtils:
         ), None
 
     def _make_rest_call(self, endpoint, action_result, method="get", **kwargs):
-        """Makes the REST call to the app with retry mechanism for rate limiting.
+        """Makes the REST call to the app with retry mechanism for rate limiting and transient errors.
 
         Args:
             endpoint: REST endpoint that needs to be called
@@ -143,47 +582,208 @@ class CiscoMerakiUtils:
         Returns:
             tuple: Status (bool), response (dict)
         """
-        resp_json = None
-        retries = 0
+        ret_val, resp_json, _ = self._make_rest_call_with_headers(endpoint, action_result, method, **kwargs)
+        return ret_val, resp_json
+
+    def _make_rest_call_with_headers(self, endpoint, action_result, method="get", **kwargs):
+        """Makes the REST call and also returns the response headers.
+
+        Identical GET requests made at the same time, by this or by another
+        action run, are sent only once and share the response.
+
+        Args:
+            endpoint: REST endpoint that needs to be called
+            action_result: ActionResult object
+            method: GET/POST/PUT/DELETE (Default: get)
+            **kwargs: Additional arguments for request
+
+        Returns:
+            tuple: Status (bool), response (dict), response headers (dict)
+        """
+        # A streamed body is never held whole, so it cannot be shared
+        if method.lower() != "get" or kwargs.get("stream"):
+            return self._record_request(endpoint, action_result, method, **kwargs)
+
+        def send():
+            ret_val, resp_json, resp_headers = self._record_request(endpoint, action_result, method, **kwargs)
+            return ret_val, resp_json, resp_headers, None if phantom.is_success(ret_val) else action_result.get_message()
+
+        key = self._get_coalescing_key(method, f"{self._base_url}{endpoint}", kwargs.get("params"))
+        (ret_val, resp_json, resp_headers, error_message), shared = self._request_coalescer.run(key, send)
+        if shared:
+            self._connector.debug_print(f"Shared the response of an identical request to {endpoint}")
+            if phantom.is_fail(ret_val):
+                return action_result.set_status(phantom.APP_ERROR, error_message), None, {}
+        return ret_val, resp_json, resp_headers
+
+    def _get_coalescing_key(self, method, full_url, params):
+        """Get the key identical requests are coalesced on.
+
+        Args:
+            method: HTTP method
+            full_url: Full URL of the request
+            params: Query parameters
 
+        Returns:
+            str: Coalescing key
+        """
+        # Requests bypassing the response cache must not get a cached response from another request
+        request = f"{method.upper()}\n{self._bypass_cache}\n{self._get_response_cache_key(full_url, params)}"
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    def _record_request(self, endpoint, action_result, method="get", **kwargs):
+        """Make the REST call and record it in the request metrics of the action run.
+
+        Requests that reach the server are recorded under the endpoint template
+        they were built from.
+
+        Args:
+            endpoint: REST endpoint that needs to be called
+            action_result: ActionResult object
+            method: GET/POST/PUT/DELETE (Default: get)
+            **kwargs: Additional arguments for request
+
+        Returns:
+            tuple: Status (bool), response (dict), response headers (dict)
+        """
+        template, _ = self._match_endpoint(endpoint.partition("?")[0], self._endpoint_templates)
+        record = self._request_metrics.start_request(method, template or endpoint)
         try:
-            request_func = getattr(requests, method)
-        except AttributeError:
-            return action_result.set_status(phantom.APP_ERROR, f"Invalid method: {method}"), resp_json
+            return self._send_request(record, endpoint, action_result, method, **kwargs)
+        finally:
+            self._request_metrics.finish_request(record)
 
-        # Get headers from auth module
-        headers = self._connector._auth.get_headers()
-        if headers is None:
-            return action_result.set_status(phantom.APP_ERROR, "Failed to get authentication headers"), resp_json
-        headers["User-Agent"] = "Splunk SOAR Cisco Test"  # Add User-Agent
-        kwargs["headers"] = headers
-        kwargs["timeout"] = consts.REQUEST_DEFAULT_TIMEOUT
+    def _send_request(self, record, endpoint, action_result, method="get", **kwargs):
+        """Make the REST call, retrying rate limited and transient failures.
 
-        # Get base_url from config
-        base_url = self._connector.get_config().get("base_url", "").rstrip("/")
-        full_url = f"{base_url}{consts.API_PATH}{endpoint}"
+        Args:
+            record: RequestRecord the attempts and retries are recorded in
+            endpoint: REST endpoint that needs to be called
+            action_result: ActionResult object
+            method: GET/POST/PUT/DELETE (Default: get)
+            **kwargs: Additional arguments for request
+
+        Returns:
+            tuple: Status (bool), response (dict), response headers (dict)
+        """
+        resp_json = None
+        resp_headers = {}
+        retries = 0
 
-        while retries < consts.MAX_RETRIES:
+        if method.lower() not in consts.HTTP_METHODS:
+            return action_result.set_status(phantom.APP_ERROR, f"Invalid method: {method}"), resp_json, resp_headers
+
+        session = self._get_session()
+        if session is None:
+            return action_result.set_status(phantom.APP_ERROR, "Failed to get authentication headers"), resp_json, resp_headers
+        kwargs["timeout"] = consts.REQUEST_DEFAULT_TIMEOUT
+        if "json" in kwargs:
+            # The session already sends the JSON content type
+            kwargs["data"] = ciscomeraki_json.dumps(kwargs.pop("json"))
+
+        full_url = f"{self._base_url}{endpoint}"
+        rate_limit_key = kwargs.pop("rate_limit_key", None) or self._get_rate_limit_key(endpoint)
+        # A streamed body is never held whole, so it cannot be cached either
+        stream = kwargs.pop("stream", False)
+        use_response_cache = kwargs.pop("use_response_cache", True) and not stream
+        retry_policy = self._retry_policy
+        delay = None
+
+        # Serve fresh cached responses without calling the API
+        response_cache_key = None
+        cache_template, cache_path_params = None, None
+        if method.lower() == "get" and use_response_cache:
+            cache_template, cache_path_params = self._match_endpoint(endpoint, self._response_cache_templates)
+        if cache_template:
+            response_cache_key = self._get_response_cache_key(full_url, kwargs.get("params"))
+            cached = None if self._bypass_cache else self._response_cache.get(response_cache_key)
+            if cached is not None:
+                self._connector.debug_print(f"Using cached response of {full_url}")
+                if cached.get("link"):
+                    resp_headers = CaseInsensitiveDict({"Link": cached["link"]})
+                return phantom.APP_SUCCESS, cached["body"], resp_headers
+
+        # Revalidate cached bodies instead of downloading them again
+        etag_cache_key = None if stream else self._get_etag_cache_key(method, endpoint, kwargs.get("params"))
+        etag_cache_entry = self._get_etag_cache_entry(etag_cache_key)
+        if etag_cache_entry:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": etag_cache_entry["etag"]}
+
+        while True:
+            retry_after = None
             try:
+                self._throttle(rate_limit_key)
                 self._connector.debug_print(f"Making {method} request to {full_url}")
-                response = request_func(full_url, verify=self._connector.get_config().get("verify_server_cert", True), **kwargs)
-                # Handle rate limiting
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", consts.INITIAL_RETRY_DELAY))
-                    self._connector.debug_print(f"Rate limited. Retrying after {retry_after} seconds. Retry {retries + 1}/{consts.MAX_RETRIES}")
-                    time.sleep(retry_after)
-                    retries += 1
-                    continue
+                record.start_attempt()
+                response = session.request(method, full_url, stream=stream, **kwargs)
+            except requests.exceptions.RequestException as e:
+                record.end_attempt()
+                error_message = f"Error connecting to server. Details: {self._get_error_message_from_exception(e)}"
+                if not retry_policy.is_retryable_exception(e, method):
+                    return action_result.set_status(phantom.APP_ERROR, error_message), resp_json, resp_headers
+            else:
+                record.end_attempt(response, stream)
+                if response.status_code == 304 and etag_cache_entry:
+                    self._connector.debug_print(f"Not modified, using cached response of {full_url}")
+                    if etag_cache_entry.get("link"):
+                        resp_headers = CaseInsensitiveDict({"Link": etag_cache_entry["link"]})
+                    return phantom.APP_SUCCESS, etag_cache_entry["body"], resp_headers
+
                 if response.status_code == 401:
-                    return action_result.set_status(phantom.APP_ERROR, "API key invalid or expired"), resp_json
+                    return action_result.set_status(phantom.APP_ERROR, "API key invalid or expired"), resp_json, resp_headers
+
+                if not retry_policy.is_retryable_status(response.status_code, method):
+                    if stream and response.ok and "json" in response.headers.get("Content-Type", ""):
+                        return phantom.APP_SUCCESS, JSONArrayStream(response, consts.STREAM_CHUNK_SIZE), response.headers
+
+                    ret_val, resp_json = self._process_response(response, action_result)
+                    if phantom.is_success(ret_val):
+                        if etag_cache_key:
+                            self._store_etag_cache_entry(etag_cache_key, response, resp_json)
+                        if response_cache_key:
+                            self._response_cache.put(
+                                response_cache_key,
+                                cache_template,
+                                cache_path_params,
+                                resp_json,
+                                response.headers.get("Link"),
+                                len(response.content),
+                                consts.RESPONSE_CACHE_TTLS[cache_template],
+                            )
+                        elif method.lower() != "get":
+                            self._invalidate_response_cache(endpoint)
+                    return ret_val, resp_json, response.headers
+
+                error_message = f"Status Code: {response.status_code}"
+                retry_after = self._get_retry_after(response)
+                response.close()
+
+            delay = retry_policy.next_delay(delay, retry_after)
+            if not retry_policy.can_retry(retries, delay):
+                return action_result.set_status(phantom.APP_ERROR, f"Max retries exceeded. {error_message}"), resp_json, resp_headers
+
+            retries += 1
+            record.add_retry(delay, retry_after)
+            self._connector.debug_print(f"{error_message}. Retrying after {delay:.2f} seconds. Retry {retries}/{consts.MAX_RETRIES}")
+            retry_policy.wait(delay)
+
+    def _get_retry_after(self, response):
+        """Get the delay requested by the server in the Retry-After header.
 
-                return self._process_response(response, action_result)
+        Args:
+            response: Response from server
 
-            except requests.exceptions.RequestException as e:
-                error_message = self._get_error_message_from_exception(e)
-                return action_result.set_status(phantom.APP_ERROR, f"Error connecting to server. Details: {error_message}"), resp_json
+        Returns:
+            float: Number of seconds to wait or None if the header is missing
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is None:
+            return None
 
-        return action_result.set_status(phantom.APP_ERROR, "Max retries exceeded for rate limiting"), resp_json
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            return consts.INITIAL_RETRY_DELAY
 
     def _process_response(self, response, action_result):
         """Process API response.
@@ -196,15 +796,19 @@ class CiscoMerakiUtils:
             tuple: Status (bool), response (dict)
         """
         if not response.ok:
-            if response.text:
-                json_error_text = json.loads(response.text) if isinstance(response.text, str) else response.text
-                return action_result.set_status(
-                    phantom.APP_ERROR,
-                    f"Status Code: {response.status_code}. Error: {json_error_text.get('error') if json_error_text.get('error', None) else response.text}",
-                ), None
+            if response.content:
+                try:
+                    json_error_text = ciscomeraki_json.loads(response.content)
+                except ciscomeraki_json.JSONDecodeError:
+                    json_error_text = None
+                if isinstance(json_error_text, dict) and json_error_text.get("error"):
+                    error_text = json_error_text["error"]
+                else:
+                    error_text = response.text
+                return action_result.set_status(phantom.APP_ERROR, f"Status Code: {response.status_code}. Error: {error_text}"), None
             return action_result.set_status(phantom.APP_ERROR, f"Status Code: {response.status_code}. Error: {response.text}"), None
 
-        if not response.text:
+        if not response.content:
             return self._process_empty_response(response, action_result), None
 
         if "json" in response.headers.get("Content-Type", ""):
@@ -215,56 +819,138 @@ class CiscoMerakiUtils:
 
         return action_result.set_status(phantom.APP_ERROR, "Unknown response type"), None
 
-    def _paginator(self, action_result, endpoint, limit=None, **kwargs):
+    def _paginator(self, action_result, endpoint, limit=None, max_results=None, stream=False, **kwargs):
         """Handle pagination for Meraki API responses.
 
+        Follows the ``startingAfter`` cursor advertised in the ``Link`` header and
+        yields every page as soon as it arrives, so callers can add the records
+        to the action result without holding the whole collection in memory.
+
+        In stream mode every page is an iterator parsing its records while the
+        body downloads, so not even one page is held in memory. Such pages have
+        no length and must be read before the next one is requested; a body
+        failing to parse ends the page and yields a failure status.
+
         Args:
             action_result: ActionResult object
             endpoint: API endpoint
-            limit: Maximum number of records to return (max 1000 per page)
+            limit: Number of records to request per page (max 1000 per page)
+            max_results: Maximum number of records to return in total
+            stream: Whether to parse the pages incrementally
             **kwargs: Additional arguments for the API call
 
-        Returns:
-            tuple: Status (bool), aggregated results (list)
+        Yields:
+            tuple: Status (bool), page of results (list, or iterator in stream mode)
         """
-        items = []
-        next_url = None
+        params = dict(kwargs.pop("params", None) or {})
+        page_size = min(limit, consts.MAX_PAGE_SIZE) if limit else consts.MAX_PAGE_SIZE
+        total_fetched = 0
+
+        while True:
+            per_page = page_size
+            if max_results:
+                # Do not ask the server for more records than still needed
+                per_page = max(min(page_size, max_results - total_fetched), consts.MIN_PAGE_SIZE)
+            params["perPage"] = per_page
+
+            ret_val, response, headers = self._make_rest_call_with_headers(endpoint, action_result, params=params, stream=stream, **kwargs)
+
+            if phantom.is_fail(ret_val):
+                yield ret_val, None
+                return
+
+            if isinstance(response, JSONArrayStream):
+                fetched = yield from self._yield_record_stream(action_result, response, max_results - total_fetched if max_results else None)
+                if fetched is None:
+                    return
+                total_fetched += fetched
+            elif not isinstance(response, list):
+                yield action_result.set_status(phantom.APP_ERROR, "Unexpected response format from server"), None
+                return
+            else:
+                if max_results and total_fetched + len(response) > max_results:
+                    response = response[: max_results - total_fetched]
+                total_fetched += len(response)
+
+                if response:
+                    yield phantom.APP_SUCCESS, response
+
+            if max_results and total_fetched >= max_results:
+                return
+
+            # Check for more pages using Link header
+            next_url = self._parse_link_header(headers.get("Link", ""))
+            if not next_url:
+                return
+
+            starting_after = self._get_query_param(next_url, "startingAfter")
+            if not starting_after or starting_after == params.get("startingAfter"):
+                return
+            params["startingAfter"] = starting_after
+
+    def _stream_records(self, action_result, endpoint, **kwargs):
+        """Make a GET request whose JSON array response is parsed incrementally.
+
+        Used for endpoints that are not paginated but can return large arrays.
 
-        # Set up pagination parameters
-        params = kwargs.get("params", {})
-        params["perPage"] = min(limit, consts.MAX_PAGE_SIZE) if limit else consts.MAX_PAGE_SIZE
-        kwargs["params"] = params
+        Args:
+            action_result: ActionResult object
+            endpoint: API endpoint
+            **kwargs: Additional arguments for the API call
+
+        Yields:
+            tuple: Status (bool), iterator over the records, followed by a failure
+                status if the body fails to parse
+        """
+        ret_val, response, _ = self._make_rest_call_with_headers(endpoint, action_result, stream=True, **kwargs)
+        if phantom.is_fail(ret_val):
+            yield ret_val, None
+            return
 
-        # while True:
-        # if next_url:
-        #     # Get base_url from config
-        #     base_url = self._connector.get_config().get('base_url', '').rstrip('/')
-        #     endpoint = next_url.replace(f"{base_url}{consts.API_PATH}", '')
+        if isinstance(response, JSONArrayStream):
+            yield from self._yield_record_stream(action_result, response)
+        elif isinstance(response, list):
+            yield phantom.APP_SUCCESS, response
+        else:
+            yield action_result.set_status(phantom.APP_ERROR, "Unexpected response format from server"), None
 
-        ret_val, response = self._make_rest_call(endpoint, action_result, **kwargs)
+    def _yield_record_stream(self, action_result, records, max_results=None):
+        """Yield a streamed response to the caller and report whether it parsed.
 
-        if phantom.is_fail(ret_val):
-            return ret_val, None
+        Args:
+            action_result: ActionResult object
+            records: JSONArrayStream of the response
+            max_results: Maximum number of records to read
 
-        if not isinstance(response, list):
-            return phantom.APP_ERROR, "Unexpected response format from server"
+        Yields:
+            tuple: Status (bool), iterator over the records, followed by a failure
+                status if the body fails to parse
 
-        items.extend(response)
+        Returns:
+            int: Number of records read, or None on failure
+        """
+        result = {"count": 0, "error": None}
 
-        # if limit and len(items) >= limit:
-        #     items = items[:limit]
-        #     break
+        def iter_records():
+            try:
+                for record in records:
+                    result["count"] += 1
+                    yield record
+                    if max_results and result["count"] >= max_results:
+                        return
+            except (ValueError, requests.exceptions.RequestException) as e:
+                result["error"] = self._get_error_message_from_exception(e)
 
-        # # Check for more pages using Link header
-        # link_header = response.headers.get('Link', '')
-        # if 'rel="next"' not in link_header:
-        #     break
+        try:
+            yield phantom.APP_SUCCESS, iter_records()
+        finally:
+            records.close()
 
-        # next_url = self._parse_link_header(link_header)
-        # if not next_url:
-        #     break
+        if result["error"]:
+            yield action_result.set_status(phantom.APP_ERROR, consts.ERROR_STREAM_PARSE.format(error=result["error"])), None
+            return None
 
-        return phantom.APP_SUCCESS, items
+        return result["count"]
 
     def _parse_link_header(self, link_header):
         """Parse Link header to get next URL.
@@ -280,12 +966,230 @@ class CiscoMerakiUtils:
 
         links = link_header.split(",")
         for link in links:
-            if 'rel="next"' in link:
-                url = link.split(";")[0].strip(" <>")
-                return url
+            url, _, rel = link.partition(";")
+            if rel.replace(" ", "").replace('"', "").lower() == "rel=next":
+                return url.strip(" <>")
 
         return None
 
+    def _get_query_param(self, url, key):
+        """Get the value of a query parameter from a URL.
+
+        Args:
+            url: URL to parse
+            key: Query parameter name
+
+        Returns:
+            str: Value of the query parameter or None
+        """
+        values = parse_qs(urlparse(url).query).get(key)
+        return values[0] if values else None
+
+    def _is_multiple_organizations(self, organization_id):
+        """Check whether the organization ID parameter selects several organizations.
+
+        Args:
+            organization_id: Organization ID, comma-separated list of IDs or 'all'
+
+        Returns:
+            bool: True if the action should fan out over organizations
+        """
+        return "," in organization_id or organization_id.strip().lower() == consts.ALL_ORGANIZATIONS
+
+    def _get_organization_ids(self, action_result, organization_id):
+        """Expand the organization ID parameter into a list of organization IDs.
+
+        Args:
+            action_result: ActionResult object
+            organization_id: Organization ID, comma-separated list of IDs or 'all'
+
+        Returns:
+            tuple: Status (bool), organization IDs (list)
+        """
+        if organization_id.strip().lower() == consts.ALL_ORGANIZATIONS:
+            organization_ids = []
+            for ret_val, organizations in self._paginator(action_result, consts.LIST_ORGANIZATIONS, limit=1000):
+                if phantom.is_fail(ret_val):
+                    return action_result.get_status(), None
+                organization_ids.extend(org["id"] for org in organizations)
+            return phantom.APP_SUCCESS, organization_ids
+
+        organization_ids = list(dict.fromkeys(value.strip() for value in organization_id.split(",") if value.strip()))
+        if not organization_ids:
+            return action_result.set_status(phantom.APP_ERROR, consts.ERROR_INVALID_PARAM.format(key="organization_id")), None
+
+        return phantom.APP_SUCCESS, organization_ids
+
+    def _run_concurrently(self, func, items):
+        """Call a function for every item on a bounded thread pool.
+
+        Args:
+            func: Function taking a single item
+            items: Items to process
+
+        Yields:
+            tuple: Item, return value of the function (in completion order)
+        """
+        if not items:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self._connector._max_workers, len(items))) as executor:
+            futures = {executor.submit(func, item): item for item in items}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _get_fan_out_summary(self, organization_ids, failed_organizations):
+        """Get the summary entries of a run over several organizations.
+
+        Args:
+            organization_ids: Organization IDs that were fetched
+            failed_organizations: Error message per failed organization ID
+
+        Returns:
+            dict: Summary entries
+        """
+        return {
+            "total_organizations": len(organization_ids),
+            "total_organizations_failed": len(failed_organizations),
+            "failed_organizations": failed_organizations,
+        }
+
+    def _fan_out(self, items, fetch):
+        """Fetch data for several items (organizations, devices, ...) concurrently.
+
+        Every item gets its own ActionResult, so a failure is reported for that
+        item only instead of aborting the whole run.
+
+        Args:
+            items: Items to fetch, e.g. organization IDs or device serials
+            fetch: Function taking an item and an ActionResult and returning a
+                tuple of status (bool) and records (list)
+
+        Yields:
+            tuple: Item, status (bool), records (list) or error message (str)
+        """
+
+        def fetch_item(item):
+            item_action_result = ActionResult()
+            try:
+                ret_val, records = fetch(item, item_action_result)
+            except Exception as e:
+                return phantom.APP_ERROR, self._get_error_message_from_exception(e)
+            if phantom.is_fail(ret_val):
+                return ret_val, item_action_result.get_message()
+            return phantom.APP_SUCCESS, records
+
+        for item, (ret_val, result) in self._run_concurrently(fetch_item, items):
+            yield item, ret_val, result
+
+    def _run_device_batches(self, action_result, organization_id, serials, actions, bisect=False):
+        """Run one action batch operation per device and report the result of each.
+
+        Args:
+            action_result: ActionResult object
+            organization_id: Organization the batches are created in
+            serials: Serial number of the device of every operation
+            actions: Batch actions, in the same order as the serial numbers
+            bisect: Split failed batches to find the operations causing the failure (Default: False)
+
+        Returns:
+            bool: Success/failure, failure only when every operation failed
+        """
+        from ciscomeraki_action_batch import ActionBatchRunner, get_batch_summary
+
+        results = ActionBatchRunner(self, organization_id).run(actions, bisect=bisect)
+        for serial, result in zip(serials, results):
+            action_result.add_data({"serial": serial, **result})
+
+        summary = get_batch_summary(results)
+        action_result.update_summary(summary)
+        if summary["operations_failed"] == len(results):
+            errors = "; ".join(dict.fromkeys(result["error"] for result in results))
+            return action_result.set_status(phantom.APP_ERROR, consts.ERROR_ALL_OPERATIONS_FAILED.format(total=len(results), errors=errors))
+
+        return phantom.APP_SUCCESS
+
+    def _parse_serials(self, action_result, serials, key):
+        """Parse a serial number parameter holding one serial, a comma-separated list or a JSON list.
+
+        Args:
+            action_result: ActionResult object
+            serials: Parameter value
+            key: Parameter name
+
+        Returns:
+            tuple: Status (bool), unique serial numbers (list)
+        """
+        if isinstance(serials, str):
+            try:
+                serials = ciscomeraki_json.loads(serials)
+            except ciscomeraki_json.JSONDecodeError:
+                # If not JSON, split by comma
+                serials = [s.strip() for s in serials.split(",")]
+        if not isinstance(serials, list):
+            serials = [serials]
+        serials = list(dict.fromkeys(str(s).strip() for s in serials if str(s).strip()))
+        if not serials:
+            return action_result.set_status(phantom.APP_ERROR, consts.ERROR_INVALID_PARAM.format(key=key)), None
+
+        return phantom.APP_SUCCESS, serials
+
+    def _get_field_projection(self, action_result, fields):
+        """Compile the projection of the records of the running action.
+
+        Args:
+            action_result: ActionResult object
+            fields: Comma-separated fields to keep, '*' to keep every field, or
+                None for the fields declared in the app JSON
+
+        Returns:
+            tuple: Status (bool), FieldProjection
+        """
+        if fields is None or not str(fields).strip():
+            try:
+                fields = get_default_fields(self._connector.get_app_json(), self._connector.get_action_identifier())
+            except Exception as e:
+                self._connector.debug_print(f"Could not read the declared fields, keeping whole records: {e}")
+                return phantom.APP_SUCCESS, FieldProjection()
+            return phantom.APP_SUCCESS, FieldProjection(fields or None)
+
+        fields = list(dict.fromkeys(field.strip() for field in str(fields).split(",") if field.strip()))
+        if consts.ALL_FIELDS in fields:
+            return phantom.APP_SUCCESS, FieldProjection()
+        if not fields or any("" in field.split(".") for field in fields):
+            return action_result.set_status(phantom.APP_ERROR, consts.ERROR_INVALID_PARAM.format(key="fields")), None
+
+        return phantom.APP_SUCCESS, FieldProjection(fields)
+
+    def _validate_integer(self, action_result, parameter, key, allow_zero=False):
+        """Validate an integer parameter.
+
+        Args:
+            action_result: ActionResult object
+            parameter: Parameter value
+            key: Parameter name
+            allow_zero: Whether zero is a valid value
+
+        Returns:
+            tuple: Status (bool), integer value or None
+        """
+        if parameter is None:
+            return phantom.APP_SUCCESS, None
+
+        try:
+            if not float(parameter).is_integer():
+                return action_result.set_status(phantom.APP_ERROR, consts.ERROR_INVALID_INT_PARAM.format(key=key)), None
+            parameter = int(parameter)
+        except (ValueError, TypeError):
+            return action_result.set_status(phantom.APP_ERROR, consts.ERROR_INVALID_INT_PARAM.format(key=key)), None
+
+        if parameter < 0:
+            return action_result.set_status(phantom.APP_ERROR, consts.ERROR_NEG_INT_PARAM.format(key=key)), None
+        if not allow_zero and parameter == 0:
+            return action_result.set_status(phantom.APP_ERROR, consts.ERROR_ZERO_INT_PARAM.format(key=key)), None
+
+        return phantom.APP_SUCCESS, parameter
+
 
 def validate_params(params: dict[str, Any], required_params: dict[str, Any], operation: Optional[str] = None) -> dict[str, Any]:
     """
@@ -0,0 +1,70 @@
+# File: conftest.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Shared fixtures of the unit tests.
+
+Tests of pure modules run anywhere; tests running actions need the SOAR
+``phantom`` package and are skipped without it.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+@pytest.fixture
+def meraki_server():
+    """Start a small API stand-in server for one test."""
+    from mock_meraki_server import Dataset, MockMerakiServer
+
+    server = MockMerakiServer(Dataset(organizations=1, networks=2, devices=200, clients=3), seed=1)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def run_action(tmp_path):
+    """Get a function running an action and returning its action result.
+
+    The connector keeps its state in the temporary directory of the test.
+    """
+    pytest.importorskip("phantom")
+    from ciscomeraki_connector import CiscoMerakiConnector
+
+    class TestConnector(CiscoMerakiConnector):
+        def get_state_dir(self):
+            return str(tmp_path)
+
+        def load_state(self):
+            return {}
+
+        def save_state(self, state):
+            pass
+
+    def run(base_url, action_id, param, **config):
+        connector = TestConnector()
+        config = {"base_url": base_url, "api_key": "test", "verify_server_cert": False, "rate_limit_per_second": 0, **config}
+        in_json = {"action": action_id, "identifier": action_id, "config": config, "parameters": [param]}
+        connector._handle_action(json.dumps(in_json), None)
+        return connector.get_action_results()[-1]
+
+    return run
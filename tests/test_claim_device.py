@@ -0,0 +1,57 @@
+# File: test_claim_device.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests of claim device, which isolates the serials rejected by the API."""
+
+NEW_SERIALS = [f"Q2NW-0000-000{index}" for index in range(6)]
+
+
+def claim(meraki_server, run_action, serials, include_request_metrics=False, **param):
+    organization_id = param.pop("organization_id", meraki_server.dataset.organizations[0])
+    param = {"organization_id": organization_id, "serials": ",".join(serials), **param}
+    return run_action(meraki_server.base_url, "claim_device", param, include_request_metrics=include_request_metrics)
+
+
+def test_rejected_serials_are_isolated(meraki_server, run_action):
+    claimed_serial = meraki_server.dataset.inventory[meraki_server.dataset.organizations[0]][0]
+
+    action_result = claim(meraki_server, run_action, [*NEW_SERIALS[:3], "invalid", claimed_serial, *NEW_SERIALS[3:]], chunk_size=8)
+
+    summary = action_result.get_summary()
+    assert action_result.get_status()
+    assert summary["claimed_serials"] == NEW_SERIALS
+    assert summary["already_claimed_serials"] == [claimed_serial]
+    assert list(summary["failed_serials"]) == ["invalid"]
+
+
+def test_unknown_organization_fails_every_chunk_once(meraki_server, run_action):
+    action_result = claim(meraki_server, run_action, NEW_SERIALS, organization_id="999", chunk_size=3, include_request_metrics=True)
+
+    summary = action_result.get_summary()
+    assert not action_result.get_status()
+    assert summary["total_devices_failed"] == len(NEW_SERIALS)
+    assert summary["request_metrics"]["POST /organizations/{organization_id}/inventory/devices/claim"]["requests"] == 2
+
+
+def test_failed_network_claim_batches_are_bisected(meraki_server, run_action):
+    network_id = next(iter(meraki_server.dataset.networks))
+    serial_in_network = meraki_server.dataset.network_devices[network_id][0]
+    assert claim(meraki_server, run_action, NEW_SERIALS).get_status()
+
+    action_result = claim(meraki_server, run_action, [*NEW_SERIALS[:2], serial_in_network, *NEW_SERIALS[2:]], network_id=network_id)
+
+    statuses = {record["serial"]: record["status"] for record in action_result.get_data()}
+    assert action_result.get_status()
+    assert statuses == {**dict.fromkeys(NEW_SERIALS, "completed"), serial_in_network: "failed"}
+    assert action_result.get_summary()["operations_completed"] == len(NEW_SERIALS)
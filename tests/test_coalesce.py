@@ -0,0 +1,122 @@
+# File: test_coalesce.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests of the coalescing of identical concurrent requests within a process."""
+
+import threading
+import time
+
+import pytest
+
+from ciscomeraki_coalesce import RequestCoalescer
+
+
+FOLLOWERS = 3
+
+
+@pytest.fixture(autouse=True)
+def no_requests_in_flight():
+    """Check that every test lands all its requests."""
+    from ciscomeraki_coalesce import _flights
+
+    yield
+    assert not _flights
+
+
+def run_with_followers(coalescer, send):
+    """Run a request while followers send the identical request.
+
+    Returns:
+        tuple: Result or exception of the leader, results of the followers
+    """
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def leader_send():
+        calls.append(None)
+        started.set()
+        release.wait(5)
+        return send()
+
+    followers = []
+    leader_outcome = []
+
+    def run_leader():
+        try:
+            leader_outcome.append(coalescer.run("key", leader_send))
+        except Exception as e:
+            leader_outcome.append(e)
+
+    leader = threading.Thread(target=run_leader)
+    leader.start()
+    started.wait(5)
+
+    threads = [threading.Thread(target=lambda: followers.append(coalescer.run("key", leader_send))) for _ in range(FOLLOWERS)]
+    for thread in threads:
+        thread.start()
+    # Let the followers find the request in flight before it lands
+    time.sleep(0.2)
+    release.set()
+    for thread in [leader, *threads]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    return leader_outcome[0], followers
+
+
+def test_followers_share_a_copy_of_the_leader_response():
+    coalescer = RequestCoalescer(None)
+
+    (result, shared), followers = run_with_followers(coalescer, lambda: (True, {"id": "1"}, {}, None))
+
+    assert result == (True, {"id": "1"}, {}, None)
+    assert not shared
+    assert followers == [((True, {"id": "1"}, {}, None), True)] * FOLLOWERS
+    assert len({id(follower[0][1]) for follower in followers} | {id(result[1])}) == FOLLOWERS + 1
+    assert coalescer.coalesced == FOLLOWERS
+
+
+def test_followers_get_the_failure_of_the_leader():
+    coalescer = RequestCoalescer(None)
+
+    (result, _), followers = run_with_followers(coalescer, lambda: (False, None, {}, "Status Code: 500"))
+
+    assert result == (False, None, {}, "Status Code: 500")
+    assert followers == [((False, None, {}, "Status Code: 500"), True)] * FOLLOWERS
+
+
+def test_followers_get_an_error_when_the_leader_raises():
+    coalescer = RequestCoalescer(None)
+
+    def send():
+        raise ConnectionError("connection reset")
+
+    leader_outcome, followers = run_with_followers(coalescer, send)
+
+    assert isinstance(leader_outcome, ConnectionError)
+    assert followers == [((False, None, {}, "connection reset"), True)] * FOLLOWERS
+
+    # The failed request is not remembered, the next caller sends it again
+    assert coalescer.run("key", lambda: (True, [], {}, None)) == ((True, [], {}, None), False)
+
+
+def test_results_across_processes_are_only_shared_while_in_flight(tmp_path):
+    coalescer = RequestCoalescer(str(tmp_path))
+    coalescer.run("key", lambda: (True, {"version": 1}, {}, None))
+
+    result, shared = coalescer.run("key", lambda: (True, {"version": 2}, {}, None))
+
+    assert result[1] == {"version": 2}
+    assert not shared
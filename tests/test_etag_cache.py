@@ -0,0 +1,120 @@
+# File: test_etag_cache.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests of the conditional GET cache keeping validators in the state and bodies in files."""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from ciscomeraki_cache import ETagCache
+
+
+def test_state_holds_only_validators(tmp_path):
+    validators = {}
+    cache = ETagCache(validators, str(tmp_path))
+
+    cache.put("/organizations?", '"v1"', [{"id": "1"}], None)
+
+    assert validators == {"/organizations?": {"etag": '"v1"', "link": None}}
+    assert cache.get("/organizations?") == {"etag": '"v1"', "body": [{"id": "1"}], "link": None}
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_evicts_least_recently_used_entries_and_their_bodies(tmp_path):
+    validators = {}
+    cache = ETagCache(validators, str(tmp_path), max_entries=2)
+
+    cache.put("a", '"a"', "a", None)
+    cache.put("b", '"b"', "b", None)
+    cache.get("a")
+    cache.put("c", '"c"', "c", None)
+
+    assert list(validators) == ["a", "c"]
+    assert cache.get("b") is None
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_entries_without_body_are_dropped(tmp_path):
+    validators = {"legacy": {"etag": '"l"', "body": [], "link": None}}
+    cache = ETagCache(validators, str(tmp_path))
+    assert validators == {}
+
+    cache.put("a", '"a"', "a", None)
+    for file_name in os.listdir(tmp_path):
+        os.remove(tmp_path / file_name)
+
+    # Without the body an If-None-Match request could not be answered from the cache
+    assert cache.get("a") is None
+    assert validators == {}
+
+
+def test_disabled_without_cache_directory():
+    validators = {}
+    cache = ETagCache(validators, None)
+
+    cache.put("a", '"a"', "a", None)
+
+    assert validators == {}
+    assert cache.get("a") is None
+
+
+def test_action_runs_revalidate_without_bodies_in_state(meraki_server, tmp_path, monkeypatch):
+    pytest.importorskip("phantom")
+    import ciscomeraki_consts as consts
+    from ciscomeraki_connector import CiscoMerakiConnector
+
+    saved_states = []
+
+    class TestConnector(CiscoMerakiConnector):
+        def get_state_dir(self):
+            return str(tmp_path)
+
+        def load_state(self):
+            return json.loads(json.dumps(saved_states[-1])) if saved_states else {}
+
+        def save_state(self, state):
+            saved_states.append(json.loads(json.dumps(state)))
+
+    statuses = []
+    handle = meraki_server.handle
+
+    def record_status(method, url, headers, body):
+        status, response_headers, content = handle(method, url, headers, body)
+        if url.split("?")[0].endswith("/organizations"):
+            statuses.append(status)
+        return status, response_headers, content
+
+    monkeypatch.setattr(meraki_server, "handle", record_status)
+
+    def run():
+        connector = TestConnector()
+        config = {"base_url": meraki_server.base_url, "api_key": "test", "verify_server_cert": False, "rate_limit_per_second": 0}
+        in_json = {"action": "list_org_inventory_devices", "identifier": "list_org_inventory_devices", "config": config}
+        in_json["parameters"] = [{"organization_id": "all"}]
+        connector._handle_action(json.dumps(in_json), None)
+        return connector.get_action_results()[-1]
+
+    first = run()
+    # Force the second run past the response cache so it revalidates the organizations
+    shutil.rmtree(tmp_path / consts.RESPONSE_CACHE_DIR)
+    second = run()
+
+    assert first.get_status() and second.get_status()
+    assert second.get_data() == first.get_data()
+    assert statuses == [200, 304]
+    assert len(saved_states) == 1
+    assert all(set(entry) == {"etag", "link"} for entry in saved_states[0][consts.STATE_ETAG_CACHE].values())
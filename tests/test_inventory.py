@@ -0,0 +1,58 @@
+# File: test_inventory.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests of the inventory snapshot searches, which must match the API filters."""
+
+from ciscomeraki_inventory import InventorySnapshot, InventoryStore
+
+
+DEVICES = [
+    {"serial": "Q2XX-AAAA-0001", "mac": "00:18:0a:00:00:01", "model": "MX68", "networkId": "N_1", "tags": ["Branch"]},
+    {"serial": "Q2XX-AAAA-0010", "mac": "00:18:0a:00:00:10", "model": "MX68W", "networkId": "N_1", "tags": ["branch", "lab"]},
+    {"serial": "Q2XX-BBBB-0001", "mac": "00:18:0a:00:01:00", "model": "MS120", "networkId": "N_2", "tags": []},
+]
+
+
+def serials(devices):
+    return [device["serial"] for device in devices]
+
+
+def test_search_matches_substrings_even_with_an_exact_match():
+    snapshot = InventorySnapshot(DEVICES)
+
+    assert serials(snapshot.search(model="MX68")) == ["Q2XX-AAAA-0001", "Q2XX-AAAA-0010"]
+    assert serials(snapshot.search(serial="aaaa-00")) == ["Q2XX-AAAA-0001", "Q2XX-AAAA-0010"]
+    assert serials(snapshot.search(mac="00:01")) == ["Q2XX-AAAA-0001", "Q2XX-BBBB-0001"]
+    assert serials(snapshot.search(serial="Q2XX-AAAA-0001")) == ["Q2XX-AAAA-0001"]
+
+
+def test_search_matches_tags_and_networks_exactly():
+    snapshot = InventorySnapshot(DEVICES)
+
+    assert serials(snapshot.search(tags=["branch"])) == ["Q2XX-AAAA-0010"]
+    assert serials(snapshot.search(tags=["Branch", "lab"])) == ["Q2XX-AAAA-0001", "Q2XX-AAAA-0010"]
+    assert serials(snapshot.search(network_id="N_")) == []
+    assert serials(snapshot.search(network_id="N_1", model="MX68W")) == ["Q2XX-AAAA-0010"]
+
+
+def test_store_reindexes_snapshots_of_an_older_index_version(tmp_path):
+    store = InventoryStore(str(tmp_path))
+    store.save("organization", InventorySnapshot(DEVICES))
+    snapshot = store.load("organization")
+    assert serials(snapshot.search(tags=["Branch"])) == ["Q2XX-AAAA-0001"]
+
+    data = snapshot.to_dict()
+    data["indexes"]["tags"] = {"branch": [0, 1]}
+    del data["index_version"]
+    assert serials(InventorySnapshot.from_dict(data).search(tags=["Branch"])) == ["Q2XX-AAAA-0001"]
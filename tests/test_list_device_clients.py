@@ -0,0 +1,77 @@
+# File: test_list_device_clients.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests of list device clients for several serials, fetched concurrently."""
+
+
+def test_fan_out_lists_clients_of_every_device(meraki_server, run_action):
+    serials = meraki_server.dataset.network_devices[next(iter(meraki_server.dataset.networks))][:20]
+
+    action_result = run_action(meraki_server.base_url, "list_device_clients", {"serial": ",".join([*serials, "Q2XX-0000-0000"])})
+
+    summary = action_result.get_summary()
+    assert action_result.get_status()
+    assert summary["total_devices"] == 21
+    assert list(summary["failed_serials"]) == ["Q2XX-0000-0000"]
+    assert "request_metrics" not in summary
+    assert "coalesced_requests" not in summary
+    assert summary["clients_per_serial"] == dict.fromkeys(serials, 3)
+    assert {client["device_serial"] for client in action_result.get_data()} == set(serials)
+
+
+def test_fan_out_retries_rate_limited_requests(meraki_server, run_action):
+    serials = meraki_server.dataset.network_devices[next(iter(meraki_server.dataset.networks))][:10]
+    meraki_server.error_rate_429 = 0.3
+    meraki_server.retry_after = 0
+
+    action_result = run_action(meraki_server.base_url, "list_device_clients", {"serial": ",".join(serials)}, include_request_metrics=True)
+
+    summary = action_result.get_summary()
+    assert action_result.get_status()
+    assert summary["total_devices_failed"] == 0
+    assert summary["retries"] > 0
+    assert summary["request_metrics"]["GET /devices/{serial}/clients"]["requests"] == 10
+
+
+def test_fan_out_skips_organization_lookups_with_one_organization(meraki_server, run_action):
+    serials = meraki_server.dataset.network_devices[next(iter(meraki_server.dataset.networks))][:20]
+
+    action_result = run_action(meraki_server.base_url, "list_device_clients", {"serial": ",".join(serials)}, include_request_metrics=True)
+
+    # Every device belongs to the only organization of the API key
+    request_metrics = action_result.get_summary()["request_metrics"]
+    assert action_result.get_status()
+    assert request_metrics["GET /organizations"]["requests"] == 1
+    assert "GET /devices/{serial}" not in request_metrics
+    assert "GET /networks/{network_id}" not in request_metrics
+
+
+def test_fan_out_resolves_organizations_in_bulk(run_action):
+    from mock_meraki_server import Dataset, MockMerakiServer
+
+    dataset = Dataset(organizations=3, networks=2, devices=300, clients=1)
+    server = MockMerakiServer(dataset, seed=1)
+    server.start()
+    try:
+        serials = dataset.inventory[dataset.organizations[-1]][:150]
+        action_result = run_action(server.base_url, "list_device_clients", {"serial": ",".join(serials)}, include_request_metrics=True)
+    finally:
+        server.stop()
+
+    # One organization devices request per organization and chunk of serials instead of one lookup per serial
+    request_metrics = action_result.get_summary()["request_metrics"]
+    assert action_result.get_status()
+    assert action_result.get_summary()["total_devices_failed"] == 0
+    assert request_metrics["GET /organizations/{organization_id}/devices"]["requests"] <= 6
+    assert "GET /devices/{serial}" not in request_metrics
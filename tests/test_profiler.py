@@ -0,0 +1,37 @@
+# File: test_profiler.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests of the profiling of action runs, with actions sending requests from worker threads."""
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("action_id", "param"),
+    [
+        ("list_device_clients", "serials"),
+        ("list_org_inventory_devices", {"organization_id": "all"}),
+    ],
+)
+def test_profiled_fan_out_actions_complete(meraki_server, run_action, action_id, param):
+    if param == "serials":
+        serials = meraki_server.dataset.network_devices[next(iter(meraki_server.dataset.networks))][:20]
+        param = {"serial": ",".join(serials)}
+
+    action_result = run_action(meraki_server.base_url, action_id, param, profile_actions="all")
+
+    summary = action_result.get_summary()
+    assert action_result.get_status()
+    assert summary["profile"]["profiled_seconds"] > 0
+    assert summary["profile"]["top_functions"]
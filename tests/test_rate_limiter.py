@@ -0,0 +1,58 @@
+# File: test_rate_limiter.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests of the token bucket rate limiter."""
+
+import pytest
+
+from ciscomeraki_rate_limiter import TokenBucketRateLimiter
+from ciscomeraki_store import LockedStateFile
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the time seen by the rate limiter, and let tests move it."""
+    now = [1000.0]
+    monkeypatch.setattr("ciscomeraki_rate_limiter.time.time", lambda: now[0])
+    return now
+
+
+def test_burst_then_waits_in_arrival_order(clock):
+    limiter = TokenBucketRateLimiter(LockedStateFile(), rate=10, capacity=2)
+
+    waits = [limiter.reserve("organization") for _ in range(5)]
+
+    assert waits == pytest.approx([0, 0, 0.1, 0.2, 0.3])
+
+
+def test_tokens_refill_with_time_up_to_capacity(clock):
+    limiter = TokenBucketRateLimiter(LockedStateFile(), rate=10, capacity=2)
+    for _ in range(3):
+        limiter.reserve("organization")
+
+    clock[0] += 0.1
+    assert limiter.reserve("organization") == pytest.approx(0.1)
+
+    clock[0] += 60
+    assert [limiter.reserve("organization") for _ in range(3)] == pytest.approx([0, 0, 0.1])
+
+
+def test_buckets_are_separate_per_key_and_shared_through_the_file(clock, tmp_path):
+    path = str(tmp_path / "buckets.json")
+    first = TokenBucketRateLimiter(LockedStateFile(path), rate=1)
+    second = TokenBucketRateLimiter(LockedStateFile(path), rate=1)
+
+    assert first.reserve("organization") == 0
+    assert first.reserve("other organization") == 0
+    assert second.reserve("organization") == pytest.approx(1)
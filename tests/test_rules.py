@@ -0,0 +1,228 @@
+# File: test_rules.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests of the firewall rule helpers, checked against brute force versions."""
+
+import ipaddress
+import random
+
+import pytest
+
+from ciscomeraki_rules import (
+    CompiledL3Rules,
+    IntervalTree,
+    RuleIndex,
+    RuleSpace,
+    analyze_l3_rules,
+    collapse_cidrs,
+    compact_l3_rules,
+    diff_rules,
+    normalize_l3_rule,
+    parse_port,
+)
+
+
+DEFAULT_RULE = {"policy": "allow", "protocol": "any", "srcCidr": "Any", "srcPort": "Any", "destCidr": "Any", "destPort": "Any"}
+
+
+def random_rule(rng):
+    """Get a random rule over a small address and port space, so rules often overlap."""
+
+    def cidrs():
+        if rng.random() < 0.2:
+            return "Any"
+        return ",".join(f"10.0.{rng.randrange(4)}.{rng.randrange(0, 256, 64)}/{rng.choice([26, 25, 24])}" for _ in range(rng.randint(1, 2)))
+
+    def ports():
+        return rng.choice(["Any", "22", "80", "443", "1000-2000"])
+
+    return {
+        "policy": rng.choice(["allow", "deny"]),
+        "protocol": rng.choice(["tcp", "udp", "any"]),
+        "srcCidr": cidrs(),
+        "srcPort": ports(),
+        "destCidr": cidrs(),
+        "destPort": ports(),
+    }
+
+
+def random_flow(rng):
+    return (
+        rng.choice(["tcp", "udp", "icmp"]),
+        f"10.0.{rng.randrange(4)}.{rng.randrange(256)}",
+        f"10.0.{rng.randrange(4)}.{rng.randrange(256)}",
+        rng.choice([22, 80, 443, 1500, 3000]),
+        rng.choice([22, 80, 443, 1500, 3000]),
+    )
+
+
+def first_match(rules, flow):
+    """Evaluate a flow rule by rule."""
+    protocol, src_ip, dest_ip, src_port, dest_port = flow
+    for position, rule in enumerate(rules):
+        space = RuleSpace.from_rule(rule)
+        point = RuleSpace(
+            {protocol},
+            [(int(ipaddress.ip_address(src_ip)),) * 2],
+            [(src_port, src_port)] if protocol != "icmp" else space.dimensions[1],
+            [(int(ipaddress.ip_address(dest_ip)),) * 2],
+            [(dest_port, dest_port)] if protocol != "icmp" else space.dimensions[3],
+        )
+        if space.contains(point):
+            return position
+    return None
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compiled_rules_match_rule_by_rule_evaluation(seed):
+    rng = random.Random(seed)
+    rules = [random_rule(rng) for _ in range(30)] + [DEFAULT_RULE]
+    compiled = CompiledL3Rules(rules)
+
+    for flow in (random_flow(rng) for _ in range(200)):
+        assert compiled.evaluate(*flow) == (first_match(rules, flow), False)
+
+
+def test_invalid_ports_are_rejected():
+    assert [parse_port(port) for port in (1, "443", 65535.0)] == [1, 443, 65535]
+    assert [parse_port(port) for port in (0, 65536, "http", "80.5", None)] == [None] * 5
+
+    rules = [
+        {"policy": "deny", "protocol": "tcp", "destPort": "70000"},
+        {"policy": "deny", "protocol": "tcp", "destPort": "443-80"},
+        DEFAULT_RULE,
+    ]
+    compiled = CompiledL3Rules(rules)
+
+    # Rules with out of range ports cannot be evaluated
+    assert compiled.unevaluated_mask == 0b011
+    for port in ("http", 0, 65536):
+        with pytest.raises(ValueError, match="Invalid port"):
+            compiled.evaluate("tcp", "10.0.0.1", "10.0.0.2", dest_port=port)
+
+
+@pytest.mark.parametrize(
+    "param",
+    [
+        {"src_ip": "10.0.0.1", "dest_ip": "172.16.0.1", "dest_port": "http"},
+        {
+            "flows": '[{"src_ip": "10.0.0.1", "dest_ip": "172.16.0.1", "dest_port": 443}, {"src_ip": "10.0.0.1", "dest_ip": "172.16.0.1", "src_port": 70000}]'
+        },
+    ],
+)
+def test_flows_with_invalid_ports_fail_the_action(meraki_server, run_action, param):
+    network_id = next(iter(meraki_server.dataset.networks))
+
+    action_result = run_action(meraki_server.base_url, "check_l3_firewall_flows", {"network_id": network_id, **param})
+
+    assert not action_result.get_status()
+    assert "between 1 and 65535" in action_result.get_message()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compaction_keeps_the_policy_of_every_flow(seed):
+    rng = random.Random(seed)
+    rules = [random_rule(rng) for _ in range(40)]
+    original = CompiledL3Rules([*rules, DEFAULT_RULE])
+    compacted_rules = compact_l3_rules(rules)
+    compacted = CompiledL3Rules([*compacted_rules, DEFAULT_RULE])
+
+    assert len(compacted_rules) <= len(rules)
+    for flow in (random_flow(rng) for _ in range(300)):
+        position, _ = original.evaluate(*flow)
+        compacted_position, _ = compacted.evaluate(*flow)
+        assert original.rules[position]["policy"] == compacted.rules[compacted_position]["policy"]
+
+
+def test_compaction_merges_adjacent_destinations():
+    rules = [
+        {"policy": "deny", "protocol": "tcp", "srcCidr": "Any", "srcPort": "Any", "destCidr": "10.0.0.0/25", "destPort": "22"},
+        {"policy": "deny", "protocol": "tcp", "srcCidr": "Any", "srcPort": "Any", "destCidr": "10.0.0.128/25", "destPort": "22"},
+        {"policy": "allow", "protocol": "tcp", "srcCidr": "Any", "srcPort": "Any", "destCidr": "10.0.1.0/24", "destPort": "22"},
+    ]
+
+    compacted = compact_l3_rules(rules)
+
+    assert [rule["destCidr"] for rule in compacted] == ["10.0.0.0/24", "10.0.1.0/24"]
+
+
+def test_collapse_cidrs_matches_ipaddress():
+    rng = random.Random(1)
+    for _ in range(50):
+        values = [f"192.168.{rng.randrange(8)}.{rng.randrange(0, 256, 32)}/{rng.choice([27, 26, 24, 23])}" for _ in range(10)]
+        networks = [ipaddress.ip_network(value, strict=False) for value in values]
+        expected = [str(network) for network in ipaddress.collapse_addresses(networks)]
+
+        assert sorted(collapse_cidrs([str(network) for network in networks])) == sorted(expected)
+
+    assert collapse_cidrs(["10.0.0.0/24", "Any"]) == ["Any"]
+
+
+def test_interval_tree_finds_every_overlapping_interval():
+    rng = random.Random(2)
+    intervals = [(start, start + rng.randrange(50), value) for value, start in enumerate(rng.randrange(1000) for _ in range(300))]
+    tree = IntervalTree(intervals)
+
+    for _ in range(200):
+        start = rng.randrange(1000)
+        end = start + rng.randrange(100)
+        expected = {value for low, high, value in intervals if low <= end and high >= start}
+        assert {value for _, _, value in tree.overlapping(start, end)} == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_rule_index_finds_every_overlapping_rule(seed):
+    rng = random.Random(seed)
+    spaces = [RuleSpace.from_rule(random_rule(rng)) for _ in range(60)]
+    index = RuleIndex(spaces)
+
+    for space in spaces:
+        overlapping = {position for position, other in enumerate(spaces) if other.overlaps(space)}
+        assert overlapping <= index.candidates(space)
+
+
+def test_analysis_reports_rules_covered_by_earlier_rules():
+    rules = [
+        {"policy": "deny", "protocol": "tcp", "srcCidr": "Any", "srcPort": "Any", "destCidr": "10.0.0.0/16", "destPort": "Any"},
+        {"policy": "deny", "protocol": "tcp", "srcCidr": "Any", "srcPort": "Any", "destCidr": "10.0.0.0/16", "destPort": "Any"},
+        {"policy": "deny", "protocol": "tcp", "srcCidr": "Any", "srcPort": "Any", "destCidr": "10.0.1.0/24", "destPort": "22"},
+        {"policy": "allow", "protocol": "tcp", "srcCidr": "Any", "srcPort": "Any", "destCidr": "10.0.2.0/24", "destPort": "443"},
+        {"policy": "allow", "protocol": "tcp", "srcCidr": "Any", "srcPort": "Any", "destCidr": "10.0.0.0/15", "destPort": "22"},
+        {"policy": "deny", "protocol": "tcp", "srcCidr": "Any", "srcPort": "Any", "destCidr": "VLAN(10).*", "destPort": "Any"},
+    ]
+
+    findings, unanalyzed = analyze_l3_rules(rules)
+
+    assert unanalyzed == [5]
+    assert [(finding["rule_index"], finding["finding"], finding["related_rule_indexes"]) for finding in findings] == [
+        (1, "duplicate", [0]),
+        (2, "redundant", [0]),
+        (3, "shadowed", [0]),
+        (4, "conflict", [0]),
+    ]
+
+
+def test_diff_rules_reports_added_removed_and_reordered_rules():
+    first = {"policy": "deny", "protocol": "tcp", "destCidr": "10.0.0.0/24", "destPort": "22"}
+    second = {"policy": "deny", "protocol": "udp", "destCidr": "10.0.0.0/24", "destPort": "53"}
+    third = {"policy": "allow", "protocol": "tcp", "destCidr": "10.0.1.0/24", "destPort": "443"}
+    added = {"policy": "deny", "protocol": "any", "destCidr": "10.0.2.0/24", "destPort": "Any"}
+
+    changes = diff_rules([first, second, third], [third, first, second, added], normalize_l3_rule)
+
+    assert changes["changed"]
+    assert changes["added"] == [added]
+    assert changes["removed"] == []
+    assert changes["reordered"] == [third]
+    assert not diff_rules([first, second], [dict(first, destCidr=" 10.0.0.0/24", policy="Deny"), second], normalize_l3_rule)["changed"]
@@ -0,0 +1,50 @@
+# File: test_stream.py
+#
+# Copyright (c) 2025-2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests of the incremental JSON array parser."""
+
+import json
+
+import pytest
+
+from ciscomeraki_stream import iter_json_array
+
+
+DOCUMENT = [{"serial": "Q2XX-AAAA-0001", "usage": {"sent": 12345, "recv": 0.5}}, 123456789, -2.5e3, "café", True, None, [], 42]
+
+
+def split(data, size):
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+def test_elements_split_across_chunks_are_decoded_whole(chunk_size):
+    data = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+
+    assert list(iter_json_array(split(data, chunk_size))) == DOCUMENT
+
+
+def test_number_at_the_end_of_a_chunk_waits_for_the_next_chunk():
+    assert list(iter_json_array([b"[12", b"34, 5", b"6.7", b"5]"])) == [1234, 56.75]
+    assert list(iter_json_array([b"[1", b"e", b"3]"])) == [1000.0]
+
+
+def test_empty_array_and_whitespace():
+    assert list(iter_json_array([b" \n[", b" ", b"]"])) == []
+
+
+@pytest.mark.parametrize("chunks", [[b'{"a": 1}'], [b"[1, 2"], [b"[1 2]"], [b'[{"a": ', b"]"]])
+def test_invalid_documents_raise(chunks):
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunks))